@@ -1,16 +1,64 @@
-from bcrpy.main import *
-from bcrpy.hacha import *
-from bcrpy.utils import scan_columns, save_df_as_sql, load_from_sqlite, save_dataframe, load_dataframe
+import importlib
+import importlib.util
+
+# --- Lazy attributes (PEP 562) ---
+# `import bcrpy` loads no third-party module: pandas, numpy, requests, pathos and the terminal helpers
+# are imported when the attribute (or function) that needs them is first used.
+_LAZY = {
+    "Marco": "bcrpy.main",
+    "Axe": "bcrpy.hacha",
+    "scan_columns": "bcrpy.utils",
+    "save_df_as_sql": "bcrpy.utils",
+    "load_from_sqlite": "bcrpy.utils",
+    "read_ingest_log": "bcrpy.utils",
+    "save_dataframe": "bcrpy.utils",
+    "load_dataframe": "bcrpy.utils",
+    "Transport": "bcrpy._transport",
+    "get_transport": "bcrpy._transport",
+    "set_transport": "bcrpy._transport",
+    "ResultCache": "bcrpy._cache",
+    "MetadataCache": "bcrpy._cache",
+    "SeriesStore": "bcrpy._store",
+    "RequestPlan": "bcrpy._planner",
+    "ChunkTuner": "bcrpy._control",
+    "Stats": "bcrpy._instrument",
+    "add_hook": "bcrpy._instrument",
+    "remove_hook": "bcrpy._instrument",
+}
+
+__all__ = sorted(_LAZY) + ["GET", "largeGET", "get", "large_get", "aget", "alarge_get", "iter_large_get", "aiter_large_get"]
+
+
+def __getattr__(name):
+    if name.startswith("__"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if name not in _LAZY and importlib.util.find_spec(f"{__name__}.{name}") is not None:
+        return importlib.import_module(f"{__name__}.{name}")  # submodule (e.g. bcrpy.utils), as after an eager import
+    if name.startswith("_"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_LAZY.get(name, "bcrpy.main"))  # other names: as exported by bcrpy.main before
+    try:
+        value = getattr(module, name)
+    except AttributeError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
 
 # --- Legacy style (kept for backwards compatibility) ---
 def GET(**kwargs):
     """Legacy wrapper for Marco().GET(). 
     Kept for compatibility; prefer `bcrpy.get`."""
+    from bcrpy.main import Marco
     return Marco().GET(**kwargs)
 
 def largeGET(**kwargs):
     """Legacy wrapper for Marco().largeGET(). 
     Kept for compatibility; prefer `bcrpy.large_get`."""
+    from bcrpy.main import Marco
     return Marco().largeGET(**kwargs)
 
 # --- New Pythonic style ---
@@ -22,6 +70,7 @@ def get(**kwargs):
         >>> from bcrpy import get
         >>> df = get(codes=["PN01288PM"], start="2020-01", end="2021-01")
     """
+    from bcrpy.main import Marco
     return Marco().GET(**kwargs)
 
 def large_get(**kwargs):
@@ -32,4 +81,56 @@ def large_get(**kwargs):
         >>> from bcrpy import large_get
         >>> df = large_get(codes=["PN01288PM", "PN01289PM"], start="2019-01", end="2020-01")
     """
+    from bcrpy.main import Marco
     return Marco().largeGET(**kwargs)
+
+
+# --- Async style ---
+async def aget(**kwargs):
+    """Awaitable `get`, for use inside an asyncio event loop.
+    Wrapper for Marco().aGET().
+
+    Example:
+        >>> from bcrpy import aget
+        >>> df = await aget(codes=["PN01288PM"], start="2020-01", end="2021-01")
+    """
+    from bcrpy.main import Marco
+    return await Marco().aGET(**kwargs)
+
+async def alarge_get(**kwargs):
+    """Awaitable `large_get`: every chunk is requested concurrently on the running event loop.
+    Wrapper for Marco().alargeGET().
+
+    Example:
+        >>> from bcrpy import alarge_get
+        >>> df = await alarge_get(codes=["PN01288PM", "PN01289PM"], start="2019-01", end="2020-01", concurrency=64)
+    """
+    from bcrpy.main import Marco
+    return await Marco().alargeGET(**kwargs)
+
+
+# --- Streaming style ---
+def iter_large_get(**kwargs):
+    """Generator version of `large_get`: yields `(chunk_codes, df)` for every chunk as soon as it completes.
+    Wrapper for Marco().iter_largeGET().
+
+    Example:
+        >>> from bcrpy import iter_large_get
+        >>> for chunk_codes, df in iter_large_get(codes=codes, start="2019-01", end="2020-01", chunk_size=50):
+        ...     df.to_parquet(f"{chunk_codes[0]}.parquet")
+    """
+    from bcrpy.main import Marco
+    yield from Marco().iter_largeGET(**kwargs)
+
+async def aiter_large_get(**kwargs):
+    """Async-iterator version of `large_get`: `async for chunk_codes, df in aiter_large_get(...)`.
+    Wrapper for Marco().aiter_largeGET().
+
+    Example:
+        >>> from bcrpy import aiter_large_get
+        >>> async for chunk_codes, df in aiter_large_get(codes=codes, start="2019-01", end="2020-01"):
+        ...     await save(chunk_codes, df)
+    """
+    from bcrpy.main import Marco
+    async for chunk in Marco().aiter_largeGET(**kwargs):
+        yield chunk
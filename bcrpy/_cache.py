@@ -0,0 +1,529 @@
+import contextlib
+import hashlib
+import json
+import os
+import pickle
+import time
+import uuid
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (optional: stores the metadata snapshot as Feather)
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+EXTENSIONS = {"df": ".bcrfile", "sql": ".db"}
+
+
+def temporary_path(path):
+    """Unique sibling of `path` to write into before moving it in place (one per process and thread)."""
+    return f"{path}.{os.getpid()}-{uuid.uuid4().hex[:8]}.tmp"
+
+
+class FileLock:
+    def __init__(self, path, timeout=30.0, poll=0.005):
+        """
+        Exclusive advisory lock on `path`, shared by threads and processes (flock on POSIX, msvcrt on Windows).
+
+        Use it as a context manager. Every acquisition opens its own handle, so two threads of one process
+        exclude each other as two processes do. The lock is released when the handle closes, also when the
+        holder dies.
+
+        Attributes
+        ----------
+        path : str
+            Lock file (created if needed; its content is irrelevant).
+        timeout : float or None
+            Seconds to wait for the lock before raising TimeoutError. None waits forever.
+        poll : float
+            Seconds between attempts while the lock is held elsewhere.
+        """
+        self.path = path
+        self.timeout = timeout
+        self.poll = poll
+        self._fd = None
+
+    def acquire(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while True:
+            try:
+                _lock_file(fd)
+                self._fd = fd
+                return self
+            except OSError:
+                if deadline is not None and time.monotonic() >= deadline:
+                    os.close(fd)
+                    raise TimeoutError(f"Timed out after {self.timeout}s waiting for the lock {self.path}") from None
+                time.sleep(self.poll)
+
+    def release(self):
+        if self._fd is not None:
+            fd, self._fd = self._fd, None
+            _unlock_file(fd)
+            os.close(fd)
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+if os.name == "nt":
+    import msvcrt
+
+    def _lock_file(fd):
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+
+    def _unlock_file(fd):
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _lock_file(fd):
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def _unlock_file(fd):
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class ResultCache:
+    def __init__(self, directory=".bcrpy_cache", max_bytes=512 * 1024 ** 2, max_entries=256, ttl=None,
+                 frame_format=None, compression=None, lock_timeout=30.0):
+        """
+        Content-addressed, multi-entry cache for GET / largeGET results.
+
+        Every request is stored under a hash of its parameters (codes, start, end, lang, format, storage),
+        so different requests never overwrite or shadow each other. A single manifest (`index.json`)
+        records every entry; least-recently-used entries are evicted once `max_bytes` or `max_entries`
+        is exceeded. With `frame_format='feather'` or `'parquet'` (requires pyarrow), DataFrame results are
+        stored columnar, so `read` can load a few columns or dates of a large result without deserializing
+        the rest; whole-result loads are faster from the default pickle files.
+
+        The cache is safe to share between the threads and processes of a parallel largeGET, or between
+        separate programs: files are written under a temporary name and renamed into place, so a reader
+        sees either the previous file or the complete new one, and every manifest update happens under a
+        file lock (`index.lock`).
+
+        Attributes
+        ----------
+        directory : str
+            Folder holding the cached files and the manifest.
+        max_bytes : int
+            Maximum total size of the cached files, in bytes.
+        max_entries : int
+            Maximum number of cached results.
+        ttl : float or None
+            Time-to-live of an entry in seconds. None (default) keeps entries until evicted.
+        frame_format : str
+            'pickle' (default), 'feather' (memory-mapped loads, zero-copy when uncompressed) or 'parquet'
+            (compressed files, row groups outside the requested dates are skipped).
+        compression : str or None
+            Codec of Feather / Parquet files (see `bcrpy.save_dataframe`); None uses the format's default.
+        lock_timeout : float or None
+            Seconds to wait for the manifest lock before raising TimeoutError (None waits forever).
+        stats : dict
+            Counters of `hits`, `misses`, `evictions`, `bytes_read` and `bytes_written` (of this instance).
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.frame_format = frame_format or "pickle"
+        self.compression = compression
+        self.lock_timeout = lock_timeout
+        self._snapshot = None
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "bytes_read": 0, "bytes_written": 0}
+
+    @staticmethod
+    def key(**params):
+        """Hash the request parameters into a stable cache key."""
+        payload = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+    def path(self, key, storage="df"):
+        """Location of the cached file for `key` (the cache folder is created if needed)."""
+        os.makedirs(self.directory, exist_ok=True)
+        return os.path.join(self.directory, key + EXTENSIONS[storage])
+
+    @contextlib.contextmanager
+    def writing(self, key, storage="df"):
+        """
+        Context manager yielding a temporary path to write the result of `key` into.
+
+        On success the file is renamed to `self.path(key, storage)` in one atomic step (register it with
+        `store`); on error it is removed and the cached file, if any, is left untouched.
+        """
+        path = self.path(key, storage)
+        tmp = temporary_path(path)
+        try:
+            yield tmp
+            self._replace(tmp, path)
+        finally:
+            self._unlink(tmp)
+
+    def write(self, key, df):
+        """Write the DataFrame result of `key` to its file in `frame_format`, atomically (register it with `store`)."""
+        from bcrpy.utils import save_dataframe
+        with self.writing(key, "df") as tmp:
+            save_dataframe(df, tmp, format=self.frame_format, compression=self.compression)
+
+    def read(self, key, columns=None, start=None, end=None):
+        """
+        Load the DataFrame result of `key`, or None on a miss.
+
+        Only `columns` (labels or series codes) and the dates between the periods `start` and `end` are
+        loaded; Feather / Parquet files read nothing else from disk.
+        """
+        from bcrpy.utils import load_dataframe
+        entry = self.lookup(key)
+        try:
+            return None if entry is None else load_dataframe(entry["path"], columns=columns, start=start, end=end)
+        except FileNotFoundError:  # evicted by another process since the lookup
+            return None
+
+    # --- manifest ---
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.directory, "index.json")
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _manifest_snapshot(self):
+        """Read-only manifest for lookups, parsed again only when `index.json` was replaced since the last read."""
+        try:
+            stat = os.stat(self.manifest_path)
+        except OSError:
+            return {}
+        version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if self._snapshot is None or self._snapshot[0] != version:
+            self._snapshot = (version, self._read_manifest())
+        return self._snapshot[1]
+
+    def _write_manifest(self, manifest):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = temporary_path(self.manifest_path)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        self._replace(tmp, self.manifest_path)
+
+    def locked(self):
+        """File lock serializing the read-modify-write cycles of the manifest across threads and processes."""
+        return FileLock(os.path.join(self.directory, "index.lock"), timeout=self.lock_timeout)
+
+    def entries(self):
+        """Return the manifest as a dict of key -> entry (file, bytes, created, accessed (at registration), params)."""
+        return self._read_manifest()
+
+    def __len__(self):
+        return len(self._read_manifest())
+
+    @property
+    def size(self):
+        """Total bytes held by the cache."""
+        return sum(entry["bytes"] for entry in self._read_manifest().values())
+
+    # --- lookups ---
+
+    def lookup(self, key):
+        """
+        Return the manifest entry for `key`, or None on a miss.
+
+        Expired (TTL) entries and entries whose file has disappeared count as misses and are dropped.
+        A hit only touches the cached file: its modification time is the last-access time used by LRU
+        eviction, so hits neither take the lock nor rewrite the manifest.
+        """
+        entry = self._manifest_snapshot().get(key)
+        path = None if entry is None else os.path.join(self.directory, entry["file"])
+
+        if entry is not None and (self._expired(entry) or not self._touch(path)):
+            with self.locked():  # re-checked under the lock: another process may have stored it again
+                manifest = self._read_manifest()
+                current = manifest.get(key)
+                if current is not None and (self._expired(current) or not os.path.exists(path)):
+                    self._remove_file(path)
+                    del manifest[key]
+                    self._write_manifest(manifest)
+            entry = None
+
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        self.stats["bytes_read"] += entry["bytes"]
+        return dict(entry, path=path)
+
+    def store(self, key, storage, params):
+        """
+        Register the file already written at `self.path(key, storage)` and apply the eviction policy.
+
+        Nothing is registered if another process evicted the file in the meantime.
+        """
+        path = self.path(key, storage)
+        with self.locked():
+            now = time.time()
+            try:
+                nbytes = os.path.getsize(path)
+            except FileNotFoundError:
+                return
+            manifest = self._read_manifest()
+            manifest[key] = {
+                "file": os.path.basename(path),
+                "bytes": nbytes,
+                "created": now,
+                "accessed": now,
+                "params": params,
+            }
+            self.stats["bytes_written"] += nbytes
+            self._evict(manifest, keep=key)
+            self._write_manifest(manifest)
+
+    def invalidate(self, key):
+        """Drop `key` from the cache, if present."""
+        if not os.path.exists(self.manifest_path):
+            return
+        with self.locked():
+            manifest = self._read_manifest()
+            entry = manifest.pop(key, None)
+            if entry is not None:
+                self._remove_file(os.path.join(self.directory, entry["file"]))
+                self._write_manifest(manifest)
+
+    def clear(self):
+        """Remove every cached result."""
+        if not os.path.exists(self.manifest_path):
+            return
+        with self.locked():
+            manifest = self._read_manifest()
+            for entry in manifest.values():
+                self._remove_file(os.path.join(self.directory, entry["file"]))
+            self._write_manifest({})
+
+    # --- internals ---
+
+    def _expired(self, entry):
+        return self.ttl is not None and time.time() - entry["created"] > self.ttl
+
+    def _evict(self, manifest, keep=None):
+        """Drop least-recently-used entries until the size and count limits hold (never evicting `keep`)."""
+        self._empty_trash(manifest)
+        for key in [k for k, entry in manifest.items() if self._expired(entry) and k != keep]:
+            self._drop(manifest, key)
+
+        by_age = sorted((k for k in manifest if k != keep), key=lambda k: self._accessed(manifest[k]))
+        total = sum(entry["bytes"] for entry in manifest.values())
+        while by_age and (total > self.max_bytes or len(manifest) > self.max_entries):
+            key = by_age.pop(0)
+            total -= manifest[key]["bytes"]
+            self._drop(manifest, key)
+
+    def _accessed(self, entry):
+        """Last access of an entry: the mtime of its file (touched by every hit), at least its registration time."""
+        try:
+            return max(entry["accessed"], os.path.getmtime(os.path.join(self.directory, entry["file"])))
+        except OSError:
+            return entry["accessed"]
+
+    @staticmethod
+    def _touch(path):
+        """Mark a hit on `path` (False if the file is gone)."""
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        except OSError:  # e.g. read-only cache folder: the hit just does not refresh the recency
+            pass
+        return True
+
+    def _drop(self, manifest, key):
+        entry = manifest.pop(key)
+        self._remove_file(os.path.join(self.directory, entry["file"]))
+        self.stats["evictions"] += 1
+
+    def _replace(self, tmp, path):
+        """os.replace, retried while Windows refuses to replace a file another process has open."""
+        deadline = time.monotonic() + (30.0 if self.lock_timeout is None else self.lock_timeout)
+        while True:
+            try:
+                return os.replace(tmp, path)
+            except PermissionError:
+                if os.name != "nt" or time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.01)
+
+    @staticmethod
+    def _unlink(path):
+        """Remove `path` and its SQLite -wal / -shm files; False if Windows refused because one is open elsewhere."""
+        removed = True
+        for name in (path, path + "-wal", path + "-shm"):
+            try:
+                os.remove(name)
+            except FileNotFoundError:
+                pass
+            except PermissionError:
+                removed = False
+        return removed
+
+    def _remove_file(self, path):
+        """Remove a dropped entry's file (under the lock); a file still in use is left for the next eviction."""
+        if not self._unlink(path):
+            trash = self._read_trash()
+            trash.append(os.path.basename(path))
+            self._write_trash(trash)
+
+    @property
+    def _trash_path(self):
+        return os.path.join(self.directory, "trash.json")
+
+    def _read_trash(self):
+        try:
+            with open(self._trash_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def _write_trash(self, trash):
+        if not trash:
+            self._unlink(self._trash_path)
+            return
+        tmp = temporary_path(self._trash_path)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(sorted(set(trash)), f)
+        self._replace(tmp, self._trash_path)
+
+    def _empty_trash(self, manifest):
+        """Retry removing the files left behind by earlier drops, except those registered again since."""
+        trash = self._read_trash()
+        if trash:
+            registered = {entry["file"] for entry in manifest.values()}
+            self._write_trash([name for name in trash if name not in registered
+                               and not self._unlink(os.path.join(self.directory, name))])
+
+
+class MetadataCache:
+    def __init__(self, directory=".bcrpy_cache", ttl=24 * 3600):
+        """
+        Persistent snapshot of the BCRPData metadata, used by `get_metadata`.
+
+        The metadata is stored in a compact columnar form (low-cardinality text columns as
+        categoricals): an uncompressed Feather file when pyarrow is installed, a pickle otherwise.
+        Either way the whole snapshot is loaded into pandas memory (the categoricals keep it small).
+        A sidecar `metadata.json` keeps the download time and the server's ETag / Last-Modified
+        validators for conditional revalidation.
+
+        Attributes
+        ----------
+        directory : str
+            Folder holding the snapshot (shared with ResultCache by default).
+        ttl : float or None
+            Seconds during which the snapshot is used without contacting BCRPData. After that it is
+            revalidated with a conditional request. None never revalidates automatically.
+        """
+        self.directory = directory
+        self.ttl = ttl
+
+    @property
+    def info_path(self):
+        return os.path.join(self.directory, "metadata.json")
+
+    def info(self):
+        """Return the snapshot's sidecar (file, fetched, etag, last_modified), or {} if there is no snapshot."""
+        try:
+            with open(self.info_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def is_fresh(self):
+        """True if a snapshot exists and is younger than the TTL."""
+        info = self.info()
+        if not info or not os.path.exists(os.path.join(self.directory, info["file"])):
+            return False
+        return self.ttl is None or time.time() - info["fetched"] < self.ttl
+
+    def validators(self):
+        """Conditional request headers (If-None-Match / If-Modified-Since) for the stored snapshot."""
+        info = self.info()
+        headers = {}
+        if info.get("etag"):
+            headers["If-None-Match"] = info["etag"]
+        if info.get("last_modified"):
+            headers["If-Modified-Since"] = info["last_modified"]
+        return headers
+
+    def load(self):
+        """Read the snapshot into a pandas DataFrame. Returns None if there is no usable snapshot."""
+        info = self.info()
+        if not info:
+            return None
+        path = os.path.join(self.directory, info["file"])
+        try:
+            if path.endswith(".feather"):
+                from pyarrow import feather
+                return feather.read_table(path).to_pandas()
+            return pd.read_pickle(path)
+        except (OSError, ValueError, ImportError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def store(self, metadata, etag=None, last_modified=None):
+        """
+        Save `metadata` as the new snapshot and return its compact form.
+
+        The file is written under a temporary name and moved into place, so readers never see a
+        partially written snapshot.
+        """
+        compact = compact_frame(metadata)
+        os.makedirs(self.directory, exist_ok=True)
+        name = "metadata.feather" if HAS_PYARROW else "metadata.pkl"
+        path = os.path.join(self.directory, name)
+        tmp = temporary_path(path)
+        if HAS_PYARROW:
+            compact.to_feather(tmp, compression="uncompressed")
+        else:
+            compact.to_pickle(tmp)
+        os.replace(tmp, path)
+        self._write_info({"file": name, "fetched": time.time(), "etag": etag, "last_modified": last_modified})
+        return compact
+
+    def touch(self):
+        """Mark the snapshot as revalidated now (the server answered 304 Not Modified)."""
+        info = self.info()
+        if info:
+            info["fetched"] = time.time()
+            self._write_info(info)
+
+    def clear(self):
+        """Remove the snapshot."""
+        info = self.info()
+        for name in (info.get("file"), "metadata.json"):
+            if name and os.path.exists(os.path.join(self.directory, name)):
+                os.remove(os.path.join(self.directory, name))
+
+    def _write_info(self, info):
+        tmp = temporary_path(self.info_path)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(info, f, indent=2)
+        os.replace(tmp, self.info_path)
+
+
+def compact_frame(df, max_ratio=0.5):
+    """Copy of `df` with a default index and its low-cardinality text columns converted to categoricals."""
+    df = df.reset_index(drop=True)
+    df.columns = [str(col) for col in df.columns]
+    for col in df.columns:
+        if df[col].dtype == object and df[col].nunique() <= max_ratio * len(df):
+            df[col] = df[col].astype("category")
+    return df
@@ -0,0 +1,151 @@
+import pandas as pd
+
+from bcrpy._store import period_bounds
+
+try:
+    import pyarrow  # noqa: F401  (optional: enables the Parquet / Feather backends)
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+FORMATS = ("pickle", "parquet", "feather")
+EXTENSIONS = {".parquet": "parquet", ".pq": "parquet", ".feather": "feather", ".arrow": "feather"}
+DEFAULT_COMPRESSION = {"parquet": "zstd", "feather": "uncompressed"}
+MAGIC = {b"PAR1": "parquet", b"ARROW1": "feather"}
+
+
+def file_format(path):
+    """Format of a stored frame from the file's magic bytes, whatever its extension ('pickle' otherwise)."""
+    with open(path, "rb") as f:
+        head = f.read(6)
+    return next((fmt for magic, fmt in MAGIC.items() if head.startswith(magic)), "pickle")
+
+
+def columnar_supported(df):
+    """True if `df` can be stored as Parquet / Feather without loss: unique string labels and no sparse columns."""
+    columns = df.columns
+    return (HAS_PYARROW and not isinstance(columns, pd.MultiIndex) and columns.is_unique
+            and all(isinstance(col, str) for col in columns)
+            and not any(isinstance(dtype, pd.SparseDtype) for dtype in df.dtypes))
+
+
+def write_frame(df, path, format="parquet", compression=None):
+    """
+    Write `df` as a Parquet or Feather (Arrow IPC) file, index included.
+
+    `compression` is any codec pyarrow supports for the format (Parquet: 'zstd' (default), 'snappy',
+    'gzip', 'brotli', 'lz4', 'none'; Feather: 'uncompressed' (default, allows zero-copy memory-mapped
+    reads), 'lz4', 'zstd').
+    """
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=None)  # RangeIndex as metadata, other indexes as columns
+    compression = DEFAULT_COMPRESSION[format] if compression is None else compression
+    if format == "parquet":
+        from pyarrow import parquet
+        parquet.write_table(table, path, compression=compression)
+    elif format == "feather":
+        from pyarrow import feather
+        feather.write_feather(table, path, compression=compression)
+    else:
+        raise ValueError(f"Unknown columnar format {format!r}: use 'parquet' or 'feather'.")
+
+
+def resolve_columns(names, columns):
+    """
+    Stored column names selected by `columns`: column labels, or series codes matching the
+    '<name>, codigo no. <code>' labels of largeGET results. Raises KeyError for unknown entries.
+    """
+    by_code = {name.split(", codigo no. ")[-1]: name for name in names if ", codigo no. " in name}
+    known = set(names)
+    selected, missing = [], []
+    for col in columns:
+        if col in known:
+            selected.append(col)
+        elif col in by_code:
+            selected.append(by_code[col])
+        else:
+            missing.append(col)
+    if missing:
+        raise KeyError(f"columns not found in the stored frame: {missing}")
+    return selected
+
+
+def date_range(start=None, end=None):
+    """(first, last) Timestamps covered by the request periods `start` and `end` (None when open)."""
+    first = None if start is None else period_bounds(start)[0]
+    last = None if end is None else period_bounds(end)[1]
+    return first, last
+
+
+def read_frame(path, format=None, columns=None, start=None, end=None, memory_map=True):
+    """
+    Read a Parquet / Feather frame, loading only the requested columns and dates.
+
+    Parameters
+    ----------
+    path : str
+        File written by `write_frame`.
+    format : str, optional
+        'parquet' or 'feather' (default: detected from the file).
+    columns : list of str, optional
+        Column labels or series codes to load (default: all). The index is always loaded.
+    start, end : str, optional
+        Request periods ('YYYY', 'YYYY-M' or 'YYYY-MM-DD') bounding the rows, applied to the date index
+        (or to the `date` column of long frames, where `columns` selects the rows of `code` instead).
+        Parquet skips the row groups outside the range.
+    memory_map : bool
+        Map the file instead of reading it (zero-copy for uncompressed Feather).
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    format = file_format(path) if format is None else format
+    if format == "parquet":
+        from pyarrow import parquet
+        schema = parquet.read_schema(path, memory_map=memory_map)
+    else:
+        with pa.memory_map(path) as source:
+            schema = pa.ipc.open_file(source).schema
+
+    metadata = schema.pandas_metadata or {}
+    index_columns = [col for col in metadata.get("index_columns", []) if isinstance(col, str)]
+    stored = [name for name in schema.names if name not in index_columns]
+    long = {"code", "date", "value"} <= set(stored) and not index_columns
+    date_column = "date" if long else (index_columns[0] if index_columns else None)
+
+    if columns is None or long:
+        selected = None
+    else:
+        selected = resolve_columns(stored, columns) + index_columns
+
+    first, last = date_range(start, end)
+    if (first is not None or last is not None) and \
+            (date_column is None or not pa.types.is_timestamp(schema.field(date_column).type)):
+        raise ValueError("start / end need a frame indexed by date (stored with datetime=True).")
+    if format == "parquet":
+        from pyarrow import parquet
+        filters = []
+        if date_column is not None and first is not None:
+            filters.append((date_column, ">=", first))
+        if date_column is not None and last is not None:
+            filters.append((date_column, "<=", last))
+        if long and columns is not None:
+            filters.append(("code", "in", list(columns)))
+        table = parquet.read_table(path, columns=selected, filters=filters or None, memory_map=memory_map,
+                                   use_pandas_metadata=True)
+    else:
+        from pyarrow import feather
+        table = feather.read_table(path, columns=selected, memory_map=memory_map)
+        mask = None
+        if date_column is not None and first is not None:
+            mask = pc.greater_equal(table[date_column], pa.scalar(first, table.schema.field(date_column).type))
+        if date_column is not None and last is not None:
+            below = pc.less_equal(table[date_column], pa.scalar(last, table.schema.field(date_column).type))
+            mask = below if mask is None else pc.and_(mask, below)
+        if long and columns is not None:
+            in_codes = pc.is_in(pc.cast(table["code"], pa.string()), value_set=pa.array([str(c) for c in columns]))
+            mask = in_codes if mask is None else pc.and_(mask, in_codes)
+        if mask is not None:
+            table = table.filter(mask)
+    return table.to_pandas()
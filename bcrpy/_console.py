@@ -0,0 +1,22 @@
+_ready = False
+
+
+def setup():
+    """Enable ANSI colors on the Windows console (colorama), once, before the first colored message."""
+    global _ready
+    if not _ready:
+        from colorama import just_fix_windows_console
+        just_fix_windows_console()
+        _ready = True
+
+
+def colored(text, color=None, on_color=None, attrs=None):
+    """`termcolor.colored`, loading termcolor and setting up the console on first use."""
+    from termcolor import colored as termcolor_colored
+    setup()
+    return termcolor_colored(text, color, on_color, attrs)
+
+
+def cprint(text, color=None, on_color=None, attrs=None, **kwargs):
+    """`termcolor.cprint`: print `text` in color (keyword arguments go to print)."""
+    print(colored(text, color, on_color, attrs), **kwargs)
@@ -0,0 +1,219 @@
+import asyncio
+import contextlib
+import math
+import threading
+import time
+from collections import deque
+
+
+class TokenBucket:
+    def __init__(self, rate, burst=1):
+        """
+        Client-side rate limit: at most `rate` requests per second, with bursts of up to `burst` requests.
+
+        Thread-safe; `acquire` blocks the calling thread until a token is available. Each process
+        holds its own bucket, so a pool of N worker processes may send up to N * `rate` requests per
+        second.
+
+        Attributes
+        ----------
+        rate : float
+            Tokens added per second.
+        burst : int
+            Capacity of the bucket.
+        """
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate!r}")
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take one token and return how long (seconds) the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self):
+        """Block until a token is available."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def __getstate__(self):
+        state = dict(self.__dict__, _tokens=float(self.burst), _updated=time.monotonic())
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+class AIMDController:
+    def __init__(self, initial=4, minimum=1, maximum=32, latency_factor=2.0, decrease=0.5):
+        """
+        Additive-increase / multiplicative-decrease limit on the number of chunk requests in flight.
+
+        Every successful request grows the window by 1/window (about +1 per round of requests). A failed
+        request, or a smoothed latency above `latency_factor` times the best latency seen, multiplies the
+        window by `decrease`; after a decrease, further signals are ignored until the requests already in
+        flight have completed, so one burst of errors shrinks the window only once.
+
+        Attributes
+        ----------
+        initial, minimum, maximum : int
+            Starting window and its bounds.
+        latency_factor : float
+            Congestion threshold, relative to the best latency observed.
+        decrease : float
+            Multiplicative decrease factor.
+        """
+        self.minimum, self.maximum = minimum, max(minimum, maximum)
+        self.initial = min(max(initial, self.minimum), self.maximum)
+        self.latency_factor = latency_factor
+        self.decrease = decrease
+
+        self.window = float(self.initial)
+        self.in_flight = 0
+        self.peak = self.initial
+        self.requests = self.errors = self.decreases = 0
+        self.samples = []  # (series in the request, latency in seconds) of every completed request
+        self._best = math.inf
+        self._smoothed = None
+        self._cooldown = 0
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+        self._async_condition = None
+
+    @property
+    def limit(self):
+        """Number of requests currently allowed in flight."""
+        return max(self.minimum, int(self.window))
+
+    def record(self, latency, ok=True, size=None):
+        """Update the window with the outcome of one completed request (call with the lock held or from one thread)."""
+        self.requests += 1
+        self.samples.append((size, latency))
+        congested = False
+        if ok:
+            self._best = min(self._best, latency)
+            self._smoothed = latency if self._smoothed is None else 0.8 * self._smoothed + 0.2 * latency
+            congested = self._smoothed > self.latency_factor * self._best
+        else:
+            self.errors += 1
+
+        if self._cooldown > 0:
+            self._cooldown -= 1
+        elif not ok or congested:
+            self.window = max(self.minimum, self.window * self.decrease)
+            self.decreases += 1
+            self._cooldown = self.in_flight
+            self._smoothed = None
+        else:
+            self.window = min(self.maximum, self.window + 1 / self.window)
+        self.peak = max(self.peak, self.limit)
+
+    @contextlib.contextmanager
+    def slot(self, size=None):
+        """Hold one in-flight slot (blocking while the window is full); the body's duration and outcome are recorded."""
+        with self._condition:
+            self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+        t0, ok = time.perf_counter(), False
+        try:
+            yield
+            ok = True
+        finally:
+            with self._condition:
+                self.in_flight -= 1
+                self.record(time.perf_counter() - t0, ok, size)
+                self._condition.notify_all()
+
+    @contextlib.asynccontextmanager
+    async def aslot(self, size=None):
+        """asyncio version of `slot`, for requests awaited on one event loop."""
+        if self._async_condition is None:
+            self._async_condition = asyncio.Condition()
+        condition = self._async_condition
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+        t0, ok = time.perf_counter(), False
+        try:
+            yield
+            ok = True
+        finally:
+            async with condition:
+                with self._lock:
+                    self.in_flight -= 1
+                    self.record(time.perf_counter() - t0, ok, size)
+                condition.notify_all()
+
+    def report(self):
+        """Settings chosen during the run and what drove them."""
+        latencies = [latency for _, latency in self.samples]
+        return {
+            "initial_concurrency": self.initial,
+            "final_concurrency": self.limit,
+            "peak_concurrency": self.peak,
+            "requests": self.requests,
+            "errors": self.errors,
+            "decreases": self.decreases,
+            "mean_latency": sum(latencies) / len(latencies) if latencies else None,
+        }
+
+
+class ChunkTuner:
+    def __init__(self, max_series=100, overhead_share=0.1, history=256):
+        """
+        Chooses the largeGET chunk size from the measured cost of past requests.
+
+        Request latency is modelled as `overhead + per_series * series` (least squares over the recorded
+        requests). The chunk size is the smallest one whose fixed overhead is at most `overhead_share` of
+        the request time, but never so large that the chunks cannot keep every worker busy.
+
+        Attributes
+        ----------
+        max_series : int
+            Upper bound of the chunk size.
+        overhead_share : float
+            Target share of the per-request overhead in the request time.
+        samples : collections.deque
+            (series, latency) of the most recent `history` requests.
+        """
+        self.max_series = max_series
+        self.overhead_share = overhead_share
+        self.samples = deque(maxlen=history)
+
+    def add(self, samples):
+        """Record (series, latency) samples; samples without a size are ignored."""
+        self.samples.extend((size, latency) for size, latency in samples if size)
+
+    def fit(self):
+        """Return (overhead, per_series) in seconds, or None without samples."""
+        if not self.samples:
+            return None
+        import numpy as np  # only here: bcrpy._transport imports this module and must not load numpy
+
+        sizes, latencies = np.array(self.samples, dtype=np.float64).T
+        if len(np.unique(sizes)) > 1:
+            per_series, overhead = np.polyfit(sizes, latencies, 1)
+            if per_series > 0:
+                return max(overhead, 0.0), per_series
+        return 0.0, float(np.mean(latencies / sizes))
+
+    def suggest(self, n_codes, concurrency):
+        """Chunk size for fetching `n_codes` series with `concurrency` requests in flight."""
+        spread = max(1, math.ceil(n_codes / max(1, concurrency)))  # one round of requests keeps every worker busy
+        model = self.fit()
+        if model is None:
+            return min(self.max_series, spread)
+        overhead, per_series = model
+        amortized = math.ceil(overhead * (1 - self.overhead_share) / (self.overhead_share * per_series)) if overhead else 1
+        return int(min(self.max_series, spread, max(1, amortized)))
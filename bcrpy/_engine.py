@@ -0,0 +1,100 @@
+import asyncio
+import contextlib
+import functools
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from bcrpy._transport import get_transport
+
+ChunkRequest = namedtuple("ChunkRequest", ["codes", "start", "end", "lang", "format", "forget", "stream"], defaults=[False])
+ChunkRequest.__doc__ = """Immutable state of one largeGET chunk: the codes (tuple) and the request parameters it was frozen with."""
+
+
+async def to_thread(func, *args, **kwargs):
+    """Await `func(*args, **kwargs)` run on the loop's default thread executor (asyncio.to_thread needs Python 3.9)."""
+    return await asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+
+@contextlib.asynccontextmanager
+async def no_slot():
+    """Async no-op context manager (contextlib.nullcontext supports `async with` only from Python 3.10)."""
+    yield
+
+
+def run_coroutine(coro):
+    """Run `coro` to completion from synchronous code, even when an event loop is already running (e.g. Jupyter)."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    result = {}
+
+    def target():
+        try:
+            result["value"] = asyncio.run(coro)
+        except BaseException as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join()
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
+
+
+class AsyncEngine:
+    def __init__(self, concurrency=32, transport=None):
+        """
+        asyncio engine running many chunk requests concurrently on one event loop.
+
+        At most `concurrency` requests are in flight at any time (asyncio.Semaphore). The blocking
+        pooled transport runs on a private thread executor of the same size, so the event loop is
+        never blocked on sockets and no process is forked or pickled.
+
+        Attributes
+        ----------
+        concurrency : int
+            Maximum number of requests in flight.
+        transport : Transport, optional
+            Transport to use (default: the shared transport returned by `get_transport`).
+        """
+        self.concurrency = concurrency
+        self.transport = transport or get_transport()
+        self._executor = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="bcrpy-io")
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._executor.shutdown(wait=False)
+        self._executor = self._semaphore = None
+
+    async def get(self, url):
+        """Await the response for `url` without blocking the event loop."""
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, self.transport.get, url)
+
+    async def fetch(self, url, handler):
+        """Await `handler(response)` for a streamed request: both the request and the body are read off the event loop."""
+        def call():
+            return handler(self.transport.get(url, stream=True))
+
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    async def run(self, worker, items):
+        """
+        Run `await worker(self, item)` for every item concurrently.
+
+        Returns
+        -------
+        list
+            One result per item, in input order; a failed item yields its exception instead of a result.
+        """
+        return await asyncio.gather(*(worker(self, item) for item in items), return_exceptions=True)
@@ -1,17 +1,42 @@
-import sqlite3
-import os, datetime, json
-
-import requests
-from termcolor import colored
+import asyncio
+import contextlib
+import datetime
+import functools
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 import pandas as pd
-from pathos.multiprocessing import ProcessPool
 
-from bcrpy.utils import save_dataframe, load_dataframe, save_df_as_sql, load_from_sqlite
-from bcrpy.hacha import Axe
+from bcrpy.utils import load_dataframe, save_df_as_sql, load_from_sqlite
+from bcrpy.hacha import Axe, merge_sorted
+from bcrpy import _sqlite
+from bcrpy._console import colored
+from bcrpy._transport import get_transport
+from bcrpy._engine import AsyncEngine, ChunkRequest, no_slot, run_coroutine, to_thread
+from bcrpy._frames import check_output, combine_columns, concat_long, memory_report, order_long, output_options, to_output
+from bcrpy._parser import arrays_to_frame, parse_payload, period_index, read_response
+from bcrpy._planner import plan_requests
+from bcrpy._store import period_bounds
+from bcrpy._control import AIMDController
+from bcrpy._jobs import ChunkJob
+from bcrpy._instrument import Reporter, Stats, attach_stats, pop_stats, response_bytes
+
+def reorder(df, order):
+    """Columns of `df` in `order` (positions), without copying when the order is unchanged."""
+    return df if order == list(range(df.shape[1])) else df.iloc[:, order]
+
+
+def check_sql_mode(sql_mode, storage):
+    """Validate the `sql_mode` option of largeGET."""
+    if sql_mode not in ("replace", "upsert"):
+        raise ValueError(f"Unknown sql_mode {sql_mode!r}: use 'replace' or 'upsert'.")
+    if sql_mode == "upsert" and storage != "sql":
+        raise ValueError("sql_mode='upsert' needs storage='sql'.")
 
-class Fetcher:
-    def GET(self, codes=[], start=None, end=None, forget=False, order=True, datetime=True, check_codes=False, storage='df'):
+
+class Fetcher(Reporter):
+    def GET(self, codes=[], start=None, end=None, forget=False, order=True, datetime=True, check_codes=False, storage='df', sql_layout='wide', incremental=False, output='wide', dtype='float64'):
         """
         Extracts selected data from BCRPData based on previously declared variables.
 
@@ -40,7 +65,20 @@ class Fetcher:
         
         storage : str, optional
             Data storage format: 'df' (DataFrame) or 'sql' (SQLite). Controls the format in which the information is stored and returned.
+
+        sql_layout : str, optional
+            Table layout used when storage='sql': 'wide' (default, one column per series) or 'long' (tidy `(code, date, value)` table keyed on (code, date)).
+
+        incremental : bool, optional
+            If True, the request is served from the per-series store in `self.store`, fetching only the date ranges not held yet (see `get_incremental`). Always returns a DataFrame with a datetime index.
+
+        output : str, optional
+            Shape of the returned DataFrame: 'wide' (default, one column per series), 'sparse' (sparse columns that do not store NaN) or 'long' (tidy `(code, date, value)` frame holding only the observed points).
+
+        dtype : str, optional
+            Value dtype: 'float64' (default) or 'float32' (half the memory, ~7 significant digits).
         """
+        check_output(output, dtype)
         if bool(len(codes)):
             self.codes = codes
         if start is not None:
@@ -48,11 +86,6 @@ class Fetcher:
         if end is not None:
             self.end = end
 
-        root = "https://estadisticas.bcrp.gob.pe/estadisticas/series/api"
-        format = self.format
-        period = "{}/{}".format(self.start, self.end)
-        language = self.lang
-
         if check_codes:
             valid_codes = self.check_metadata_codes()
             if valid_codes is None:
@@ -61,72 +94,164 @@ class Fetcher:
         else:
             code_series = "-".join(self.codes)
 
-        cache_filename = "cache.bcrfile"
-        sql_cache_filename = "cache.db"
+        stats = self.stats = Stats("GET", codes=len(code_series.split("-")))
+        if incremental:
+            df = self.get_incremental(code_series.split("-"), forget=forget, stats=stats)
+            with stats.phase("shape"):
+                self.data = self.shape_output(df, output, dtype, code_series.split("-"))
+            return self.finish_stats(self.data, stats)
 
-        if (data := self.load_from_cache(cache_filename, sql_cache_filename, forget, storage)) is not None:
-            return data 
-        
-        url = f"{root}/{code_series}/{format}/{period}/{language}"
-        print(f"URL: {url}")
+        if storage == 'sql':
+            cache_key, cache_params = self.cache_key("GET", code_series.split("-"), storage, layout=sql_layout)
+        else:
+            cache_key, cache_params = self.cache_key("GET", code_series.split("-"), storage, order=order, datetime=datetime,
+                                                     **output_options(output, dtype))
 
+        with stats.phase("cache_read"):
+            data = self.load_from_cache(cache_key, forget, storage)
+            if data is None and storage == 'sql' and sql_layout == 'long' and not forget:
+                data = self.load_covering_sql(code_series.split("-"))
+        if data is not None:
+            stats.count("cache_hits")
+            return self.finish_stats(data if storage == 'df' else self.shape_sql(data, output, dtype, code_series.split("-")),
+                                     stats)
+        
         # Fetching from URL as cache is either empty or `forget` is True
-        print(colored("Obteniendo información con la URL de arriba usando requests.get. Por favor espere...", "green", attrs=["blink"]))
-        response = requests.get(url)
-
-        if response.status_code != 200:
-            print(f"Error: Unable to fetch data, status code {response.status_code}")
-            return pd.DataFrame()
-
-        data = response.json()
-
-        header = [k["name"] for k in data["config"]["series"]]
+        data = self.request_series(code_series, self.start, self.end, stats)
+        if data is None:
+            return self.finish_stats(pd.DataFrame(), stats)
 
         if storage == 'df':
-            # Convert JSON data to DataFrame and save as cache
-            df = pd.DataFrame(columns=header)
-
-            for period in data["periods"]:
-                df.loc[period["name"]] = [
-                    float(value) if value != "n.d." else None 
-                    for value in period["values"]
-                ]
+            # Convert parsed arrays to DataFrame (columnar, single constructor call) and save as cache
+            with stats.phase("frame"):
+                df = arrays_to_frame(*data)
 
             if datetime:
-                df.index = pd.to_datetime(df.index, errors="coerce")
+                with stats.phase("dates"):
+                    df.index = period_index(df.index)
 
             self.data = df
-            self.order_columns() if order else self.order_columns(False)
-
-            # NEW: save with metadata sidecar
-            save_dataframe(
-                df, 
-                cache_filename,
-                meta={
-                    "codes": self.codes,
-                    "start": self.start,
-                    "end": self.end,
-                    "lang": self.lang,
-                }
-            )
+            with stats.phase("order"):
+                self.order_columns() if order else self.order_columns(False)
+            if (output, dtype) != ('wide', 'float64'):
+                with stats.phase("shape"):
+                    codes = self.codes if order else self.series_codes(list(self.data.columns))
+                    self.data = self.shape_output(self.data, output, dtype, codes)
 
-            return self.data
+            with stats.phase("cache_write"):
+                self.cache.write(cache_key, self.data)
+                self.cache.store(cache_key, storage, cache_params)
+
+            return self.finish_stats(self.data, stats)
 
         
         elif storage == 'sql':
-            self.save_to_sqlite(data, header, sql_cache_filename)
-            print(colored("Data saved to SQLite database cache.", "green"))
+            sql_cache_filename = self.cache.path(cache_key, storage)
+            with stats.phase("cache_write"):
+                header, labels, values = data
+                dates = period_index(labels)
+                if not dates.isna().any():  # ISO dates: date ranges can be filtered in SQL
+                    labels = _sqlite.format_labels(dates)
+                with self.cache.writing(cache_key, storage) as tmp:
+                    self.save_to_sqlite((header, labels, values), db_name=tmp, layout=sql_layout,
+                                        codes=code_series.split("-"))
+                self.cache.store(cache_key, storage, cache_params)
+            self.echo("Data saved to SQLite database cache.", color="green")
 
-            # NEW: also write .meta sidecar
-            meta = {"codes": self.codes, "start": self.start, "end": self.end, "lang": self.lang}
-            with open(sql_cache_filename + ".meta", "w", encoding="utf-8") as f:
-                json.dump(meta, f, indent=2, ensure_ascii=False)
+            with stats.phase("cache_read"):
+                df = load_from_sqlite(sql_cache_filename, verbose=not self.quiet)
+            with stats.phase("shape"):
+                df = self.shape_sql(df, output, dtype, code_series.split("-"))
+            return self.finish_stats(df, stats)
 
-            return load_from_sqlite(sql_cache_filename)
+    def finish_stats(self, df, stats):
+        """Helper method for GET and largeGET. Stop the run's timers, report them to the hooks and attach them to `df`."""
+        return attach_stats(df, stats.finish())
 
+    def request_series(self, code_series, start, end, stats=None):
+        """
+        Request one URL from the BCRPData API and return it parsed as (header, labels, values), or None on failure.
 
+        With `self.stream` the body is parsed incrementally as it arrives (see `bcrpy._parser.parse_stream`).
 
-    def largeGET(self, codes=[], start=None, end=None, forget=False, chunk_size=100, turbo=True, nucleos=4, check_codes=False, storage='df'):
+        Parameters
+        ----------
+        code_series : str
+            Series codes joined by '-'.
+        start, end : str
+            Request periods (e.g. '2010-1').
+        stats : Stats, optional
+            Run statistics receiving the 'network' and 'decode' phases and the request counters.
+        """
+        stats = Stats("GET", codes=len(code_series.split("-"))) if stats is None else stats
+        transport = get_transport()
+        url = transport.series_url(code_series, self.format, start, end, self.lang)
+        self.echo(f"URL: {url}")
+
+        self.echo("Obteniendo información con la URL de arriba. Por favor espere...", color="green", attrs=["blink"])
+        t0 = time.perf_counter()
+        with stats.phase("network"):
+            response = transport.get(url, stream=self.stream)
+
+        if response.status_code != 200:
+            print(f"Error: Unable to fetch data, status code {response.status_code}")
+            stats.request(url, response.status_code, response_bytes(response, self.stream), time.perf_counter() - t0)
+            response.close()
+            return None
+
+        with stats.phase("decode"):
+            data = read_response(response, self.stream)
+        stats.request(url, response.status_code, response_bytes(response, self.stream), time.perf_counter() - t0)
+        return data
+
+    def get_incremental(self, codes, forget=False, max_codes=100, stats=None):
+        """
+        Serve a request from the per-series store in `self.store`, fetching only what is missing.
+
+        Every code keeps a record of the date ranges already fetched. Only the uncovered ranges of
+        [self.start, self.end] are requested from BCRPData; codes missing the same range share a
+        single API call (up to `max_codes` codes per call). Requests for fewer codes or narrower
+        dates than already stored are answered without any network access.
+
+        Parameters
+        ----------
+        codes : list of str
+            Series codes to return.
+        forget : bool
+            If True, the stored coverage of `codes` is dropped and the full window is fetched again.
+        max_codes : int
+            Maximum number of codes per API call.
+        stats : Stats, optional
+            Run statistics receiving the timings of the API calls and of the store reads and writes.
+        """
+        stats = Stats("GET", codes=len(codes)) if stats is None else stats
+        if forget:
+            self.store.forget(codes)
+
+        with stats.phase("cache_read"):
+            plan = self.store.missing(codes, self.start, self.end)
+        calls = 0
+        for (start, end), pending in plan.items():
+            for i in range(0, len(pending), max_codes):
+                group = pending[i:i + max_codes]
+                data = self.request_series("-".join(group), start, end, stats)
+                calls += 1
+                if data is None:
+                    continue
+                header, labels, values = data
+                with stats.phase("cache_write"):
+                    self.store.write(self.series_codes(header, group), header, period_index(labels), values, start, end)
+
+        self.echo(f"[STORE] {len(codes)} series served from the local store with {calls} API call(s).", color="yellow")
+
+        with stats.phase("cache_read"):
+            df = self.store.read(codes, self.start, self.end)
+        names = self.store.names(codes)
+        df.columns = [names.get(code, code) for code in df.columns]
+        self.data = df
+        return self.data
+
+    def largeGET(self, codes=[], start=None, end=None, forget=False, chunk_size=100, turbo=True, nucleos=4, check_codes=False, storage='df', sql_layout='wide', executor=None, output='wide', dtype='float64', job_id=None, sql_mode='replace', database=None):
         """
         Extracts selected BCRPData series when the quantity exceeds 100 time series.
 
@@ -134,6 +259,8 @@ class Fetcher:
         -------------
         codes : list, optional
             List of time series codes to retrieve, used in turbo mode (parallel computation). Default is an empty list.
+            An entry may also be a `(code, start, end)` tuple to request that code over its own window. Codes are
+            grouped into requests by frequency and window (see `plan_large`); repeated codes are requested once.
         
         start : str, optional
             Start date in 'YYYY-M' format for the data series. If provided, this date replaces `self.start` defined in the constructor, only for this request. If not provided, `self.start` is used.
@@ -141,21 +268,445 @@ class Fetcher:
         end : str, optional
             End date in 'YYYY-M' format for the data series. If provided, this date replaces `self.end` defined in the constructor, only for this request. If not provided, `self.end` is used.
         
-        chunk_size : int, optional
-            Number of time series to retrieve per chunk. Default is 100.
+        chunk_size : int or 'auto', optional
+            Maximum number of time series to retrieve per chunk. Default is 100. Chunks are also kept under the
+            API's URL length limit. With 'auto', the size is chosen from the per-series cost measured on previous
+            requests (see `Marco.tuner`).
         
         turbo : bool, optional
-            Indicates whether to use "turbo" mode for parallel extraction. Default is True.
+            Indicates whether to use "turbo" mode for parallel extraction. Default is True. Ignored when `executor` is given.
         
-        nucleos : int, optional
-            Number of processor cores to use in "turbo" mode. Default is 4.
+        nucleos : int or 'auto', optional
+            Number of worker processes/threads in parallel modes (or requests in flight with executor='async'). Default is 4.
+            With 'auto', the number of requests in flight adapts to the observed latency and errors (AIMD, from 4 up to
+            the transport's `pool_size`); requires executor 'thread' (the default in that case) or 'async', and raises
+            ValueError with executor='process'. Serial runs (turbo=False) always send one request at a time.
         
         check_codes : bool, optional
             If True, validates the time series codes against metadata before making the request. Default is False.
         
         storage : str, optional
             Data storage format: `df` (DataFrame) or `sql` (SQLite). Controls the format in which the data is stored and returned.
+
+        sql_layout : str, optional
+            Table layout used when storage='sql': 'wide' (default) or 'long' (tidy `(code, date, value)` table, recommended for pulls of many series).
+            With 'long', the columns of the returned DataFrame are the series codes, whether it was fetched or read from the cache.
+
+        executor : str, optional
+            How chunks are executed: 'thread' (thread pool, no serialization), 'process' (pathos process pool),
+            'async' (asyncio engine) or 'serial'. Default: 'process' when turbo=True, otherwise 'serial'.
+
+        output : str, optional
+            Shape of the returned DataFrame: 'wide' (default), 'sparse' (sparse columns that do not store NaN) or
+            'long' (tidy `(code, date, value)` frame holding only the observed points). Series of mixed frequencies
+            are mostly NaN once aligned on one date index, so 'sparse' and 'long' avoid storing those NaN.
+
+        dtype : str, optional
+            Value dtype: 'float64' (default) or 'float32'.
+
+        job_id : str, optional
+            Run as a resumable job: every completed chunk is checkpointed to disk with a job manifest, and a rerun
+            with the same `job_id` fetches only the chunks that failed or were never fetched, then assembles the
+            result from the checkpoints. The result is cached only once every chunk is available. See `Marco.job`.
+
+        sql_mode : str, optional
+            How storage='sql' writes the result: 'replace' (default) stores it as a new cached database of its own;
+            'upsert' merges every fetched chunk into the shared long-layout store `database`, keyed on (code, date):
+            new points are inserted, only changed values are updated, and each chunk is recorded in the store's
+            ingest log (see `bcrpy.read_ingest_log`). Several jobs or processes can upsert into one store, which
+            grows incrementally; chunks fetched by an incomplete run are upserted too. With 'upsert' the result
+            cache is neither read nor written (`forget` still refetches the chunks) and `sql_layout` is ignored.
+
+        database : str, optional
+            SQLite file upserted into with sql_mode='upsert' (default: 'large_store.db' in the cache folder).
+
+        The settings used (and chosen, in 'auto' modes) are printed after each run and kept in `self.fetch_report`.
+        A client-side rate limit is set on the transport: `bcrpy.set_transport(bcrpy.Transport(rate_limit=10))`.
+        """
+        executor = executor or ("serial" if not turbo else "thread" if nucleos == "auto" else "process")
+        if executor not in ("serial", "thread", "process", "async"):
+            raise ValueError(f"Unknown executor {executor!r}: use 'serial', 'thread', 'process' or 'async'.")
+        if nucleos == "auto" and executor == "process":
+            raise ValueError("nucleos='auto' needs executor='thread' or 'async': process pools have a fixed size.")
+        check_output(output, dtype)
+        check_sql_mode(sql_mode, storage)
+
+        valid_codes, cache_key, cache_params = self.prepare_large(codes, start, end, check_codes, storage, sql_layout, output, dtype)
+        if valid_codes is None:
+            self.echo("No valid codes found. Skipping the large GET request.")
+            return pd.DataFrame() if storage == 'df' else None
+
+        stats = self.stats = Stats("largeGET", codes=len(valid_codes), executor=executor)
+        with stats.phase("cache_read"):
+            data = self.load_from_cache(cache_key, forget, storage) if sql_mode == 'replace' else None
+        if data is not None:
+            stats.count("cache_hits")
+            return self.finish_stats(data if storage == 'df' else self.shape_sql(data, output, dtype, valid_codes), stats)
+
+        if executor != "serial" and self.metadata.empty:
+            with stats.phase("metadata"):
+                self.get_metadata()  # load once here instead of once per worker
+
+        with stats.phase("plan"):
+            controller = self.fetch_controller(executor, nucleos)
+            chunk_size = self.resolve_chunk_size(chunk_size, len(valid_codes), controller)
+            job = self.job(job_id) if job_id is not None else None
+            chunk_requests, pending = self.chunk_plan(valid_codes, chunk_size, forget, job)
+        items = [(idx, chunk_requests[idx]) for idx in pending]
+
+        # Process chunks
+        fetch_started = time.perf_counter()
+        if executor == "process":
+            from pathos.multiprocessing import ProcessPool  # loaded only when a process pool is used
+            with ProcessPool(processes=controller.limit) as pool:
+                results = pool.map(functools.partial(self.fetch_indexed, job=job), items)
+        elif executor == "thread":
+            with ThreadPoolExecutor(max_workers=controller.maximum) as pool:
+                results = list(pool.map(functools.partial(self.fetch_indexed, controller=controller, job=job), items))
+        elif executor == "async":
+            results = run_coroutine(self.afetch_chunks(chunk_requests, controller=controller, job=job, indexes=pending))
+        else:
+            results = []
+            for idx, item in enumerate(items):
+                results.append(self.fetch_indexed(item, controller, job))
+                if not isinstance(results[-1], Exception):
+                    self.echo(f"Fragmento {idx + 1}/{len(items)} obtenido exitosamente.")
+        stats.add("fetch", time.perf_counter() - fetch_started)
+        self.report_fetch(executor, controller, chunk_size)
+
+        all_chunks, complete = self.collect_chunks(results, pending, len(chunk_requests), job, stats)
+        return self.finish_stats(self.assemble_chunks(all_chunks, cache_key, cache_params, storage, sql_layout, output,
+                                                      dtype, valid_codes, store=complete, stats=stats,
+                                                      sql_mode=sql_mode, database=database), stats)
+
+    async def aGET(self, codes=[], start=None, end=None, forget=False, order=True, datetime=True, check_codes=False, storage='df', sql_layout='wide', incremental=False, output='wide', dtype='float64'):
+        """
+        Awaitable version of GET: runs the request off the event loop, so async applications are never blocked.
+        Takes the same parameters as GET.
+        """
+        return await to_thread(
+            self.GET, codes=codes, start=start, end=end, forget=forget, order=order, datetime=datetime,
+            check_codes=check_codes, storage=storage, sql_layout=sql_layout, incremental=incremental,
+            output=output, dtype=dtype,
+        )
+
+    async def alargeGET(self, codes=[], start=None, end=None, forget=False, chunk_size=100, concurrency=32, check_codes=False, storage='df', sql_layout='wide', output='wide', dtype='float64', job_id=None, sql_mode='replace', database=None):
+        """
+        Awaitable version of largeGET, running every chunk request concurrently on the current event loop.
+
+        Parameters
+        -------------
+        codes, start, end, forget, chunk_size, check_codes, storage, sql_layout, output, dtype, job_id, sql_mode, database :
+            Same as in largeGET.
+        
+        concurrency : int or 'auto', optional
+            Maximum number of chunk requests in flight at the same time. Default is 32. With 'auto', the limit
+            adapts to the observed latency and errors (see largeGET's `nucleos`).
+        """
+        check_output(output, dtype)
+        check_sql_mode(sql_mode, storage)
+        valid_codes, cache_key, cache_params = await to_thread(
+            self.prepare_large, codes, start, end, check_codes, storage, sql_layout, output, dtype)
+        if valid_codes is None:
+            self.echo("No valid codes found. Skipping the large GET request.")
+            return pd.DataFrame() if storage == 'df' else None
+
+        stats = self.stats = Stats("largeGET", codes=len(valid_codes), executor="async")
+        with stats.phase("cache_read"):
+            data = await to_thread(self.load_from_cache, cache_key, forget, storage) if sql_mode == 'replace' else None
+        if data is not None:
+            stats.count("cache_hits")
+            return self.finish_stats(data if storage == 'df' else self.shape_sql(data, output, dtype, valid_codes), stats)
+
+        if self.metadata.empty:
+            with stats.phase("metadata"):
+                await to_thread(self.get_metadata)
+
+        with stats.phase("plan"):
+            controller = self.fetch_controller("async", concurrency)
+            chunk_size = self.resolve_chunk_size(chunk_size, len(valid_codes), controller)
+            job = self.job(job_id) if job_id is not None else None
+            chunk_requests, pending = await to_thread(self.chunk_plan, valid_codes, chunk_size, forget, job)
+        with stats.phase("fetch"):
+            results = await self.afetch_chunks(chunk_requests, controller=controller, job=job, indexes=pending)
+        self.report_fetch("async", controller, chunk_size)
+
+        all_chunks, complete = await to_thread(self.collect_chunks, results, pending, len(chunk_requests), job, stats)
+        final_dataframe = await to_thread(self.assemble_chunks, all_chunks, cache_key, cache_params, storage,
+                                                  sql_layout, output, dtype, valid_codes, complete, stats,
+                                                  sql_mode, database)
+        return self.finish_stats(final_dataframe, stats)
+
+    def iter_largeGET(self, codes=[], start=None, end=None, forget=False, chunk_size=100, nucleos=4, check_codes=False, executor='thread', output='wide', dtype='float64', job_id=None):
+        """
+        Generator version of largeGET: yields `(chunk_codes, DataFrame)` for every chunk, in completion order.
+
+        Each chunk can be processed or persisted as soon as it arrives, while the remaining chunks are still
+        being fetched. At most `nucleos` chunks are in flight and finished chunks are not kept once yielded, so
+        memory is bounded by the chunks in flight instead of by the whole result; nothing is forged and the
+        combined result is not cached (every chunk still goes through the per-chunk cache).
+
+        Parameters
+        -------------
+        codes, start, end, forget, chunk_size, nucleos, check_codes, output, dtype, job_id :
+            Same as in largeGET. With a `job_id`, the chunks already checkpointed by a previous run are yielded
+            first, and only the others are fetched.
+
+        executor : str, optional
+            'thread' (default, thread pool) or 'serial'.
+
+        Yields
+        ------
+        tuple
+            `(chunk_codes, df)`: the tuple of codes of the chunk and its frame (columns '<name>, codigo no. <code>',
+            in `output` / `dtype`). A failed chunk prints its error and is skipped; if every chunk fails, the first
+            error is raised once the iteration ends.
+        """
+        if executor not in ("serial", "thread"):
+            raise ValueError(f"Unknown executor {executor!r}: use 'thread' or 'serial'.")
+        run = self.prepare_iteration(codes, start, end, forget, chunk_size, nucleos, check_codes, executor, output,
+                                     dtype, job_id)
+        if run is None:
+            return
+        yield from self.iter_checkpoints(run)
+
+        items = iter(run["items"])
+        in_flight = run["controller"].maximum
+        fetch_started = time.perf_counter()
+        pool = ThreadPoolExecutor(max_workers=in_flight)
+        running = {}
+
+        def submit():
+            item = next(items, None)
+            if item is not None:
+                running[pool.submit(self.fetch_indexed, item, run["controller"], run["job"])] = item
+
+        try:
+            for _ in range(in_flight):
+                submit()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, _request = running.pop(future)
+                    submit()
+                    chunk = self.iteration_chunk(run, index, future.result())
+                    if chunk is not None:
+                        yield chunk
+        finally:
+            # a consumer that stops early does not wait for the chunks still in flight
+            for future in running:
+                future.cancel()
+            pool.shutdown(wait=not running)
+        run["stats"].add("fetch", time.perf_counter() - fetch_started)
+        self.end_iteration(run)
+
+    async def aiter_largeGET(self, codes=[], start=None, end=None, forget=False, chunk_size=100, concurrency=32, check_codes=False, output='wide', dtype='float64', job_id=None):
+        """
+        Async-iterator version of largeGET: `async for chunk_codes, df in marco.aiter_largeGET(...)`.
+
+        Chunks are requested concurrently on the running event loop and yielded in completion order, with at
+        most `concurrency` chunks in flight (see `iter_largeGET`).
+
+        Parameters
+        -------------
+        codes, start, end, forget, chunk_size, check_codes, output, dtype, job_id :
+            Same as in largeGET.
+
+        concurrency : int or 'auto', optional
+            Maximum number of chunk requests in flight at the same time (see alargeGET). Default is 32.
+        """
+        run = await to_thread(self.prepare_iteration, codes, start, end, forget, chunk_size, concurrency,
+                                      check_codes, "async", output, dtype, job_id)
+        if run is None:
+            return
+        checkpoints = self.iter_checkpoints(run)
+        while True:  # one checkpoint loaded per step, so a resumed job never holds them all
+            chunk = await to_thread(next, checkpoints, None)
+            if chunk is None:
+                break
+            yield chunk
+
+        items = iter(run["items"])
+        fetch_started = time.perf_counter()
+        async with AsyncEngine(concurrency=run["controller"].maximum) as engine:
+            running = {}
+
+            def submit():
+                item = next(items, None)
+                if item is not None:
+                    task = asyncio.ensure_future(self.afetch_indexed(engine, item, run["controller"], run["job"]))
+                    running[task] = item
+
+            for _ in range(engine.concurrency):
+                submit()
+            try:
+                while running:
+                    done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        index, _request = running.pop(task)
+                        submit()
+                        result = task.exception() or task.result()
+                        chunk = await to_thread(self.iteration_chunk, run, index, result)
+                        if chunk is not None:
+                            yield chunk
+            finally:
+                for task in running:
+                    task.cancel()
+        run["stats"].add("fetch", time.perf_counter() - fetch_started)
+        await to_thread(self.end_iteration, run)
+
+    def prepare_iteration(self, codes, start, end, forget, chunk_size, concurrency, check_codes, executor, output, dtype, job_id):
+        """
+        Helper method for iter_largeGET / aiter_largeGET. Plan the chunks of a run (None when no code is valid).
+
+        Returns a dict holding the run's state: its Stats, controller, chunk size, job, chunk requests, the
+        (index, request) items to fetch, the failures seen and the number of chunks yielded.
+        """
+        check_output(output, dtype)
+        valid_codes, _, _ = self.prepare_large(codes, start, end, check_codes)
+        if valid_codes is None:
+            self.echo("No valid codes found. Skipping the large GET request.")
+            return None
+
+        stats = self.stats = Stats("largeGET", codes=len(valid_codes), executor=executor, iterator=True)
+        if executor != "serial" and self.metadata.empty:
+            with stats.phase("metadata"):
+                self.get_metadata()
+
+        with stats.phase("plan"):
+            controller = self.fetch_controller(executor, concurrency)
+            chunk_size = self.resolve_chunk_size(chunk_size, len(valid_codes), controller)
+            job = self.job(job_id) if job_id is not None else None
+            chunk_requests, pending = self.chunk_plan(valid_codes, chunk_size, forget, job)
+        return {"stats": stats, "executor": executor, "controller": controller, "chunk_size": chunk_size, "job": job,
+                "requests": chunk_requests, "items": [(idx, chunk_requests[idx]) for idx in pending],
+                "output": output, "dtype": dtype, "failures": {}, "yielded": 0}
+
+    def iter_checkpoints(self, run):
+        """Helper method for iter_largeGET / aiter_largeGET. Yield the chunks already checkpointed by the run's job."""
+        job = run["job"]
+        if job is None:
+            return
+        fetching = {idx for idx, _ in run["items"]}
+        for idx, request in enumerate(run["requests"]):
+            if idx not in fetching and job.done(idx):
+                chunk = job.load(idx)
+                pop_stats(chunk)  # already counted by the run that fetched it
+                run["yielded"] += 1
+                yield request.codes, to_output(chunk, run["output"], run["dtype"], list(request.codes))
+
+    def iteration_chunk(self, run, index, result):
+        """
+        Helper method for iter_largeGET / aiter_largeGET. Account for the result of chunk `index`.
+
+        Returns `(chunk_codes, df)` in the run's output mode, or None for a failed chunk (its error is printed).
+        """
+        stats = run["stats"]
+        if isinstance(result, Exception):
+            run["failures"][index] = result
+            stats.count("errors")
+            print(f"Error en el fragmento {index + 1}: {result}")
+            return None
+        chunk_stats = pop_stats(result)
+        if chunk_stats is not None:
+            stats.merge(chunk_stats)
+        stats.count("chunks")
+        run["yielded"] += 1
+        codes = run["requests"][index].codes
+        self.echo(f"Fragmento {index + 1}/{len(run['requests'])} obtenido exitosamente.")
+        return codes, to_output(result, run["output"], run["dtype"], list(codes))
+
+    def end_iteration(self, run):
         """
+        Helper method for iter_largeGET / aiter_largeGET. Report the run, record it in its job and finish its Stats.
+
+        Raises the first error if no chunk at all could be yielded.
+        """
+        self.report_fetch(run["executor"], run["controller"], run["chunk_size"])
+        job, failures = run["job"], run["failures"]
+        if job is not None:
+            job.record([idx for idx, _ in run["items"]], failures)
+            pending = job.status()["pending"]
+            if pending:
+                print(colored(f"[JOB] {job.job_id}: {pending} fragmento(s) pendiente(s); vuelva a ejecutar "
+                              f"con job_id={job.job_id!r} para obtener solo esos fragmentos.", "red"))
+        run["stats"].finish()
+        if not run["yielded"] and failures:
+            raise next(iter(failures.values()))
+
+    async def afetch_chunks(self, chunk_requests, concurrency=32, controller=None, job=None, indexes=None):
+        """
+        Helper coroutine for alargeGET / largeGET(executor='async'). Fetch chunks concurrently; failed chunks yield their exception.
+
+        Only the chunks at `indexes` are fetched (default: all), each checkpointed to `job` when given.
+        """
+        indexes = range(len(chunk_requests)) if indexes is None else indexes
+        async with AsyncEngine(concurrency=controller.maximum if controller else concurrency) as engine:
+            return await engine.run(functools.partial(self.afetch_indexed, controller=controller, job=job),
+                                    [(idx, chunk_requests[idx]) for idx in indexes])
+
+    async def afetch_indexed(self, engine, item, controller=None, job=None):
+        """Helper coroutine for afetch_chunks; Fetch one (index, ChunkRequest) item and checkpoint it to `job`."""
+        index, request = item
+        df = await self.afetch_chunk(engine, request, controller)
+        if job is not None:
+            await to_thread(job.save, index, df)
+        return df
+
+    async def afetch_chunk(self, engine, request, controller=None):
+        """Helper coroutine for afetch_chunks; Get data for a single ChunkRequest without modifying the object's state."""
+        stats = Stats("chunk", codes=len(request.codes))
+        key, params, df = self.chunk_from_cache(request, stats)
+        if df is not None:
+            return attach_stats(df, stats)
+        url = engine.transport.series_url("-".join(request.codes), request.format, request.start, request.end, request.lang)
+        async with controller.aslot(len(request.codes)) if controller else no_slot():
+            t0 = time.perf_counter()
+            if request.stream:
+                def handler(response):
+                    stats.add("network", time.perf_counter() - t0)
+                    return self.chunk_from_response(request, response, key, params, stats, t0)
+                return await engine.fetch(url, handler)
+            response = await engine.get(url)
+            stats.add("network", time.perf_counter() - t0)
+            return self.chunk_from_response(request, response, key, params, stats, t0)
+
+    def fetch_controller(self, executor, concurrency):
+        """
+        Helper method for largeGET / alargeGET. Concurrency controller of a run.
+
+        A fixed `concurrency` gives a fixed window (the controller then only measures the requests);
+        'auto' adapts the window between 1 and the transport's `pool_size`. Serial runs use a window of 1.
+        """
+        if executor == "serial":
+            return AIMDController(initial=1, minimum=1, maximum=1)
+        if concurrency == "auto":
+            return AIMDController(initial=4, minimum=1, maximum=get_transport().pool_size)
+        return AIMDController(initial=concurrency, minimum=concurrency, maximum=concurrency)
+
+    def resolve_chunk_size(self, chunk_size, n_codes, controller):
+        """Helper method for largeGET / alargeGET. Resolve chunk_size='auto' with `self.tuner`."""
+        if chunk_size != "auto":
+            return chunk_size
+        return self.tuner.suggest(n_codes, controller.limit)
+
+    def report_fetch(self, executor, controller, chunk_size):
+        """Helper method for largeGET / alargeGET. Learn from the run's requests and report the settings used."""
+        self.tuner.add(controller.samples)
+        rate_limit = get_transport().rate_limit
+        self.fetch_report = {"executor": executor, "chunk_size": chunk_size, "rate_limit": rate_limit, **controller.report()}
+        report = self.fetch_report
+        if executor == "process":
+            settings = f"{report['initial_concurrency']} procesos"
+        else:
+            settings = f"concurrencia {report['initial_concurrency']} -> {report['final_concurrency']} (max {report['peak_concurrency']})"
+            if report["mean_latency"] is not None:
+                settings += f", {report['requests']} solicitud(es), {report['errors']} error(es), latencia media {report['mean_latency']:.3f}s"
+        self.echo(f"[CONTROL] {executor}: {settings}, chunk_size={chunk_size}"
+                  + (f", limite {rate_limit}/s" if rate_limit else ""), color="yellow")
+
+    def prepare_large(self, codes, start, end, check_codes, storage='df', sql_layout='wide', output='wide', dtype='float64'):
+        """Helper method for largeGET / alargeGET. Resolve the codes and cache key of a large request (codes are None when none are valid)."""
         if start is not None:
             self.start = start
         if end is not None:
@@ -164,130 +715,405 @@ class Fetcher:
         if check_codes:
             valid_codes = self.check_metadata_codes()
             if valid_codes is None:
-                print("No valid codes found. Skipping the large GET request.")
-                return pd.DataFrame() if storage == 'df' else None
+                return None, None, None
         else:
             valid_codes = codes
 
-        cache_filename = "large_cache.bcrfile"
-        sql_cache_filename = "large_cache.db"
+        if storage == 'sql':
+            cache_key, cache_params = self.cache_key("largeGET", valid_codes, storage, layout=sql_layout)
+        else:
+            cache_key, cache_params = self.cache_key("largeGET", valid_codes, storage, **output_options(output, dtype))
+        return valid_codes, cache_key, cache_params
 
-        if (data := self.load_from_cache(cache_filename, sql_cache_filename, forget, storage)) is not None:
-            return data
-        
-        axe = Axe()
-        codigo_chunks = [valid_codes[i:i + chunk_size] for i in range(0, len(valid_codes), chunk_size)]
+    def job(self, job_id):
+        """
+        Resumable largeGET job `job_id`, with its checkpoints in the cache folder.
 
-        all_chunks = []
+        Use it to inspect a job (`Marco.job(job_id).status()`) or to discard its checkpoints (`.clear()`).
+        """
+        return ChunkJob(job_id, directory=os.path.join(self.cache.directory, "jobs"))
 
-        # Process chunks
-        if turbo:
-            with ProcessPool(processes=nucleos) as pool:
-                results = pool.map(lambda ch: self.get_data_for_chunk(ch, forget=forget), codigo_chunks)
-                for df_chunk in results:
-                    all_chunks.append(df_chunk)
-        else:
-            for idx, chunk in enumerate(codigo_chunks):
-                try:
-                    data_chunk = self.get_data_for_chunk(chunk, forget=forget)
-                    all_chunks.append(data_chunk)
-                    print(f"Fragmento {idx + 1}/{len(codigo_chunks)} obtenido exitosamente.")
-                except Exception as e:
-                    print(f"Error en el fragmento {idx + 1}: {e}")
+    def chunk_plan(self, valid_codes, chunk_size, forget=False, job=None):
+        """
+        Helper method for largeGET / alargeGET. Returns (chunk requests, indexes of the chunks to fetch).
+
+        Without a job every planned chunk is fetched. A new job records the plan; an existing one reuses its
+        recorded plan, and only chunks without a checkpoint are fetched again.
+        """
+        params = {"codes": list(valid_codes), "start": self.start, "end": self.end, "lang": self.lang, "format": self.format}
+        if job is not None and job.exists():
+            job.check(params)
+            chunk_requests = job.requests(forget, self.stream)
+            pending = [idx for idx in range(len(chunk_requests)) if not job.done(idx)]
+            self.echo(f"[JOB] {job.job_id}: {len(chunk_requests) - len(pending)}/{len(chunk_requests)} fragmentos "
+                      f"ya completados, {len(pending)} por obtener.", color="yellow")
+            return chunk_requests, pending
+
+        plan = self.plan_large(valid_codes, chunk_size=chunk_size)
+        self.echo(f"[PLAN] {plan.summary()}", color="yellow")
+        chunk_requests = [self.planned_request(request, forget=forget) for request in plan]
+        if job is not None:
+            job.create(params, chunk_requests)
+        return chunk_requests, list(range(len(chunk_requests)))
+
+    def collect_chunks(self, results, pending, n_chunks, job=None, stats=None):
+        """
+        Helper method for largeGET / alargeGET. Returns (chunk frames to assemble, whether every chunk is available).
+
+        With a job, failures are recorded in its manifest and the frames are read back from the checkpoints
+        (including those of previous runs). If no chunk is available at all, the first error is raised.
+        The Stats of the chunks fetched in this run are detached from their frames and added to `stats`.
+        """
+        failures = {idx: result for idx, result in zip(pending, results) if isinstance(result, Exception)}
+        for idx, error in failures.items():
+            print(f"Error en el fragmento {idx + 1}: {error}")
+        for result in results:
+            chunk_stats = None if isinstance(result, Exception) else pop_stats(result)
+            if stats is not None and chunk_stats is not None:
+                stats.merge(chunk_stats)
+        if stats is not None:
+            stats.count("chunks", len(results) - len(failures))
+            stats.count("errors", len(failures))
+        if job is None:
+            chunks = [result for result in results if not isinstance(result, Exception)]
+            if not chunks and failures:
+                raise next(iter(failures.values()))
+            return chunks, not failures
+
+        job.record(pending, failures)
+        done = [idx for idx in range(n_chunks) if job.done(idx)]
+        if len(done) < n_chunks:
+            print(colored(f"[JOB] {job.job_id}: {n_chunks - len(done)} fragmento(s) pendiente(s); vuelva a ejecutar "
+                          f"con job_id={job.job_id!r} para obtener solo esos fragmentos.", "red"))
+        if not done and failures:
+            raise next(iter(failures.values()))
+        chunks = [job.load(idx) for idx in done]
+        for chunk in chunks:
+            pop_stats(chunk)  # already counted by the run that fetched it
+        return chunks, len(done) == n_chunks
+
+    def plan_large(self, codes=None, start=None, end=None, chunk_size=100, max_url_length=2000):
+        """
+        Plan the API calls of a largeGET without fetching anything.
+
+        Codes are deduplicated and grouped by frequency (metadata 'Frecuencia' when the metadata is loaded,
+        otherwise the code's suffix letter), since BCRPData answers one frequency per request; windows of a
+        code requested several times are merged when they overlap. Each group is packed into requests of at
+        most `chunk_size` series whose URL stays under `max_url_length`.
 
+        Parameters
+        ----------
+        codes : list, optional
+            Codes or `(code, start, end)` tuples, as in largeGET. Default: `self.codes`.
+        start, end : str, optional
+            Default request window. Default: `self.start` / `self.end`.
+        chunk_size : int
+            Maximum number of series per request.
+        max_url_length : int
+            Maximum length of a request URL.
+
+        Returns
+        -------
+        RequestPlan
+            Planned requests (`len(plan)` API calls), with `summary()` and `to_frame()` describing the number of
+            requests, URL lengths and estimated payload sizes.
+        """
+        codes = self.codes if codes is None else codes
+        names = [code if isinstance(code, str) else code[0] for code in codes]
+        frequencies = {}
+        if not self.metadata.empty and "Frecuencia" in self.metadata.columns:
+            rows = self.code_positions(names)
+            known = rows >= 0
+            frequencies = dict(zip(pd.Index(names)[known], self.metadata["Frecuencia"].to_numpy()[rows[known]]))
 
-        final_dataframe = axe.forge(all_chunks)
-        self.codes = [col.split(", codigo no. ")[-1] for col in final_dataframe.columns] if turbo else valid_codes
-        print(self.codes)
-        print(f"Todos los fragmentos han sido obtenidos! (n={len(self.codes)})")
+        transport = get_transport()
+        return plan_requests(codes, self.start if start is None else start, self.end if end is None else end,
+                             frequencies=frequencies, max_series=chunk_size, max_url_length=max_url_length,
+                             url_for=lambda code_series, a, b: transport.series_url(code_series, self.format, a, b, self.lang))
+
+    def planned_request(self, planned, forget=False):
+        """Freeze one PlannedRequest of a RequestPlan into an immutable ChunkRequest."""
+        return ChunkRequest(tuple(planned.codes), planned.start, planned.end, self.lang, self.format, forget, self.stream)
+
+    def assemble_chunks(self, all_chunks, cache_key, cache_params, storage='df', sql_layout='wide', output='wide', dtype='float64', codes=None, store=True, stats=None, sql_mode='replace', database=None):
+        """
+        Helper method for largeGET / alargeGET. Forge the chunk frames into one DataFrame and store it in the cache.
+
+        With storage='df', wide chunks are forged directly into one block of the requested dtype, and sparse or
+        long chunks are converted before forging, so the dense float64 frame of every series aligned on one date
+        index is never built. Columns follow the order of
+        `codes` (the request planner groups them by frequency); a code fetched over several windows is combined
+        into one column. An incomplete result (store=False) is returned but neither written to nor registered in the cache.
+        With sql_mode='upsert', the chunks are merged into the store `database` instead (see `upsert_chunks`).
+        `stats` receives the 'forge' and 'cache_write' phases.
+        """
+        stats = Stats("largeGET") if stats is None else stats
+        chunk_codes = [[col.split(", codigo no. ")[-1] for col in chunk.columns] for chunk in all_chunks]
+        fetched = [code for codes in chunk_codes for code in codes]
+        if len(set(fetched)) < len(fetched):
+            fetched = list(dict.fromkeys(fetched))
+            with stats.phase("forge"):
+                all_chunks, chunk_codes = [combine_columns(Axe().forge(all_chunks))], [fetched]
+        order = list(range(len(fetched)))
+        if codes is not None:
+            position = {code: i for i, code in enumerate(dict.fromkeys(c if isinstance(c, str) else c[0] for c in codes))}
+            order.sort(key=lambda i: position.get(fetched[i], len(position)))
+        self.codes = [fetched[i] for i in order]
+        self.echo(self.codes)
+        self.echo(f"Todos los fragmentos han sido obtenidos! (n={len(self.codes)})")
 
         if storage == 'df':
-            # Save DataFrame with metadata sidecar
-            save_dataframe(
-                final_dataframe,
-                cache_filename,
-                meta={
-                    "codes": self.codes,
-                    "start": self.start,
-                    "end": self.end,
-                    "lang": self.lang,
-                }
-            )
+            with stats.phase("forge"):
+                if output == 'long':
+                    final_dataframe = concat_long([to_output(chunk, 'long', dtype, codes) for chunk, codes in zip(all_chunks, chunk_codes)])
+                    final_dataframe = order_long(final_dataframe, self.codes)
+                else:
+                    if output == 'wide':
+                        final_dataframe = Axe().forge(all_chunks, dtype=dtype)
+                    else:
+                        final_dataframe = Axe().forge([to_output(chunk, output, dtype) for chunk in all_chunks])
+                    final_dataframe = reorder(final_dataframe, order)
+            if (output, dtype) != ('wide', 'float64'):
+                dates = merge_sorted([chunk.index.to_numpy() for chunk in all_chunks]) if all_chunks else []
+                self.echo(f"[MEMORIA] {output}/{dtype}: {memory_report(final_dataframe, (len(dates), len(self.codes)))}", color="yellow")
+            if store:
+                with stats.phase("cache_write"):
+                    self.cache.write(cache_key, final_dataframe)
         else:
-            print(final_dataframe)
-            save_df_as_sql(final_dataframe, sql_cache_filename, 'time_series')
-            # You could also add a .meta file here for SQL consistency:
-            meta = {"codes": self.codes, "start": self.start, "end": self.end, "lang": self.lang}
-            with open(sql_cache_filename + ".meta", "w", encoding="utf-8") as f:
-                json.dump(meta, f, indent=2, ensure_ascii=False)
+            with stats.phase("forge"):
+                final_dataframe = reorder(Axe().forge(all_chunks), order)
+                if sql_mode == 'replace' and sql_layout == 'long':
+                    final_dataframe = final_dataframe.set_axis(self.codes, axis=1)  # as the long table reads back
+            self.echo(final_dataframe)
+            with stats.phase("cache_write"):
+                if sql_mode == 'upsert':
+                    self.upsert_chunks(all_chunks, chunk_codes, database, stats)
+                elif store:
+                    with self.cache.writing(cache_key, storage) as tmp:
+                        save_df_as_sql(final_dataframe, tmp, 'time_series', layout=sql_layout, codes=self.codes,
+                                       verbose=not self.quiet)
+            with stats.phase("shape"):
+                final_dataframe = self.shape_output(final_dataframe, output, dtype, self.codes)
+        if store and sql_mode == 'replace':
+            self.cache.store(cache_key, storage, cache_params)
 
         return final_dataframe
 
+    def upsert_chunks(self, all_chunks, chunk_codes, database=None, stats=None):
+        """
+        Helper method for largeGET / alargeGET with sql_mode='upsert'. Merge each chunk into the long store `database`.
+
+        Every chunk is one batch (one transaction and one ingest log row), so refreshing a chunk rewrites only its
+        changed points. Returns the ingest log records; `stats` counts the 'inserted', 'updated' and 'unchanged' points.
+        A failing batch raises its error; the chunks upserted before it stay committed.
+        """
+        database = os.path.join(self.cache.directory, "large_store.db") if database is None else database
+        if os.path.dirname(database):
+            os.makedirs(os.path.dirname(database), exist_ok=True)
+        records = []
+        for chunk, codes in zip(all_chunks, chunk_codes):
+            source = f"largeGET {codes[0]}..{codes[-1]} ({len(codes)} series) {self.lang}/{self.format}"
+            records.append(save_df_as_sql(chunk, database, 'time_series', layout='long', if_exists='upsert', codes=codes,
+                                          verbose=False, source=source))
+        totals = {name: sum(record[name] for record in records) for name in ("inserted", "updated", "unchanged")}
+        if stats is not None:
+            for name, value in totals.items():
+                stats.count(name, value)
+        self.echo(f"[STORE] {len(records)} chunk(s) upserted into '{database}': {totals['inserted']} new, "
+                  f"{totals['updated']} updated, {totals['unchanged']} unchanged point(s).", color="yellow")
+        return records
+
+    def shape_sql(self, df, output, dtype, codes):
+        """
+        Helper method for GET and largeGET. `shape_output` for a result read from SQLite, whose columns are codes (long
+        tables), largeGET labels ('<name>, codigo no. <code>') or BCRPData names, mapped back to the requested `codes`.
+        """
+        if output == 'long':
+            labels = [str(col).split(", codigo no. ")[-1] for col in df.columns]
+            codes = labels if set(labels) <= set(codes) else self.series_codes(list(df.columns), codes)
+        return self.shape_output(df, output, dtype, codes)
+
+    def shape_output(self, df, output='wide', dtype='float64', codes=None):
+        """Helper method for GET and largeGET. Convert a wide result to the requested output mode, reporting its memory usage."""
+        if (output, dtype) == ('wide', 'float64'):
+            return df
+        shaped = to_output(df, output, dtype, codes)
+        self.echo(f"[MEMORIA] {output}/{dtype}: {memory_report(shaped, df.shape)}", color="yellow")
+        return shaped
+
+
+    def chunk_request(self, chunk, forget=False):
+        """Freeze the state needed to fetch one chunk into an immutable ChunkRequest."""
+        return ChunkRequest(tuple(chunk), self.start, self.end, self.lang, self.format, forget, self.stream)
+
+    def fetch_chunk(self, request, controller=None):
+        """
+        Get data for a single ChunkRequest.
+
+        Reads only the request and shared read-only state (metadata, cache, transport): `self.codes`
+        and `self.data` are never modified, so chunks can run concurrently in threads. With a
+        `controller`, the network request waits for a slot of its window and reports its latency.
+        Every chunk has its own cache entry (keyed on its codes and window) written atomically, so
+        concurrent workers never read each other's or a half-written result.
+        """
+        stats = Stats("chunk", codes=len(request.codes))
+        key, params, df = self.chunk_from_cache(request, stats)
+        if df is not None:
+            return attach_stats(df, stats)
+        transport = get_transport()
+        url = transport.series_url("-".join(request.codes), request.format, request.start, request.end, request.lang)
+        with controller.slot(len(request.codes)) if controller else contextlib.nullcontext():
+            t0 = time.perf_counter()
+            response = transport.get(url, stream=request.stream)
+            stats.add("network", time.perf_counter() - t0)
+            return self.chunk_from_response(request, response, key, params, stats, t0)
+
+    def fetch_indexed(self, item, controller=None, job=None):
+        """
+        Fetch one (index, ChunkRequest) item for largeGET's executors and checkpoint it to `job`.
+
+        A failed chunk yields its exception instead of raising, so one failure never discards the other chunks.
+        """
+        index, request = item
+        try:
+            df = self.fetch_chunk(request, controller)
+        except Exception as e:
+            return e
+        if job is not None:
+            job.save(index, df)
+        return df
+
+    def chunk_from_cache(self, request, stats=None):
+        """Helper method for fetch_chunk / afetch_chunk. Returns (key, params, labelled frame or None)."""
+        stats = Stats("chunk", codes=len(request.codes)) if stats is None else stats
+        key, params = self.cache_key("GET", request.codes, 'df', start=request.start, end=request.end,
+                                     lang=request.lang, format=request.format, order=True, datetime=True)
+        if request.forget:
+            self.cache.invalidate(key)
+            return key, params, None
+        with stats.phase("cache_read"):
+            entry = self.cache.lookup(key)
+            try:
+                df = None if entry is None else self.label_chunk(load_dataframe(entry["path"]), request.codes)
+            except FileNotFoundError:  # evicted by another worker since the lookup
+                df = None
+        if df is not None:
+            stats.count("cache_hits")
+        return key, params, df
+
+    def chunk_from_response(self, request, response, key, params, stats=None, started=None):
+        """
+        Helper method for fetch_chunk / afetch_chunk. Build, cache and label the frame of one chunk.
+
+        The frame carries the chunk's Stats in its `attrs` (the request sent at `started`, a perf_counter time).
+        """
+        stats = Stats("chunk", codes=len(request.codes)) if stats is None else stats
+        started = time.perf_counter() if started is None else started
+        url = getattr(response, "url", None)
+        if response.status_code != 200:
+            stats.request(url, response.status_code, response_bytes(response, request.stream), time.perf_counter() - started)
+            response.close()
+            raise RuntimeError(f"Unable to fetch data, status code {response.status_code}")
+
+        with stats.phase("decode"):
+            data = read_response(response, request.stream)
+        stats.request(url, response.status_code, response_bytes(response, request.stream), time.perf_counter() - started)
+        with stats.phase("frame"):
+            df = arrays_to_frame(*data)
+        with stats.phase("dates"):
+            df.index = period_index(df.index)
+        with stats.phase("order"):
+            df = self.reorder_frame(df, request.codes)
+
+        with stats.phase("cache_write"):
+            self.cache.write(key, df)
+            self.cache.store(key, 'df', params)
+        return attach_stats(self.label_chunk(df, request.codes), stats)
 
     def get_data_for_chunk(self, chunk, forget=False):
         """Helper function for largeGET; Get data for a single chunk."""
-        self.codes = chunk
-        df = self.GET(forget=forget, storage='df')  # Respect parent's forget flag
+        return self.fetch_chunk(self.chunk_request(chunk, forget=forget))
+
+    @staticmethod
+    def label_chunk(df, chunk):
+        """Label the (ordered) columns of a chunk frame as '<name>, codigo no. <code>'."""
         df.columns = [f"{col}, codigo no. {chunk[idx]}" for idx, col in enumerate(df.columns)]
         return df
 
 
 
-    def load_from_cache(self, df_cache_filename, sql_cache_filename, forget, storage):
-        """Helper method for GET and largeGET. Handles cache logic with disclaimers + mismatch warnings."""
+    def cache_key(self, kind, codes, storage, start=None, end=None, lang=None, format=None, **options):
+        """Helper method for GET and largeGET. Build the content-addressed cache key (and its parameters) for a request (defaults: the object's state)."""
+        params = {
+            "kind": kind,
+            "codes": list(codes),
+            "start": self.start if start is None else start,
+            "end": self.end if end is None else end,
+            "lang": self.lang if lang is None else lang,
+            "format": self.format if format is None else format,
+            "storage": storage,
+            **options,
+        }
+        return self.cache.key(**params), params
 
-        def sidecar_filename(fname):
-            return fname + ".meta"
+    def load_from_cache(self, key, forget, storage):
+        """Helper method for GET and largeGET. Returns the cached result for `key`, or None on a cache miss."""
+        if forget:
+            self.cache.invalidate(key)
+            return None
 
-        def handle_cache_loading(filename, load_structure, text):
-            if not os.path.exists(filename):
-                return None
-            if forget:
-                os.remove(filename)
-                if os.path.exists(sidecar_filename(filename)):
-                    os.remove(sidecar_filename(filename))
+        entry = self.cache.lookup(key)
+        if entry is None:
+            return None
+
+        text = "DataFrame" if storage == 'df' else "SQLite"
+        timestamp = datetime.datetime.fromtimestamp(entry["created"])
+        self.echo(
+            f"[CACHE] Using cached data ({text}) last updated {timestamp:%Y-%m-%d %H:%M:%S}\n"
+            f"→ Tip: run with forget=True to fetch fresh data.",
+            color="yellow",
+        )
+
+        try:
+            self.data = load_dataframe(entry["path"]) if storage == 'df' else load_from_sqlite(entry["path"], verbose=not self.quiet)
+        except FileNotFoundError:  # evicted by another process since the lookup
+            return None
+        return self.data
+
+    def load_covering_sql(self, codes):
+        """
+        Helper method for GET. Serve a long-layout SQLite request from a cached store holding more series or dates.
+
+        Any cached long table (from GET or largeGET) with the same language and format whose codes include
+        `codes` and whose window covers [self.start, self.end] answers the request: only those codes and
+        dates are read, filtered in SQL. Returns None if no cached table covers the request.
+        """
+        def window(start, end):
+            try:
+                return period_bounds(start)[0], period_bounds(end)[1]
+            except ValueError:  # not a 'YYYY[-M[-D]]' period
                 return None
 
-            # Try to load metadata sidecar if present
-            cache_meta = {}
-            if os.path.exists(sidecar_filename(filename)):
-                with open(sidecar_filename(filename), "r", encoding="utf-8") as f:
-                    try:
-                        cache_meta = json.load(f)
-                    except Exception:
-                        cache_meta = {}
-
-            # Show warning
-            timestamp = datetime.datetime.fromtimestamp(os.path.getmtime(filename))
-            msg = (
-                f"[CACHE] Using cached data ({text}) last updated {timestamp:%Y-%m-%d %H:%M:%S}\n"
-                f"→ Tip: run with forget=True to fetch fresh data."
-            )
-
-            # Compare codes/start/end with cache_meta if available
-            mismatches = []
-            if "codes" in cache_meta and cache_meta["codes"] != self.codes:
-                mismatches.append("codes")
-            if "start" in cache_meta and cache_meta["start"] != self.start:
-                mismatches.append("start")
-            if "end" in cache_meta and cache_meta["end"] != self.end:
-                mismatches.append("end")
-
-            if mismatches:
-                msg += (
-                    f"\n⚠️ Warning: cache parameters differ on {', '.join(mismatches)}. "
-                    "Use forget=True to refresh with your current request."
-                )
-
-            print(colored(msg, "yellow"))
-
-            self.data = load_structure(filename)
+        requested = window(self.start, self.end)
+        if requested is None:
+            return None
+        for key, entry in self.cache.entries().items():
+            params = entry["params"]
+            if (params.get("storage"), params.get("layout")) != ('sql', 'long') or \
+                    (params.get("lang"), params.get("format")) != (self.lang, self.format) or \
+                    not all(isinstance(code, str) for code in params["codes"]) or not set(codes) <= set(params["codes"]):
+                continue
+            stored = window(params["start"], params["end"])
+            if stored is None or stored[0] > requested[0] or stored[1] < requested[1]:
+                continue
+            found = self.cache.lookup(key)
+            if found is None:
+                continue
+            self.echo(f"[CACHE] {len(codes)} serie(s) leidas de un SQLite en cache con {len(params['codes'])} serie(s) "
+                      f"({params['start']} - {params['end']}).", color="yellow")
+            self.data = load_from_sqlite(found["path"], verbose=not self.quiet, codes=codes, start=self.start, end=self.end)
             return self.data
-
-        if storage == 'df':
-            return handle_cache_loading(df_cache_filename, load_dataframe, "DataFrame")
-        elif storage == 'sql':
-            return handle_cache_loading(sql_cache_filename, load_from_sqlite, "SQLite")
+        return None
 
         
 
@@ -303,9 +1129,9 @@ class Fetcher:
             print("Error: metadata is not loaded or not a DataFrame.")
             return None  # Return None if metadata is not available
 
-        metadata_codes = self.metadata.iloc[:, 0].tolist()  # Extract codes from the first column
-        valid_codes = [code for code in self.codes if code in metadata_codes]
-        invalid_codes = [code for code in self.codes if code not in metadata_codes]
+        found = self.code_positions(self.codes) >= 0  # hash lookup on the first (code) column
+        valid_codes = [code for code, ok in zip(self.codes, found) if ok]
+        invalid_codes = [code for code, ok in zip(self.codes, found) if not ok]
 
         if invalid_codes:
             print(f"Warning: The following codes were not found in metadata and will be ignored: {invalid_codes}")
@@ -316,27 +1142,47 @@ class Fetcher:
 
         return valid_codes
 
-    def save_to_sqlite(self, data, header, db_name="cache.db"):
-        """Save JSON data directly to an SQLite database in a structured format."""
-        with sqlite3.connect(db_name) as conn:
-            # Drop table if exists
-            conn.execute("DROP TABLE IF EXISTS time_series;")
-            
-            # Create table with columns
-            columns_definitions = ["date TEXT"] + [f'"{col}" REAL' for col in header]
-            create_table_query = "CREATE TABLE time_series (" + ", ".join(columns_definitions) + ");"
-            
-            # Execute the create table query
-            conn.execute(create_table_query)
-
-            # Prepare the insert query using parameter placeholders
-            column_names = ["date"] + [f'"{col}"' for col in header]
-            insert_query = "INSERT INTO time_series (" + ", ".join(column_names) + ") VALUES (" + ", ".join(["?"] * len(column_names)) + ");"
-            
-            # Insert data row by row
-            for period in data["periods"]:
-                date = period["name"]
-                values = [float(val) if val != "n.d." else None for val in period["values"]]
-                conn.execute(insert_query, [date] + values)
-
-            conn.commit()
\ No newline at end of file
+    def save_to_sqlite(self, data, header=None, db_name="cache.db", layout="wide", codes=None):
+        """
+        Save JSON data directly to an SQLite database in a structured format.
+
+        All periods are inserted with one bulk `executemany` inside a single transaction.
+
+        Parameters
+        ----------
+        data : dict or tuple
+            Decoded JSON payload from BCRPData, or its parsed (header, labels, values) arrays.
+        header : list of str, optional
+            Column names for the wide layout. Defaults to the series names in the payload.
+        db_name : str
+            SQLite database file.
+        layout : str
+            'wide' (one REAL column per series) or 'long' (tidy `(code, date, value)` table keyed on (code, date)).
+        codes : list of str, optional
+            Series codes requested for `data`, used to name the series in the long layout. Defaults to self.codes.
+        """
+        parsed_header, labels, values = data if isinstance(data, tuple) else parse_payload(data)
+        header = parsed_header if header is None else header
+
+        conn = _sqlite.connect(db_name)
+        try:
+            if layout == "long":
+                _sqlite.write_long(conn, "time_series", labels, self.series_codes(parsed_header, codes), values)
+            else:
+                _sqlite.write_wide(conn, "time_series", labels, header, values)
+        finally:
+            conn.close()
+
+    def series_codes(self, header, codes=None):
+        """Map the series names returned by BCRPData (JSON header) back to the requested series codes (default: self.codes)."""
+        codes = self.codes if codes is None else codes
+        if len(codes) == 1 and len(header) == 1:
+            return list(codes)
+        if self.metadata.empty:
+            self.get_metadata()
+
+        known = [code for code, position in zip(codes, self.code_positions(codes)) if position >= 0]
+        names = dict(zip(self.series_names(known), known))
+
+        positional = len(header) == len(codes)
+        return [names.get(name, codes[idx] if positional else name) for idx, name in enumerate(header)]
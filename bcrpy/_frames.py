@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+
+OUTPUTS = ("wide", "sparse", "long")
+DTYPES = ("float64", "float32")
+
+
+def check_output(output, dtype):
+    """Validate the `output` / `dtype` options of GET and largeGET."""
+    if output not in OUTPUTS:
+        raise ValueError(f"Unknown output {output!r}: use 'wide', 'sparse' or 'long'.")
+    if dtype not in DTYPES:
+        raise ValueError(f"Unknown dtype {dtype!r}: use 'float64' or 'float32'.")
+
+
+def output_options(output, dtype):
+    """Cache-key options of a non-default output mode (empty for the default, so existing cache entries stay valid)."""
+    options = {}
+    if output != "wide":
+        options["output"] = output
+    if dtype != "float64":
+        options["dtype"] = dtype
+    return options
+
+
+def to_output(df, output="wide", dtype="float64", codes=None):
+    """
+    Convert a wide result frame (one float column per series) to a memory-compact output mode.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Wide frame, indexed by date.
+    output : str
+        'wide' (dense columns), 'sparse' (pandas SparseDtype columns: NaN is not stored) or
+        'long' (tidy `(code, date, value)` frame holding only the observed points).
+    dtype : str
+        'float64' (default) or 'float32'.
+    codes : list of str, optional
+        Series code of each column, used by the long output (default: the column labels).
+    """
+    check_output(output, dtype)
+    if output == "long":
+        return long_frame(df, codes, dtype)
+    if output == "sparse":
+        return df.astype(pd.SparseDtype(dtype, np.nan))
+    return df if (df.dtypes == dtype).all() else df.astype(dtype)
+
+
+def long_frame(df, codes=None, dtype="float64"):
+    """
+    Tidy `(code, date, value)` frame with one row per observed (non-NaN) value of `df`.
+
+    Rows are sorted by code (in column order), then date; `code` is categorical.
+    """
+    codes = list(df.columns) if codes is None else list(codes)
+    if len(codes) != df.shape[1]:
+        raise ValueError(f"Expected {df.shape[1]} codes, got {len(codes)}.")
+
+    values = df.to_numpy(dtype=dtype, na_value=np.nan).T  # one row per series
+    observed = ~np.isnan(values)
+    cols, rows = np.nonzero(observed)
+    return pd.DataFrame({
+        "code": pd.Categorical(np.asarray(codes, dtype=object)[cols], categories=pd.unique(pd.Series(codes, dtype=object))),
+        "date": df.index[rows],
+        "value": values[observed],
+    })
+
+
+def concat_long(frames):
+    """Concatenate long frames, keeping `code` categorical across frames."""
+    if not frames:
+        return pd.DataFrame({"code": pd.Categorical([]), "date": pd.Index([]), "value": np.array([], dtype=np.float64)})
+    long = pd.concat([frame.assign(code=frame["code"].astype(object)) for frame in frames], ignore_index=True)
+    long["code"] = pd.Categorical(long["code"], categories=pd.unique(long["code"]))
+    return long
+
+
+def order_long(long, codes):
+    """Sort a long frame by `codes` (then date, as produced), making that the order of the `code` categories."""
+    if list(long["code"].cat.categories) == list(codes):
+        return long
+    long["code"] = long["code"].cat.set_categories(list(codes))
+    return long.sort_values("code", kind="stable", ignore_index=True)
+
+
+def combine_columns(df):
+    """Combine columns sharing a label (one series fetched over several windows) into one column: first non-NaN value wins."""
+    labels = pd.unique(df.columns)
+    if len(labels) == df.shape[1]:
+        return df
+    return pd.DataFrame({label: df.loc[:, df.columns == label].bfill(axis=1).iloc[:, 0] for label in labels}, index=df.index)
+
+
+def memory_usage(df):
+    """Deep memory usage of `df` in bytes (index included; sparse columns count only stored points)."""
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+def memory_report(df, dense_shape):
+    """One-line summary of the memory held by `df` versus a dense float64 wide frame of `dense_shape` (dates, series)."""
+    dense = dense_shape[0] * dense_shape[1] * 8
+    used = memory_usage(df)
+    ratio = f" ({used / dense:.0%} of dense float64)" if dense else ""
+    return f"{used / 2**20:.2f} MiB{ratio}"
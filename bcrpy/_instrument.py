@@ -0,0 +1,183 @@
+import contextlib
+import threading
+import time
+import warnings
+
+from bcrpy._console import colored
+
+STATS_KEY = "bcrpy_stats"  # key of the Stats object in the `attrs` of every result DataFrame
+
+_hooks = []
+
+
+def add_hook(callback):
+    """
+    Register `callback(event)` to receive the instrumentation events of every GET / largeGET.
+
+    `event` is a dict with an "event" key:
+
+    - "phase": one timed step, with "phase", "seconds", "kind" ('GET', 'largeGET' or 'chunk') and the
+      labels of the run or chunk (e.g. "codes").
+    - "request": one HTTP request, with "url", "status", "bytes" and "seconds".
+    - "result": end of a GET / largeGET, with "stats" (see `Stats.as_dict`).
+
+    Hooks run synchronously in the thread (or worker process) doing the work, so they should be fast,
+    e.g. observing a Prometheus histogram or adding an OpenTelemetry span event. A hook that raises
+    is reported with a RuntimeWarning and never interrupts the fetch. Returns `callback`, so it can be
+    used as a decorator.
+    """
+    _hooks.append(callback)
+    return callback
+
+
+def remove_hook(callback):
+    """Unregister a callback added with `add_hook` (no error if it is not registered)."""
+    with contextlib.suppress(ValueError):
+        _hooks.remove(callback)
+
+
+def emit(event, **fields):
+    """Send one event to every registered hook."""
+    if not _hooks:
+        return
+    payload = {"event": event, **fields}
+    for hook in list(_hooks):
+        try:
+            hook(payload)
+        except Exception as e:
+            warnings.warn(f"bcrpy instrumentation hook {hook!r} failed: {e!r}", RuntimeWarning)
+
+
+def response_bytes(response, stream=False):
+    """Bytes of a response body, as received (compressed size for streamed bodies when known)."""
+    if stream:
+        raw = getattr(response, "raw", None)
+        tell = getattr(raw, "tell", None)
+        received = tell() if callable(tell) else None
+        if isinstance(received, int):
+            return received
+        length = getattr(response, "headers", {}).get("Content-Length")
+        return int(length) if isinstance(length, str) and length.isdigit() else 0
+    content = getattr(response, "content", None)
+    return len(content) if isinstance(content, (bytes, bytearray)) else 0
+
+
+class Stats:
+    def __init__(self, kind, **labels):
+        """
+        Per-phase timers and counters of one GET / largeGET run, or of one largeGET chunk.
+
+        Phases: 'metadata', 'plan', 'cache_read', 'network', 'decode', 'frame', 'dates', 'order',
+        'fetch' (wall time of all the chunks of a largeGET), 'forge', 'shape' and 'cache_write'.
+        A largeGET sums the phases of its chunks into its own, so with concurrent chunks the chunk
+        phases may add up to more than the run's wall time. Counters include 'requests', 'bytes',
+        'cache_hits', 'chunks' and 'errors'.
+
+        Attributes
+        ----------
+        kind : str
+            'GET', 'largeGET' or 'chunk'.
+        labels : dict
+            Descriptive labels (e.g. number of codes), sent with every event.
+        phases : dict
+            Seconds spent in each phase.
+        counters : dict
+            Counter values.
+        wall : float
+            Wall time from creation until `finish`.
+        """
+        self.kind = kind
+        self.labels = labels
+        self.phases = {}
+        self.counters = {}
+        self.wall = 0.0
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Time the body as phase `name`."""
+        t0 = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.add(name, time.perf_counter() - t0)
+
+    def add(self, name, seconds):
+        """Add `seconds` to phase `name` (for steps not timed with `phase`) and report it to the hooks."""
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+        emit("phase", phase=name, seconds=seconds, kind=self.kind, **self.labels)
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def request(self, url, status, nbytes, seconds):
+        """Count one HTTP request and report it to the hooks."""
+        self.count("requests")
+        self.count("bytes", nbytes)
+        emit("request", url=url, status=status, bytes=nbytes, seconds=seconds, kind=self.kind, **self.labels)
+
+    def merge(self, other):
+        """Add the phases and counters of `other` (e.g. a chunk) to these."""
+        with self._lock:
+            for name, seconds in other.phases.items():
+                self.phases[name] = self.phases.get(name, 0.0) + seconds
+            for name, value in other.counters.items():
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def finish(self):
+        """Stop the wall clock and report the run to the hooks. Returns self."""
+        self.wall = time.perf_counter() - self._started
+        emit("result", stats=self.as_dict(), kind=self.kind, **self.labels)
+        return self
+
+    def as_dict(self):
+        return {"kind": self.kind, "labels": dict(self.labels), "wall": self.wall,
+                "phases": dict(self.phases), "counters": dict(self.counters)}
+
+    def summary(self):
+        """One line: wall time, the costliest phases and the main counters."""
+        phases = ", ".join(f"{name} {seconds:.3f}s" for name, seconds in sorted(self.phases.items(), key=lambda item: -item[1]))
+        counters = ", ".join(f"{name}={value}" for name, value in self.counters.items())
+        return f"{self.kind} {self.wall:.3f}s [{phases}]" + (f" ({counters})" if counters else "")
+
+    def __repr__(self):
+        return f"<Stats {self.summary()}>"
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+def attach_stats(df, stats):
+    """Attach `stats` to a result DataFrame (`df.attrs['bcrpy_stats']`) and return `df`."""
+    if df is not None and hasattr(df, "attrs"):
+        df.attrs[STATS_KEY] = stats
+    return df
+
+
+def pop_stats(df):
+    """Detach and return the Stats attached to `df` (None if there are none)."""
+    return df.attrs.pop(STATS_KEY, None) if hasattr(df, "attrs") else None
+
+
+class Reporter:
+    """Mixin of the Marco object: console messages, silenced by `quiet = True`."""
+
+    quiet = False
+
+    def echo(self, *values, color=None, attrs=None):
+        """print() the values (in `color`, if given) unless the object is quiet."""
+        if self.quiet:
+            return
+        if color is None:
+            print(*values)
+        else:
+            print(colored(" ".join(str(value) for value in values), color, attrs=attrs))
@@ -0,0 +1,125 @@
+import json
+import os
+import pickle
+import re
+import shutil
+import time
+
+from bcrpy._cache import temporary_path
+from bcrpy._engine import ChunkRequest
+
+JOB_ID = re.compile(r"^[\w.-]+$")
+
+
+class ChunkJob:
+    def __init__(self, job_id, directory=os.path.join(".bcrpy_cache", "jobs")):
+        """
+        Checkpoints of a resumable largeGET, kept in `<directory>/<job_id>/`.
+
+        The job manifest (`job.json`) freezes the request parameters and the planned chunks, so a rerun
+        fetches exactly the same chunks whatever `chunk_size` it is called with. Every chunk fetched is
+        written atomically to its own checkpoint file as soon as it completes, from whichever thread or
+        process fetched it: a chunk is done if and only if its checkpoint exists, so an interrupted run
+        loses at most the chunks that were in flight.
+
+        Attributes
+        ----------
+        job_id : str
+            Name of the job (letters, digits, '_', '-' and '.').
+        directory : str
+            Folder holding the manifest and the checkpoints of this job.
+        """
+        if not JOB_ID.match(str(job_id)):
+            raise ValueError(f"Invalid job_id {job_id!r}: use letters, digits, '_', '-' or '.'.")
+        self.job_id = str(job_id)
+        self.directory = os.path.join(directory, self.job_id)
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.directory, "job.json")
+
+    def exists(self):
+        return os.path.exists(self.manifest_path)
+
+    def manifest(self):
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest):
+        os.makedirs(self.directory, exist_ok=True)
+        manifest["updated"] = time.time()
+        tmp = temporary_path(self.manifest_path)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, self.manifest_path)
+
+    # --- plan ---
+
+    def create(self, params, requests):
+        """Start the job: record its parameters and the chunks to fetch."""
+        now = time.time()
+        self._write_manifest({
+            "job_id": self.job_id,
+            "created": now,
+            "params": params,
+            "chunks": [{"codes": list(r.codes), "start": r.start, "end": r.end, "lang": r.lang, "format": r.format,
+                        "attempts": 0, "error": None} for r in requests],
+        })
+
+    def check(self, params):
+        """Raise ValueError if the job was created for a different request."""
+        recorded = self.manifest()["params"]
+        if recorded != json.loads(json.dumps(params, default=str)):
+            raise ValueError(f"job_id {self.job_id!r} belongs to a different request; use another job_id "
+                             f"or remove it with Marco.job({self.job_id!r}).clear().")
+
+    def requests(self, forget=False, stream=False):
+        """ChunkRequests of the planned chunks, in plan order."""
+        return [ChunkRequest(tuple(chunk["codes"]), chunk["start"], chunk["end"], chunk["lang"], chunk["format"],
+                             forget, stream) for chunk in self.manifest()["chunks"]]
+
+    # --- checkpoints ---
+
+    def checkpoint_path(self, index):
+        return os.path.join(self.directory, f"chunk-{index:05d}.bcrfile")
+
+    def done(self, index):
+        return os.path.exists(self.checkpoint_path(index))
+
+    def save(self, index, df):
+        """Write the checkpoint of chunk `index` (atomically: a checkpoint is never seen half-written)."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.checkpoint_path(index)
+        tmp = temporary_path(path)
+        with open(tmp, "wb") as f:
+            pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    def load(self, index):
+        with open(self.checkpoint_path(index), "rb") as f:
+            return pickle.load(f)
+
+    def record(self, attempted, failures):
+        """Record the outcome of a run: one more attempt for each `attempted` chunk index, with its error if in `failures`."""
+        manifest = self.manifest()
+        for index in attempted:
+            chunk = manifest["chunks"][index]
+            chunk["attempts"] += 1
+            chunk["error"] = str(failures[index]) if index in failures else None
+        self._write_manifest(manifest)
+
+    def status(self):
+        """Counts of `done` and `pending` chunks, and the last error of each failed chunk (by index)."""
+        chunks = self.manifest()["chunks"]
+        done = [self.done(i) for i in range(len(chunks))]
+        return {
+            "job_id": self.job_id,
+            "chunks": len(chunks),
+            "done": sum(done),
+            "pending": len(chunks) - sum(done),
+            "errors": {i: chunk["error"] for i, chunk in enumerate(chunks) if chunk["error"] and not done[i]},
+        }
+
+    def clear(self):
+        """Remove the manifest and every checkpoint of the job."""
+        shutil.rmtree(self.directory, ignore_errors=True)
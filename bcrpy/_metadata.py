@@ -1,32 +1,176 @@
+import io
+import os
+
+import numpy as np
 import pandas as pd
-import requests
 
-class MetadataHandler:
-    def get_metadata(self, filename="metadata.csv"):
-        """Extract all metadata from BCRPData."""
-        try:
-            # Attempt to load metadata from primary URL
-            self.metadata = pd.read_csv('https://estadisticas.bcrp.gob.pe/estadisticas/series/metadata', delimiter=';', encoding='latin-1')
-        except Exception as e:
-            print(f"Error loading metadata from the primary URL: {e}")
-            self.metadata = pd.DataFrame()
+from bcrpy._cache import compact_frame
+from bcrpy._instrument import Reporter
+from bcrpy._search import SearchIndex
+from bcrpy._transport import get_transport
 
-        # If the primary URL fails, load from backup
-        if self.metadata.shape[0] <= 5:
-            print("Warning: metadata contains fewer than 5 rows, likely empty or incomplete")
-            url = "https://github.com/andrewrgarcia/bcrpy/raw/main/metadatos"
+SNAPSHOT_URL = "https://github.com/andrewrgarcia/bcrpy/raw/main/metadatos"
+SNAPSHOT_PATHS = [
+    os.path.join(os.path.dirname(__file__), "metadatos"),  # shipped inside the package
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "metadatos"),  # source checkout
+]
+
+
+def read_snapshot(source):
+    """Read a `metadatos` snapshot (path or file object): a pickled DataFrame, possibly wrapped as {'format', 'data'}."""
+    snapshot = pd.read_pickle(source)
+    if isinstance(snapshot, dict):
+        snapshot = pd.read_pickle(io.BytesIO(snapshot["data"]))
+    return snapshot
+
+
+class MetadataHandler(Reporter):
+    _metadata = pd.DataFrame()
+    _search_index = None
+    _code_index = None
+
+    @property
+    def metadata(self):
+        """Metadata of the BCRPData series. Assigning new metadata discards the indexes derived from it."""
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, value):
+        self._metadata = value
+        self._search_index = None
+        self._code_index = None
+
+    @property
+    def code_index(self):
+        """
+        Hash index of the series codes (first metadata column), built on first use.
+
+        Returns
+        -------
+        codes : pd.Index
+            Unique series codes (the first row wins if a code is repeated).
+        rows : numpy.ndarray
+            Positional metadata row of each code.
+        """
+        if self._code_index is None:
+            codes = self.metadata.iloc[:, 0] if self.metadata.shape[1] else pd.Series(dtype=object)
+            keep = ~codes.duplicated().to_numpy()
+            self._code_index = (pd.Index(codes.to_numpy()[keep]), np.flatnonzero(keep))
+        return self._code_index
+
+    def code_positions(self, codes):
+        """Positional metadata rows of `codes` in one vectorized lookup (-1 where a code is not in metadata)."""
+        if self.metadata.empty:
+            self.get_metadata()
+        index, rows = self.code_index
+        return np.append(rows, -1)[index.get_indexer(list(codes))]  # get_indexer's -1 picks the sentinel
+
+    def code_position(self, codigo):
+        """Positional metadata row of one series code. Raises KeyError if the code is not in metadata."""
+        position = self.code_positions([codigo])[0]
+        if position < 0:
+            raise KeyError(f"{codigo} no se encuentra en metadatos")
+        return position
+
+    @property
+    def search_index(self):
+        """Token index over the metadata used by `wordsearch`, built on first use."""
+        if self._search_index is None:
+            if self.metadata.empty:
+                self.get_metadata()
+            self._search_index = SearchIndex(self.metadata)
+        return self._search_index
+
+    def build_search_index(self, filename=None):
+        """
+        Build the `wordsearch` index, optionally persisting it to disk.
+
+        If `filename` holds an index built from the same metadata it is loaded instead of rebuilt;
+        otherwise the index is built and saved there.
+        """
+        if self.metadata.empty:
+            self.get_metadata()
+        index = SearchIndex.load(filename, self.metadata) if filename else None
+        if index is None:
+            index = SearchIndex(self.metadata)
+            if filename:
+                index.save(filename)
+        self._search_index = index
+        return index
+
+    def get_metadata(self, filename="metadata.csv", refresh=False):
+        """
+        Extract all metadata from BCRPData.
+
+        The metadata is served from the local snapshot (`self.metadata_cache`) while it is younger
+        than its TTL. After that it is revalidated with a conditional request (ETag / Last-Modified)
+        and downloaded again only if it changed. If BCRPData cannot be reached, the expired snapshot,
+        the bundled `metadatos` snapshot or, last, its copy on GitHub is used.
+
+        Parameters
+        ----------
+        filename : str or None
+            Also save the metadata as a .csv file (written when new metadata is downloaded or the file does not exist yet).
+        refresh : bool
+            Revalidate with BCRPData even if the snapshot has not expired (default: False).
+        """
+        cache = self.metadata_cache
+        metadata = cache.load() if cache.is_fresh() and not refresh else None
+        downloaded = False
+
+        if metadata is None:
+            transport = get_transport()
             try:
-                metadata_content = requests.get(url).content
-                self.metadata = pd.read_pickle(metadata_content)  # Ensure it's loaded as a DataFrame
+                # Attempt to load metadata from primary URL, unless our snapshot is still current
+                response = transport.get(transport.metadata_url, headers=cache.validators())
+                if response.status_code == 304:
+                    metadata = cache.load()
+                    if metadata is not None:
+                        cache.touch()
+                    else:
+                        response = transport.get(transport.metadata_url)
+                if metadata is None:
+                    response.raise_for_status()
+                    metadata = pd.read_csv(io.BytesIO(response.content), delimiter=';', encoding='latin-1')
+                    if metadata.shape[0] > 5:
+                        metadata = cache.store(metadata, etag=response.headers.get("ETag"),
+                                               last_modified=response.headers.get("Last-Modified"))
+                        downloaded = True
             except Exception as e:
-                print(f"Error loading metadata from backup URL: {e}")
-                self.metadata = pd.DataFrame()  # Fallback to an empty DataFrame if all loading fails
+                print(f"Error loading metadata from the primary URL: {e}")
+                metadata = None
+
+        # If the primary URL fails, fall back to any snapshot at hand
+        if metadata is None or metadata.shape[0] <= 5:
+            print("Warning: metadata contains fewer than 5 rows, likely empty or incomplete")
+            metadata = self._fallback_metadata()
+
+        self.metadata = metadata
 
         # Save the metadata if needed
-        if filename and not self.metadata.empty:
+        if filename and not self.metadata.empty and (downloaded or not os.path.exists(filename)):
             self.metadata.to_csv(filename, sep=";", index=False)
 
+    def _fallback_metadata(self):
+        """Expired local snapshot, else the bundled `metadatos` snapshot, else its copy on GitHub (else empty)."""
+        metadata = self.metadata_cache.load()
+        if metadata is not None:
+            self.echo("Using the local metadata snapshot (may be outdated)")
+            return metadata
+
+        for path in SNAPSHOT_PATHS:
+            if os.path.exists(path):
+                try:
+                    self.echo(f"Using the bundled metadata snapshot: {path}")
+                    return compact_frame(read_snapshot(path))
+                except Exception as e:
+                    print(f"Error loading bundled metadata snapshot: {e}")
 
+        try:
+            return compact_frame(read_snapshot(io.BytesIO(get_transport().get(SNAPSHOT_URL).content)))
+        except Exception as e:
+            print(f"Error loading metadata from backup URL: {e}")
+            return pd.DataFrame()  # Fallback to an empty DataFrame if all loading fails
 
     def load_metadata(self, filename="metadata.csv"):
         """Load the metadata saved as a .csv file into Python."""
@@ -38,9 +182,9 @@ class MetadataHandler:
 
     def refine_metadata(self, filename=False):
         """Reduce metadata to those belonging to the series codes declared in self.codes."""
-        if self.metadata.empty:
-            self.get_metadata()
-        indices = [self.metadata.index[self.metadata.iloc[:, 0] == k].tolist()[0] for k in self.codes]
-        self.metadata = self.metadata.loc[indices]
+        positions = self.code_positions(self.codes)
+        if (positions < 0).any():
+            raise KeyError(f"codes not found in metadata: {[c for c, p in zip(self.codes, positions) if p < 0]}")
+        self.metadata = self.metadata.iloc[positions]
         if filename:
             self.save_metadata(filename)
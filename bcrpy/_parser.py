@@ -0,0 +1,209 @@
+import codecs
+import json
+import re
+
+import numpy as np
+import pandas as pd
+
+from bcrpy._periods import parse_periods
+
+MISSING = "n.d."
+STREAM_CHUNK = 64 * 1024
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+
+def parse_payload(data):
+    """
+    Parse a BCRPData JSON payload into columnar arrays in a single pass.
+
+    Parameters
+    ----------
+    data : dict
+        Decoded JSON returned by the BCRPData API (``{"config": ..., "periods": [...]}``).
+
+    Returns
+    -------
+    header : list of str
+        Series names, in the order returned by BCRPData.
+    labels : list of str
+        Period labels (e.g. ``Abr.2022``), one per row.
+    values : numpy.ndarray
+        Float64 array of shape (n_periods, n_series); ``"n.d."`` is mapped to NaN.
+    """
+    header = [k["name"] for k in data["config"]["series"]]
+    periods = data["periods"]
+    labels = [period["name"] for period in periods]
+    values = values_to_array([period["values"] for period in periods], len(header))
+    return header, labels, values
+
+
+def values_to_array(rows, n_series):
+    """
+    Convert a list of period value lists into one float64 block.
+
+    Parameters
+    ----------
+    rows : list of list
+        Raw values per period, as strings or numbers; ``"n.d."`` marks a missing value.
+    n_series : int
+        Number of series (columns) expected in every row.
+    """
+    flat = [value for row in rows for value in row]
+    if len(flat) != len(rows) * n_series:
+        raise ValueError(f"Malformed payload: expected {n_series} values per period.")
+
+    block = np.array(flat, dtype=object)
+    block[block == MISSING] = np.nan
+    return block.astype(np.float64).reshape(len(rows), n_series)
+
+
+def parse_stream(chunks, capacity=256):
+    """
+    Parse a BCRPData JSON payload incrementally, without materializing the decoded JSON.
+
+    The body is tokenized chunk by chunk; only one period object is decoded at a time and its
+    values are written straight into a preallocated float64 block (grown by doubling and trimmed
+    in place), so peak memory follows the size of the output rather than that of the raw and decoded JSON.
+
+    Parameters
+    ----------
+    chunks : iterable of bytes
+        Raw body, e.g. ``response.iter_content(STREAM_CHUNK)``.
+    capacity : int
+        Initial number of rows of the value block.
+
+    Returns
+    -------
+    header, labels, values
+        Same as `parse_payload`.
+    """
+    buffer = _StreamBuffer(chunks)
+    header, labels, values = None, [], None
+
+    buffer.expect("{")
+    while buffer.peek() != "}":
+        key = buffer.value()
+        buffer.expect(":")
+        if key == "config":
+            header = [k["name"] for k in buffer.value()["series"]]
+        elif key == "periods":
+            buffer.expect("[")
+            while buffer.peek() != "]":
+                period = buffer.value()
+                row = period["values"]
+                if values is None:
+                    values = np.empty((capacity, len(header) if header is not None else len(row)), dtype=np.float64)
+                if len(row) != values.shape[1]:
+                    raise ValueError(f"Malformed payload: expected {values.shape[1]} values per period.")
+                if len(labels) == len(values):
+                    values.resize((2 * len(values), values.shape[1]), refcheck=False)  # realloc, no extra copy
+                values[len(labels)] = [np.nan if value == MISSING else value for value in row]
+                labels.append(period["name"])
+                buffer.separator("]")
+            buffer.expect("]")
+        else:
+            buffer.value()
+        buffer.separator("}")
+
+    if header is None:
+        raise ValueError("Malformed payload: no series configuration.")
+    if values is None:
+        values = np.empty((0, len(header)), dtype=np.float64)
+    elif values.shape[1] != len(header):
+        raise ValueError(f"Malformed payload: expected {len(header)} values per period.")
+    values.resize((len(labels), values.shape[1]), refcheck=False)
+    return header, labels, values
+
+
+def read_response(response, stream=False):
+    """
+    Parse a BCRPData API response into (header, labels, values).
+
+    With `stream=True` the response should have been requested with ``stream=True``: its body is
+    parsed incrementally by `parse_stream` as it arrives; otherwise it is decoded with `response.json()`.
+    """
+    if not stream:
+        return parse_payload(response.json())
+    try:
+        return parse_stream(response.iter_content(STREAM_CHUNK))
+    finally:
+        response.close()
+
+
+class _StreamBuffer:
+    """Sliding text window over a stream of byte chunks, decoding one JSON value at a time."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._done = False
+        self.text = ""
+        self.pos = 0
+
+    def fill(self):
+        """Append the next chunk to the window (dropping consumed text). Returns False at the end of the stream."""
+        while not self._done:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._done = True
+                text = self._decoder.decode(b"", final=True)
+            else:
+                text = self._decoder.decode(chunk)
+            if text:
+                self.text = self.text[self.pos:] + text
+                self.pos = 0
+                return True
+        return False
+
+    def peek(self):
+        """Next non-whitespace character (without consuming it)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                raise ValueError("Malformed payload: unexpected end of JSON.")
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Malformed payload: expected {char!r} at offset {self.pos}.")
+        self.pos += 1
+
+    def separator(self, closing):
+        """Consume the ',' between items; leave `closing` in place for the caller."""
+        char = self.peek()
+        if char == ",":
+            self.pos += 1
+        elif char != closing:
+            raise ValueError(f"Malformed payload: expected ',' or {closing!r} at offset {self.pos}.")
+
+    def value(self):
+        """Decode the next complete JSON value, reading more chunks while it is incomplete."""
+        self.peek()
+        while True:
+            try:
+                obj, end = _DECODER.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise ValueError("Malformed payload: truncated JSON value.")
+            if end == len(self.text) and self.fill():
+                continue  # a number may continue in the next chunk
+            self.pos = end
+            return obj
+
+
+def payload_to_frame(data):
+    """Build the DataFrame for a BCRPData JSON payload with a single constructor call."""
+    return arrays_to_frame(*parse_payload(data))
+
+
+def arrays_to_frame(header, labels, values):
+    """Build the DataFrame for parsed (header, labels, values) arrays with a single constructor call."""
+    return pd.DataFrame(values, index=pd.Index(labels), columns=header)
+
+
+def period_index(labels):
+    """Convert BCRPData period labels (any frequency, 'ing' or 'esp') into a DatetimeIndex (unparseable labels become NaT)."""
+    return parse_periods(labels)
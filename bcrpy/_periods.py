@@ -0,0 +1,158 @@
+import datetime
+import warnings
+
+import numpy as np
+import pandas as pd
+
+# Month abbreviations used by BCRPData in both languages ('ing' / 'esp'), including the Peruvian 'Set' for September
+MONTHS = {
+    "jan": 1, "ene": 1, "feb": 2, "mar": 3, "apr": 4, "abr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "ago": 8, "sep": 9, "set": 9, "oct": 10, "nov": 11, "dec": 12, "dic": 12,
+}
+QUARTER_PREFIXES = "TQ"  # T1.22 (esp) / Q1.22 (ing)
+
+_DOT, _ZERO = ord("."), ord("0")
+
+
+def _token_key(c0, c1, c2):
+    """Integer key of a 3-letter token, case-insensitive (ASCII letters only)."""
+    return ((c0 | 32) << 16) | ((c1 | 32) << 8) | (c2 | 32)
+
+
+_MONTH_KEYS = np.array(sorted(_token_key(*map(ord, name)) for name in MONTHS), dtype=np.int64)
+_MONTH_VALUES = np.array([MONTHS[name] for name in sorted(MONTHS, key=lambda n: _token_key(*map(ord, n)))], dtype=np.int64)
+
+
+def century_pivot():
+    """Two-digit years up to this value are read as 20YY, later ones as 19YY."""
+    return datetime.date.today().year % 100 + 5
+
+
+def parse_periods(labels, kind="timestamp"):
+    """
+    Parse BCRPData period labels of any frequency, in 'ing' or 'esp', in one vectorized pass.
+
+    Recognized labels:
+
+    - daily: ``01.Ene.22`` / ``01.Jan.22`` (also with a 4-digit year)
+    - monthly: ``Abr.2022`` / ``Apr.2022`` (also with a 2-digit year)
+    - quarterly: ``T1.22`` / ``Q1.22`` (also with a 4-digit year)
+    - annual: ``2022``
+
+    Labels are viewed as a matrix of code points, so digits, separators and month names are decoded
+    with array arithmetic and a sorted lookup table of month abbreviations instead of per-label
+    format inference. Other labels fall back to `pandas.to_datetime` (unparseable ones become NaT).
+
+    Parameters
+    ----------
+    labels : sequence of str
+        Period labels as returned by BCRPData.
+    kind : str
+        'timestamp' (default) returns a DatetimeIndex at the start of each period; 'period' returns
+        a PeriodIndex with the labels' frequency (a DatetimeIndex if frequencies are mixed).
+
+    Returns
+    -------
+    pandas.DatetimeIndex or pandas.PeriodIndex
+    """
+    if kind not in ("timestamp", "period"):
+        raise ValueError(f"kind must be 'timestamp' or 'period', got {kind!r}")
+
+    values, freq, valid = _decode(labels)
+    index = pd.DatetimeIndex(values)
+    if kind == "period":
+        found = set(freq[valid])
+        if len(found) == 1 and valid.all():
+            return index.to_period(found.pop())
+    return index
+
+
+def label_frequency(labels):
+    """Frequency of BCRPData period labels: 'D', 'M', 'Q', 'Y', or None if unknown or mixed."""
+    _, freq, valid = _decode(labels)
+    found = set(freq[valid])
+    return found.pop() if len(found) == 1 else None
+
+
+def _decode(labels):
+    """Decode labels into (datetime64[ns] values, frequency letter per label, mask of labels recognized by the fast path)."""
+    labels = pd.Index(labels, dtype=object).astype(str)
+    n = len(labels)
+
+    # code points of the first 12 characters; longer labels (length 12) never match a BCRP pattern
+    cp = np.array(labels, dtype="U12").view(np.uint32).reshape(n, 12).astype(np.int64)
+    length = (cp > 0).sum(axis=1)
+
+    year = np.full(n, 1970, dtype=np.int64)  # placeholders for unmatched labels
+    month = np.ones(n, dtype=np.int64)
+    day = np.ones(n, dtype=np.int64)
+    freq = np.full(n, "", dtype="U1")
+    matched = np.zeros(n, dtype=bool)
+
+    # (frequency, label length, positions of '.', digits of the day, 3-letter month, quarter digit, year digits)
+    for f, size, dots, day_at, month_at, quarter_at, year_at in _PATTERNS:
+        rows = np.flatnonzero((length == size) & ~matched)
+        if len(rows) == 0:
+            continue
+        block = cp[rows]
+        ok = (block[:, dots] == _DOT).all(axis=1)
+        digits = block[:, list(range(*year_at)) + list(range(*(day_at or (0, 0)))) + ([quarter_at] if quarter_at is not None else [])]
+        ok &= ((digits >= _ZERO) & (digits <= _ZERO + 9)).all(axis=1)
+
+        y = _number(block, *year_at)
+        if year_at[1] - year_at[0] == 2:
+            y = np.where(y <= century_pivot(), 2000 + y, 1900 + y)
+        m = np.ones(len(rows), dtype=np.int64)
+        if month_at is not None:
+            m = _month(block, month_at)
+            ok &= m > 0
+        if quarter_at is not None:
+            ok &= np.isin(block[:, 0], _QUARTER_CODES)
+            q = block[:, quarter_at] - _ZERO
+            ok &= (q >= 1) & (q <= 4)
+            m = 3 * q - 2
+        d = _number(block, *day_at) if day_at else np.ones(len(rows), dtype=np.int64)
+
+        rows = rows[ok]
+        year[rows], month[rows], day[rows], freq[rows] = y[ok], m[ok], d[ok], f
+        matched[rows] = True
+
+    month_start = ((year - 1970) * 12 + month - 1).astype("datetime64[M]")
+    dates = month_start.astype("datetime64[D]") + (day - 1)
+    valid = matched & (day >= 1) & (dates.astype("datetime64[M]") == month_start)  # rejects 31.Feb
+    values = np.where(valid, dates.astype("datetime64[ns]"), np.datetime64("NaT", "ns"))
+
+    if not matched.all():
+        rest = ~matched
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            values[rest] = pd.to_datetime(labels[rest], errors="coerce").to_numpy(dtype="datetime64[ns]")
+
+    return values, freq, valid
+
+
+def _number(block, start, stop):
+    """Integer value of the digit columns [start, stop) of a code-point block."""
+    out = np.zeros(len(block), dtype=np.int64)
+    for col in range(start, stop):
+        out = out * 10 + (block[:, col] - _ZERO)
+    return out
+
+
+def _month(block, col):
+    """Month number of the 3-letter abbreviation starting at `col` (0 if not a month)."""
+    keys = _token_key(block[:, col], block[:, col + 1], block[:, col + 2])
+    pos = np.clip(np.searchsorted(_MONTH_KEYS, keys), 0, len(_MONTH_KEYS) - 1)
+    return np.where(_MONTH_KEYS[pos] == keys, _MONTH_VALUES[pos], 0)
+
+
+_QUARTER_CODES = [ord(c) for c in QUARTER_PREFIXES + QUARTER_PREFIXES.lower()]
+_PATTERNS = [
+    ("Y", 4, [], None, None, None, (0, 4)),           # 2022
+    ("M", 8, [3], None, 0, None, (4, 8)),           # Abr.2022
+    ("M", 6, [3], None, 0, None, (4, 6)),           # Abr.22
+    ("Q", 5, [2], None, None, 1, (3, 5)),           # T1.22
+    ("Q", 7, [2], None, None, 1, (3, 7)),           # T1.2022
+    ("D", 9, [2, 6], (0, 2), 3, None, (7, 9)),      # 01.Abr.22
+    ("D", 11, [2, 6], (0, 2), 3, None, (7, 11)),    # 01.Abr.2022
+]
@@ -0,0 +1,190 @@
+import re
+from collections import namedtuple
+
+import pandas as pd
+
+from bcrpy._store import merge_intervals, period_bounds
+
+# BCRPData frequency names (metadata column 'Frecuencia') and the code suffix letter of each frequency
+FREQUENCY_NAMES = {"Diaria": "D", "Mensual": "M", "Trimestral": "Q", "Anual": "A"}
+PERIODS_PER_YEAR = {"D": 365, "M": 12, "Q": 4, "A": 1}
+BYTES_PER_VALUE = 10  # '"123.4567",' in the JSON body
+BYTES_PER_PERIOD = 30  # '{"name":"Abr.2022","values":[...]},'
+
+PlannedRequest = namedtuple("PlannedRequest", ["codes", "frequency", "start", "end", "url_length", "n_periods"])
+PlannedRequest.__doc__ = """One API call of a RequestPlan: codes of a single frequency and the request window formatted for that frequency."""
+
+
+def code_frequency(code, metadata_frequency=None):
+    """Frequency letter ('D', 'M', 'Q', 'A') of a code: from the metadata 'Frecuencia' if known, else from the code's suffix."""
+    if metadata_frequency in FREQUENCY_NAMES:
+        return FREQUENCY_NAMES[metadata_frequency]
+    suffix = str(code)[-1:].upper()
+    return suffix if suffix in PERIODS_PER_YEAR else None
+
+
+def format_window(first, last, frequency):
+    """
+    Format a (first, last) day range as the request periods BCRPData expects for `frequency`.
+
+    Daily 'YYYY-MM-DD', monthly 'YYYY-M', quarterly 'YYYY-Q' and annual 'YYYY'. Unknown
+    frequencies use the monthly form.
+    """
+    def one(day):
+        if frequency == "D":
+            return day.strftime("%Y-%m-%d")
+        if frequency == "A":
+            return f"{day.year}"
+        if frequency == "Q":
+            return f"{day.year}-{(day.month - 1) // 3 + 1}"
+        return f"{day.year}-{day.month}"
+
+    return one(first), one(last)
+
+
+def parse_window(first, last):
+    """(first day, last day) of a request window, or None if a period is not 'YYYY', 'YYYY-M' or 'YYYY-MM-DD'."""
+    try:
+        return period_bounds(first)[0], period_bounds(last)[1]
+    except (ValueError, TypeError):
+        return None
+
+
+def raw_periods(first, last, frequency):
+    """Approximate number of periods of a window the planner cannot parse (from its years; 1 if they are unknown)."""
+    years = [re.match(r"\d{4}", str(period)) for period in (first, last)]
+    if not all(years):
+        return 1
+    return count_periods(pd.Timestamp(int(years[0].group()), 1, 1), pd.Timestamp(int(years[1].group()), 12, 31), frequency)
+
+
+def count_periods(first, last, frequency):
+    """Approximate number of periods of `frequency` between two days (used to estimate payload sizes)."""
+    years = (last - first).days / 365.25
+    return max(1, round(years * PERIODS_PER_YEAR.get(frequency or "M", 12)) + 1)
+
+
+class RequestPlan:
+    def __init__(self, requests, duplicates=0):
+        """
+        Plan of the API calls needed by a largeGET, computed before anything is fetched.
+
+        Attributes
+        ----------
+        requests : list of PlannedRequest
+            API calls, grouped by frequency and request window.
+        duplicates : int
+            Number of repeated (code, window) entries removed or merged while planning.
+        """
+        self.requests = requests
+        self.duplicates = duplicates
+
+    def __len__(self):
+        return len(self.requests)
+
+    def __iter__(self):
+        return iter(self.requests)
+
+    @property
+    def n_series(self):
+        return sum(len(request.codes) for request in self.requests)
+
+    @property
+    def estimated_values(self):
+        """Upper bound of the number of values returned (periods x series of every request)."""
+        return sum(request.n_periods * len(request.codes) for request in self.requests)
+
+    @property
+    def estimated_bytes(self):
+        """Rough size of all JSON bodies, in bytes."""
+        return sum(request.n_periods * (BYTES_PER_PERIOD + BYTES_PER_VALUE * len(request.codes)) for request in self.requests)
+
+    def to_frame(self):
+        """One row per planned request: frequency, window, number of series, URL length and estimated size."""
+        return pd.DataFrame({
+            "frequency": [request.frequency for request in self.requests],
+            "start": [request.start for request in self.requests],
+            "end": [request.end for request in self.requests],
+            "series": [len(request.codes) for request in self.requests],
+            "url_length": [request.url_length for request in self.requests],
+            "estimated_bytes": [request.n_periods * (BYTES_PER_PERIOD + BYTES_PER_VALUE * len(request.codes))
+                                for request in self.requests],
+        })
+
+    def summary(self):
+        """One-line description of the plan."""
+        frequencies = sorted({request.frequency or "?" for request in self.requests})
+        return (f"{len(self)} request(s) for {self.n_series} series ({', '.join(frequencies)}), "
+                f"~{self.estimated_bytes / 2**20:.1f} MiB estimated"
+                + (f", {self.duplicates} duplicate(s) merged" if self.duplicates else ""))
+
+    def __repr__(self):
+        return f"<RequestPlan: {self.summary()}>"
+
+
+def plan_requests(entries, start, end, frequencies=None, max_series=100, max_url_length=2000, url_for=None):
+    """
+    Group codes into API calls by frequency and request window, within series and URL-length budgets.
+
+    Parameters
+    ----------
+    entries : list
+        Series codes, or (code, start, end) tuples to request a code over its own window. Repeated
+        codes are requested once; overlapping or adjacent windows of the same code are merged.
+    start, end : str
+        Default request periods ('YYYY', 'YYYY-M' or 'YYYY-MM-DD'). Windows in any other form (e.g. '2019-Q4')
+        are passed to the API unchanged: their codes are grouped only with codes of the very same window.
+    frequencies : dict, optional
+        {code: metadata 'Frecuencia'}; codes missing from it are classified by their suffix letter.
+    max_series : int
+        Maximum number of codes per request.
+    max_url_length : int
+        Maximum length of a request URL.
+    url_for : callable, optional
+        url_for(code_series, start, end) -> URL, used to measure URL lengths (default: codes joined by '-').
+
+    Returns
+    -------
+    RequestPlan
+    """
+    frequencies = frequencies or {}
+    url_for = url_for or (lambda code_series, a, b: f"{code_series}/{a}/{b}")
+
+    windows, raw, order = {}, {}, []
+    duplicates = 0
+    for entry in entries:
+        code, first, last = (entry, start, end) if isinstance(entry, str) else entry
+        if code not in windows:
+            windows[code], raw[code] = [], []
+            order.append(code)
+        bounds = parse_window(first, last)
+        if bounds is not None:
+            windows[code].append(bounds)
+        elif (first, last) in raw[code]:
+            duplicates += 1
+        else:
+            raw[code].append((first, last))
+
+    groups = {}
+    for code in order:
+        merged = merge_intervals(windows[code])
+        duplicates += len(windows[code]) - len(merged)
+        frequency = code_frequency(code, frequencies.get(code))
+        for first, last in merged:
+            window = format_window(first, last, frequency)
+            groups.setdefault((frequency, window, count_periods(first, last, frequency)), []).append(code)
+        for window in raw[code]:
+            groups.setdefault((frequency, window, raw_periods(*window, frequency)), []).append(code)
+
+    requests = []
+    for (frequency, (a, b), n_periods), codes in groups.items():
+        packed = []
+        for code in codes:
+            if packed and (len(packed) >= max_series or len(url_for("-".join(packed + [code]), a, b)) > max_url_length):
+                requests.append(PlannedRequest(tuple(packed), frequency, a, b, len(url_for("-".join(packed), a, b)), n_periods))
+                packed = []
+            packed.append(code)
+        if packed:
+            requests.append(PlannedRequest(tuple(packed), frequency, a, b, len(url_for("-".join(packed), a, b)), n_periods))
+
+    return RequestPlan(requests, duplicates)
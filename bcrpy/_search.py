@@ -0,0 +1,191 @@
+import hashlib
+import os
+import pickle
+import re
+import unicodedata
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+
+TOKEN = re.compile(r"\w+")
+FORMAT_VERSION = 2
+
+
+def normalize(text):
+    """Lower-case `text` and fold accents (`Índice` -> `indice`, `economía` -> `economia`)."""
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii").lower()
+
+
+def tokenize(text):
+    """Split `text` into normalized, accent-folded word tokens."""
+    return TOKEN.findall(normalize(str(text)))
+
+
+def character_counts(tokens):
+    """(len(tokens), 128) matrix counting each ASCII character of every (accent-folded) token."""
+    encoded = [token.encode("ascii", "ignore") for token in tokens]
+    lengths = np.array([len(token) for token in encoded], dtype=np.int64)
+    chars = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.int64)
+    owners = np.repeat(np.arange(len(tokens)), lengths)
+    return np.bincount(owners * 128 + chars, minlength=len(tokens) * 128).reshape(len(tokens), 128)
+
+
+def fingerprint(metadata):
+    """Stable hash of a metadata DataFrame, used to check that a persisted index still matches it."""
+    digest = hashlib.sha256()
+    digest.update(repr((metadata.shape, list(map(str, metadata.columns)))).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(metadata.astype(str), index=True).to_numpy().tobytes())
+    return digest.hexdigest()[:32]
+
+
+def _fold(series):
+    """Vectorized `normalize` over a Series."""
+    return (
+        series.astype(str)
+        .str.normalize("NFKD")
+        .str.encode("ascii", "ignore")
+        .str.decode("ascii")
+        .str.lower()
+    )
+
+
+class SearchIndex:
+    def __init__(self, metadata):
+        """
+        Inverted token index over the BCRPData metadata, used by `Marco.wordsearch`.
+
+        Every cell is split into accent-folded tokens, and each token maps to the (row, column)
+        cells that contain it. Fuzzy candidates for a keyword are found by bounding difflib's
+        ratio against the whole vocabulary at once from per-token character counts, so only
+        those candidates are scored with difflib instead of every word of every cell.
+
+        Attributes
+        ----------
+        n_rows, n_columns : int
+            Shape of the indexed metadata.
+        vocabulary : list of str
+            Distinct tokens found in the metadata.
+        fingerprint : str
+            Hash of the indexed metadata (see `fingerprint`).
+        """
+        self.n_rows, self.n_columns = metadata.shape
+        self.fingerprint = fingerprint(metadata)
+
+        cells = {}
+        for col in range(self.n_columns):
+            tokens = _fold(metadata.iloc[:, col].astype(object).fillna("")).str.findall(TOKEN.pattern)
+            for row, words in enumerate(tokens):
+                for word in set(words):
+                    cells.setdefault(word, []).append(row * self.n_columns + col)
+
+        self.vocabulary = list(cells)
+        self._cells = [np.array(cells[word], dtype=np.int64) for word in self.vocabulary]
+        self._lengths = np.array([len(word) for word in self.vocabulary], dtype=np.int64)
+        counts = character_counts(self.vocabulary)
+        self._alphabet = np.flatnonzero(counts.any(axis=0))
+        self._counts = counts[:, self._alphabet].astype(np.uint16)
+
+    def candidates(self, term, cutoff):
+        """
+        Return {token id: similarity} for the vocabulary tokens within `cutoff` of `term`.
+
+        Candidates are the tokens whose `quick_ratio` bound (characters in common, regardless of
+        order) reaches the cutoff, computed for the whole vocabulary in one vectorized step; only
+        those are scored with difflib's ratio. The matches are those of `difflib.get_close_matches`
+        over the vocabulary, which applies the same bound.
+        """
+        term_counts = character_counts([term])[0, self._alphabet]
+        common = np.minimum(self._counts, term_counts).sum(axis=1, dtype=np.int64)
+        bound = 2.0 * common / (self._lengths + len(term))
+        matcher = SequenceMatcher()
+        matcher.set_seq2(term)
+        scores = {}
+        for token_id in np.flatnonzero(bound >= cutoff).tolist():
+            matcher.set_seq1(self.vocabulary[token_id])
+            ratio = matcher.ratio()
+            if ratio >= cutoff:
+                scores[token_id] = ratio
+        return scores
+
+    def search(self, keyword, cutoff=0.65, columns="all", top_k=None, match="all"):
+        """
+        Rank the metadata rows matching `keyword`.
+
+        Parameters
+        ----------
+        keyword : str
+            One or more keywords (split into tokens like the metadata).
+        cutoff : float
+            Similarity cutoff of difflib's ratio for a token to match a keyword.
+        columns : str or list of int
+            Columns to search in. If 'all', search in all columns.
+        top_k : int, optional
+            Return only the `top_k` best ranked rows.
+        match : str
+            'all' (default) keeps rows matching every keyword, 'any' rows matching at least one.
+
+        Returns
+        -------
+        rows : numpy.ndarray
+            Positional row numbers, best match first (ties keep metadata order).
+        scores : numpy.ndarray
+            Score of each row: the sum over keywords of the best token similarity in the row.
+        """
+        if match not in ("all", "any"):
+            raise ValueError(f"match must be 'all' or 'any', got {match!r}")
+        terms = list(dict.fromkeys(tokenize(keyword)))
+        if not terms:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.float64)
+
+        allowed = None
+        if columns != "all":
+            allowed = np.zeros(self.n_columns, dtype=bool)
+            allowed[list(columns)] = True
+
+        per_term = np.zeros((len(terms), self.n_rows), dtype=np.float64)
+        for t, term in enumerate(terms):
+            for token_id, score in self.candidates(term, cutoff).items():
+                cells = self._cells[token_id]
+                if allowed is not None:
+                    cells = cells[allowed[cells % self.n_columns]]
+                np.maximum.at(per_term[t], cells // self.n_columns, score)
+
+        hit = per_term > 0
+        mask = hit.all(axis=0) if match == "all" else hit.any(axis=0)
+        rows = np.flatnonzero(mask)
+        scores = per_term[:, rows].sum(axis=0)
+        order = np.argsort(-scores, kind="stable")
+        if top_k is not None:
+            order = order[:top_k]
+        return rows[order], scores[order]
+
+    # --- persistence ---
+
+    def save(self, filename):
+        """Persist the index (pickle) so it can be reloaded without rebuilding."""
+        folder = os.path.dirname(filename)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(filename, "wb") as f:
+            pickle.dump({"version": FORMAT_VERSION, "index": self}, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(filename, metadata=None):
+        """
+        Load a persisted index.
+
+        Returns None if the file is missing or unreadable, or if `metadata` is given and the index
+        was built from different metadata.
+        """
+        try:
+            with open(filename, "rb") as f:
+                payload = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+        if not isinstance(payload, dict) or payload.get("version") != FORMAT_VERSION:
+            return None
+        index = payload["index"]
+        if metadata is not None and index.fingerprint != fingerprint(metadata):
+            return None
+        return index
@@ -0,0 +1,269 @@
+import json
+import os
+import re
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+
+LONG_COLUMNS = ("code", "date", "value")
+ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+INGEST_LOG = "ingest_log"
+
+
+def quote_identifier(name):
+    """Quote an SQLite identifier (table or column name) so it can be interpolated safely."""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def connect(db_name, timeout=30.0):
+    """
+    Open an SQLite connection tuned for bulk loads.
+
+    The connection runs in autocommit mode (transactions are opened explicitly by the writers),
+    with WAL journaling and ``synchronous=NORMAL`` so a bulk insert costs one fsync per commit.
+    In WAL mode readers never block, and a writer waits up to `timeout` seconds for the write
+    lock held by another connection or process.
+    """
+    conn = sqlite3.connect(db_name, timeout=timeout, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.execute("PRAGMA temp_store=MEMORY;")
+    return conn
+
+
+def format_labels(index):
+    """Convert a DataFrame index into the TEXT values stored in the `date` column."""
+    if isinstance(index, pd.DatetimeIndex):
+        return [None if pd.isna(ts) else ts.strftime("%Y-%m-%d") for ts in index]
+    return [None if pd.isna(label) else str(label) for label in index]
+
+
+def write_wide(conn, table_name, labels, header, values, if_exists="replace"):
+    """
+    Bulk write a block of values as a wide table: one `date` column plus one REAL column per series.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        Connection returned by `connect`.
+    table_name : str
+        Destination table.
+    labels : list of str
+        Date labels, one per row of `values`.
+    header : list of str
+        Column names, one per column of `values`.
+    values : numpy.ndarray
+        2-D float array; NaN is stored as NULL.
+    if_exists : str
+        'replace' drops the table first; 'append' inserts into the existing table.
+    """
+    table = quote_identifier(table_name)
+    columns = ["date"] + [quote_identifier(col) for col in header]
+
+    conn.execute("BEGIN;")
+    try:
+        if if_exists == "replace":
+            conn.execute(f"DROP TABLE IF EXISTS {table};")
+        definitions = ["date TEXT"] + [f"{col} REAL" for col in columns[1:]]
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(definitions)});")
+
+        insert_query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))});"
+        conn.executemany(insert_query, ((label, *row) for label, row in zip(labels, np.asarray(values).tolist())))
+        create_indexes(conn, table_name)
+        conn.execute("COMMIT;")
+    except Exception:
+        conn.execute("ROLLBACK;")
+        raise
+
+
+def write_long(conn, table_name, labels, codes, values, if_exists="replace"):
+    """
+    Bulk write a block of values as a long/tidy table `(code, date, value)`.
+
+    Only observed points are stored: NaN values and rows without a date are skipped.
+    The table is keyed by a composite primary key on `(code, date)`, so it stays indexable
+    regardless of how many series it holds; appended points replace any stored point with the same key.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        Connection returned by `connect`.
+    table_name : str
+        Destination table.
+    labels : list of str
+        Date labels, one per row of `values`.
+    codes : list of str
+        Series codes, one per column of `values`.
+    values : numpy.ndarray
+        2-D float array of shape (len(labels), len(codes)).
+    if_exists : str
+        'replace' drops the table first; 'append' inserts into the existing table.
+    """
+    table = quote_identifier(table_name)
+    values = np.asarray(values, dtype=np.float64)
+    labels = np.asarray(labels, dtype=object)
+
+    observed = ~np.isnan(values) & pd.notna(labels)[:, None]
+    rows, cols = np.nonzero(observed)
+    records = zip(np.asarray(codes, dtype=object)[cols].tolist(), labels[rows].tolist(), values[rows, cols].tolist())
+
+    conn.execute("BEGIN;")
+    try:
+        if if_exists == "replace":
+            conn.execute(f"DROP TABLE IF EXISTS {table};")
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "code TEXT NOT NULL, date TEXT NOT NULL, value REAL, PRIMARY KEY (code, date)) WITHOUT ROWID;"
+        )
+        conn.executemany(f"INSERT OR REPLACE INTO {table} (code, date, value) VALUES (?, ?, ?);", records)
+        create_indexes(conn, table_name)
+        conn.execute("COMMIT;")
+    except Exception:
+        conn.execute("ROLLBACK;")
+        raise
+
+
+def upsert_long(conn, table_name, labels, codes, values, source=None):
+    """
+    Merge a block of values into a long `(code, date, value)` table, keyed on `(code, date)`.
+
+    New points are inserted and stored points are updated only where the value changed; unchanged points
+    are not rewritten. Series and dates absent from the block are left as they are, so a table can grow
+    incrementally, one chunk at a time. The batch is applied in a single `BEGIN IMMEDIATE` transaction
+    (concurrent writers of other processes wait for each other, see `connect`) and recorded in the
+    `ingest_log` table.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        Connection returned by `connect`.
+    table_name : str
+        Destination table (created if needed).
+    labels : list of str
+        Date labels, one per row of `values` (ISO 'YYYY-MM-DD' dates keep date filters in SQL).
+    codes : list of str
+        Series codes, one per column of `values`.
+    values : numpy.ndarray
+        2-D float array of shape (len(labels), len(codes)); NaN points are skipped.
+    source : str, optional
+        Free-text description of the batch, kept in the ingest log.
+
+    Returns
+    -------
+    dict
+        The ingest log record: `points` offered, `inserted`, `updated` and `unchanged` points.
+    """
+    table = quote_identifier(table_name)
+    values = np.asarray(values, dtype=np.float64)
+    labels = np.asarray(labels, dtype=object)
+
+    observed = ~np.isnan(values) & pd.notna(labels)[:, None]
+    rows, cols = np.nonzero(observed)
+    records = zip(np.asarray(codes, dtype=object)[cols].tolist(), labels[rows].tolist(), values[rows, cols].tolist())
+
+    conn.execute("BEGIN IMMEDIATE;")
+    try:
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "code TEXT NOT NULL, date TEXT NOT NULL, value REAL, PRIMARY KEY (code, date)) WITHOUT ROWID;"
+        )
+        create_indexes(conn, table_name)
+        create_ingest_log(conn)
+        conn.execute("DROP TABLE IF EXISTS temp.staging;")
+        conn.execute("CREATE TEMP TABLE staging (code TEXT NOT NULL, date TEXT NOT NULL, value REAL, "
+                     "PRIMARY KEY (code, date)) WITHOUT ROWID;")
+        conn.executemany("INSERT OR REPLACE INTO temp.staging (code, date, value) VALUES (?, ?, ?);", records)
+
+        points = conn.execute("SELECT COUNT(*) FROM temp.staging;").fetchone()[0]
+        inserted = conn.execute(
+            f"SELECT COUNT(*) FROM temp.staging AS s WHERE NOT EXISTS "
+            f"(SELECT 1 FROM {table} AS t WHERE t.code = s.code AND t.date = s.date);"
+        ).fetchone()[0]
+        before = conn.total_changes
+        conn.execute(
+            f"INSERT INTO {table} (code, date, value) SELECT code, date, value FROM temp.staging WHERE true "
+            f"ON CONFLICT (code, date) DO UPDATE SET value = excluded.value WHERE value IS NOT excluded.value;"
+        )
+        updated = conn.total_changes - before - inserted
+        record = {"table_name": str(table_name), "ingested": time.time(), "pid": os.getpid(), "source": source,
+                  "points": points, "inserted": inserted, "updated": updated, "unchanged": points - inserted - updated}
+        conn.execute(f"INSERT INTO {INGEST_LOG} ({', '.join(record)}) VALUES ({', '.join(['?'] * len(record))});",
+                     list(record.values()))
+        conn.execute("DROP TABLE temp.staging;")
+        conn.execute("COMMIT;")
+    except Exception:
+        conn.execute("ROLLBACK;")
+        raise
+    return record
+
+
+def create_ingest_log(conn):
+    """Create the `ingest_log` table: one row per `upsert_long` batch (when, which process, what changed)."""
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {INGEST_LOG} ("
+        "id INTEGER PRIMARY KEY, table_name TEXT NOT NULL, ingested REAL NOT NULL, pid INTEGER, source TEXT, "
+        "points INTEGER, inserted INTEGER, updated INTEGER, unchanged INTEGER);"
+    )
+
+
+def create_indexes(conn, table_name):
+    """
+    Index `date`, so date ranges are read without scanning the table.
+
+    Long tables are also searched by code through their `(code, date)` primary key.
+    """
+    index = quote_identifier(f"{table_name}_date")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS {index} ON {quote_identifier(table_name)} (date);")
+
+
+def table_columns(conn, table_name):
+    """Column names of `table_name` (empty if the table does not exist)."""
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({quote_identifier(table_name)});")]
+
+
+def table_layout(conn, table_name):
+    """Return 'long' if `table_name` uses the `(code, date, value)` schema, otherwise 'wide'."""
+    return "long" if tuple(table_columns(conn, table_name)) == LONG_COLUMNS else "wide"
+
+
+def iso_dates(conn, table_name):
+    """True if the `date` column holds ISO 'YYYY-MM-DD' dates (comparable in SQL), not BCRPData labels."""
+    row = conn.execute(f"SELECT date FROM {quote_identifier(table_name)} WHERE date IS NOT NULL LIMIT 1;").fetchone()
+    return row is None or bool(ISO_DATE.match(str(row[0])))
+
+
+def select_query(table_name, layout, columns=None, codes=None, first=None, last=None):
+    """
+    SELECT statement and parameters reading `table_name` ordered by date, filtered in SQL.
+
+    Parameters
+    ----------
+    table_name : str
+        Table to read.
+    layout : str
+        'wide' or 'long' (see `table_layout`).
+    columns : list of str, optional
+        Wide layout: value columns to read (default: all).
+    codes : list of str, optional
+        Long layout: series codes to read (default: all), passed as one JSON parameter so any number fits.
+    first, last : str, optional
+        Inclusive ISO date bounds.
+    """
+    conditions, params = [], []
+    if layout == "long":
+        selected = "code, date, value"
+        if codes is not None:
+            conditions.append("code IN (SELECT value FROM json_each(?))")
+            params.append(json.dumps([str(code) for code in codes]))
+    else:
+        selected = "*" if columns is None else ", ".join(["date"] + [quote_identifier(col) for col in columns])
+    if first is not None:
+        conditions.append("date >= ?")
+        params.append(first)
+    if last is not None:
+        conditions.append("date <= ?")
+        params.append(last)
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    return f"SELECT {selected} FROM {quote_identifier(table_name)}{where} ORDER BY date;", params
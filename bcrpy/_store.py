@@ -0,0 +1,242 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from bcrpy import _sqlite
+
+DAY = pd.Timedelta(days=1)
+
+
+def period_bounds(period):
+    """
+    Interpret a request period string ('YYYY', 'YYYY-M' or 'YYYY-MM-DD').
+
+    Returns
+    -------
+    first : pandas.Timestamp
+        First day covered by the period.
+    last : pandas.Timestamp
+        Last day covered by the period.
+    granularity : str
+        'Y', 'M' or 'D', used to format ranges back into request periods.
+    """
+    parts = [int(part) for part in str(period).split("-")]
+    if len(parts) == 1:
+        return pd.Timestamp(parts[0], 1, 1), pd.Timestamp(parts[0], 12, 31), "Y"
+    if len(parts) == 2:
+        first = pd.Timestamp(parts[0], parts[1], 1)
+        return first, first + pd.offsets.MonthEnd(0), "M"
+    day = pd.Timestamp(parts[0], parts[1], parts[2])
+    return day, day, "D"
+
+
+def format_period(timestamp, granularity):
+    """Format a Timestamp as a BCRPData request period of the given granularity."""
+    if granularity == "Y":
+        return f"{timestamp.year}"
+    if granularity == "M":
+        return f"{timestamp.year}-{timestamp.month}"
+    return timestamp.strftime("%Y-%m-%d")
+
+
+def merge_intervals(intervals):
+    """Merge overlapping or adjacent (first, last) day intervals."""
+    merged = []
+    for first, last in sorted(intervals):
+        if merged and first <= merged[-1][1] + DAY:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+    return merged
+
+
+def subtract_intervals(first, last, covered):
+    """Return the sub-ranges of [first, last] that are not inside the (merged) `covered` intervals."""
+    gaps = []
+    cursor = first
+    for cov_first, cov_last in covered:
+        if cov_last < cursor:
+            continue
+        if cov_first > last:
+            break
+        if cov_first > cursor:
+            gaps.append((cursor, cov_first - DAY))
+        cursor = max(cursor, cov_last + DAY)
+    if cursor <= last:
+        gaps.append((cursor, last))
+    return gaps
+
+
+class SeriesStore:
+    def __init__(self, db_name=os.path.join(".bcrpy_cache", "series_store.db")):
+        """
+        Persistent per-series store used by `GET(incremental=True)`.
+
+        Observations are kept in a long `(code, date, value)` table, alongside a `coverage` table
+        recording which date ranges of each code have already been fetched. Requests are answered
+        from the store and only the missing ranges are fetched from BCRPData.
+
+        Attributes
+        ----------
+        db_name : str
+            SQLite file holding the store (default: '.bcrpy_cache/series_store.db').
+        """
+        self.db_name = db_name
+
+    def connect(self):
+        """Open the store, creating its tables on first use."""
+        folder = os.path.dirname(self.db_name)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        conn = _sqlite.connect(self.db_name)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS observations ("
+            "code TEXT NOT NULL, date TEXT NOT NULL, value REAL, PRIMARY KEY (code, date)) WITHOUT ROWID;"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS coverage (code TEXT NOT NULL, first TEXT NOT NULL, last TEXT NOT NULL);")
+        conn.execute("CREATE INDEX IF NOT EXISTS coverage_code ON coverage (code);")
+        conn.execute("CREATE TABLE IF NOT EXISTS series (code TEXT PRIMARY KEY, name TEXT);")
+        return conn
+
+    def coverage(self, codes):
+        """Return {code: [(first, last), ...]} with the merged date ranges already held for each code."""
+        conn = self.connect()
+        try:
+            covered = {code: [] for code in codes}
+            for chunk in _batches(list(covered), 500):
+                query = f"SELECT code, first, last FROM coverage WHERE code IN ({', '.join(['?'] * len(chunk))});"
+                for code, first, last in conn.execute(query, chunk):
+                    covered[code].append((pd.Timestamp(first), pd.Timestamp(last)))
+        finally:
+            conn.close()
+        return {code: merge_intervals(intervals) for code, intervals in covered.items()}
+
+    def missing(self, codes, start, end):
+        """
+        Plan the fetches needed to serve `codes` over [start, end].
+
+        Codes missing the same range are grouped so they share a single API call, and ranges lying
+        inside a wider missing range are folded into it (a slightly larger payload, one call fewer).
+
+        Returns
+        -------
+        dict
+            {(start, end): [codes]} with request periods formatted like `start` / `end`.
+        """
+        first, _, granularity = period_bounds(start)
+        _, last, _ = period_bounds(end)
+
+        gaps = {}
+        for code, covered in self.coverage(codes).items():
+            for gap_first, gap_last in subtract_intervals(first, last, covered):
+                # snap the gap to whole request periods
+                window = (period_bounds(format_period(gap_first, granularity))[0],
+                          period_bounds(format_period(gap_last, granularity))[1])
+                gaps.setdefault(window, []).append(code)
+
+        plan = {}
+        for window in sorted(gaps, key=lambda w: w[0] - w[1]):  # widest first
+            host = next((w for w in plan if w[0] <= window[0] and window[1] <= w[1]), window)
+            plan.setdefault(host, [])
+            plan[host] += [code for code in gaps[window] if code not in plan[host]]
+
+        return {(format_period(a, granularity), format_period(b, granularity)): group for (a, b), group in plan.items()}
+
+    def write(self, codes, names, dates, values, start, end):
+        """
+        Upsert fetched observations (only changed values are rewritten, see `_sqlite.upsert_long`) and extend
+        the coverage of each code.
+
+        A code counts as covered from `start` up to its last observed date inside the window, so the
+        trailing (not yet published) part of the window is fetched again on the next request.
+
+        Parameters
+        ----------
+        codes : list of str
+            Series code of each column of `values`.
+        names : list of str
+            Series name of each column, as returned by BCRPData.
+        dates : pandas.DatetimeIndex
+            Date of each row of `values` (NaT rows are skipped).
+        values : numpy.ndarray
+            2-D float array of shape (len(dates), len(codes)).
+        start, end : str
+            Request periods that were fetched.
+        """
+        first, _, _ = period_bounds(start)
+        _, last, _ = period_bounds(end)
+        values = np.asarray(values, dtype=np.float64)
+        labels = [None if pd.isna(ts) else ts.strftime("%Y-%m-%d") for ts in dates]
+
+        conn = self.connect()
+        try:
+            _sqlite.upsert_long(conn, "observations", labels, codes, values, source=f"GET incremental {start}..{end}")
+
+            conn.execute("BEGIN;")
+            conn.executemany("INSERT OR REPLACE INTO series (code, name) VALUES (?, ?);", zip(codes, names))
+            for idx, code in enumerate(codes):
+                observed = dates[~np.isnan(values[:, idx]) & dates.notna()]
+                if len(observed) == 0:
+                    continue
+                rows = conn.execute("SELECT first, last FROM coverage WHERE code = ?;", (code,)).fetchall()
+                intervals = [(pd.Timestamp(a), pd.Timestamp(b)) for a, b in rows]
+                intervals.append((first, min(last, observed.max())))
+                conn.execute("DELETE FROM coverage WHERE code = ?;", (code,))
+                conn.executemany(
+                    "INSERT INTO coverage (code, first, last) VALUES (?, ?, ?);",
+                    [(code, a.strftime("%Y-%m-%d"), b.strftime("%Y-%m-%d")) for a, b in merge_intervals(intervals)],
+                )
+            conn.execute("COMMIT;")
+        finally:
+            conn.close()
+
+    def read(self, codes, start, end):
+        """Return the stored observations of `codes` over [start, end] as a wide DataFrame (one column per code)."""
+        first, _, _ = period_bounds(start)
+        _, last, _ = period_bounds(end)
+
+        conn = self.connect()
+        try:
+            frames = []
+            for chunk in _batches(list(codes), 500):
+                query = (
+                    f"SELECT code, date, value FROM observations WHERE code IN ({', '.join(['?'] * len(chunk))}) "
+                    "AND date BETWEEN ? AND ?;"
+                )
+                frames.append(pd.read_sql(query, conn, params=[*chunk, first.strftime("%Y-%m-%d"), last.strftime("%Y-%m-%d")]))
+        finally:
+            conn.close()
+
+        long = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["code", "date", "value"])
+        df = long.pivot(index="date", columns="code", values="value").reindex(columns=list(codes))
+        df.index = pd.to_datetime(df.index)
+        df.index.name = None
+        df.columns.name = None
+        return df.sort_index()
+
+    def names(self, codes):
+        """Return {code: series name} for the codes held in the store."""
+        conn = self.connect()
+        try:
+            names = {}
+            for chunk in _batches(list(codes), 500):
+                query = f"SELECT code, name FROM series WHERE code IN ({', '.join(['?'] * len(chunk))});"
+                names.update(conn.execute(query, chunk).fetchall())
+        finally:
+            conn.close()
+        return names
+
+    def forget(self, codes):
+        """Drop the coverage of `codes`, so their next request is fetched in full."""
+        conn = self.connect()
+        try:
+            conn.execute("BEGIN;")
+            conn.executemany("DELETE FROM coverage WHERE code = ?;", [(code,) for code in codes])
+            conn.execute("COMMIT;")
+        finally:
+            conn.close()
+
+
+def _batches(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
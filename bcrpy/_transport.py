@@ -0,0 +1,141 @@
+import os
+import random
+import threading
+import time
+
+from bcrpy._control import TokenBucket
+
+API_ROOT = "https://estadisticas.bcrp.gob.pe/estadisticas/series/api"
+METADATA_URL = "https://estadisticas.bcrp.gob.pe/estadisticas/series/metadata"
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+class Transport:
+    def __init__(self, api_root=API_ROOT, metadata_url=METADATA_URL, connect_timeout=10, read_timeout=120,
+                 retries=4, backoff=0.5, max_backoff=30.0, pool_size=32, rate_limit=None, burst=1):
+        """
+        Shared HTTP layer for every network call made by bcrpy.
+
+        Keeps one pooled `requests.Session` per process (keep-alive connections are reused across
+        GET, largeGET chunks and metadata downloads), negotiates gzip compression, applies
+        connect/read timeouts and retries 5xx/429 responses and connection errors with exponential
+        backoff and full jitter.
+
+        Point `api_root` / `metadata_url` at a local stand-in server (or subclass and override `get`)
+        to run tests and benchmarks offline; install it with `set_transport`.
+
+        Attributes
+        ----------
+        api_root : str
+            Root of the series API (default: BCRPData).
+        metadata_url : str
+            URL of the metadata CSV.
+        connect_timeout, read_timeout : float
+            Timeouts in seconds for opening a connection and for waiting on the response.
+        retries : int
+            Number of retries after the first attempt.
+        backoff : float
+            Base delay in seconds; attempt n waits up to `backoff * 2**n` (capped at `max_backoff`).
+        pool_size : int
+            Maximum number of keep-alive connections kept per host.
+        rate_limit : float, optional
+            Client-side cap on requests per second (token bucket, retries included). Default: no cap.
+            The cap applies per process.
+        burst : int
+            Number of requests that may be sent at once before `rate_limit` applies.
+        """
+        self.api_root = api_root
+        self.metadata_url = metadata_url
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.pool_size = pool_size
+        self.rate_limit = rate_limit
+        self.limiter = TokenBucket(rate_limit, burst) if rate_limit else None
+        self._session = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        """The pooled session of the current process (recreated after a fork)."""
+        if self._session is None or self._pid != os.getpid():
+            with self._lock:
+                if self._session is None or self._pid != os.getpid():
+                    import requests  # loaded on the first request, not when bcrpy is imported
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    session.headers.update({"Accept-Encoding": "gzip, deflate", "User-Agent": "bcrpy"})
+                    self._session, self._pid = session, os.getpid()
+        return self._session
+
+    def series_url(self, code_series, format, start, end, lang):
+        """URL of a series request on the API."""
+        return f"{self.api_root}/{code_series}/{format}/{start}/{end}/{lang}"
+
+    def get(self, url, headers=None, stream=False):
+        """
+        GET `url` with pooling, timeouts and retries.
+
+        Returns the last response once it succeeds, is not retryable, or retries are exhausted;
+        re-raises the last connection error if every attempt failed to connect.
+        """
+        import requests
+
+        for attempt in range(self.retries + 1):
+            if self.limiter is not None:
+                self.limiter.acquire()
+            try:
+                response = self.session.get(url, headers=headers, stream=stream,
+                                            timeout=(self.connect_timeout, self.read_timeout))
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries:
+                    raise
+                time.sleep(self.delay(attempt))
+                continue
+
+            if response.status_code not in RETRY_STATUS or attempt == self.retries:
+                return response
+            response.close()
+            time.sleep(self.delay(attempt, response.headers.get("Retry-After")))
+
+    def delay(self, attempt, retry_after=None):
+        """Backoff before retry `attempt` (0-based): full jitter, or the server's numeric Retry-After."""
+        if retry_after is not None and str(retry_after).isdigit():
+            return min(float(retry_after), self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def __getstate__(self):
+        state = dict(self.__dict__, _session=None, _pid=None)
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+
+_transport = Transport()
+
+
+def get_transport():
+    """Return the transport used by bcrpy for every network call."""
+    return _transport
+
+
+def set_transport(transport):
+    """Replace the transport used by bcrpy (e.g. one pointed at a local stand-in server). Returns the previous one."""
+    global _transport
+    previous, _transport = _transport, transport
+    return previous
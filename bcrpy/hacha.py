@@ -1,5 +1,8 @@
+import numpy as np
 import pandas as pd
 
+__all__ = ["Axe"]
+
 class Axe:
     def __init__(self):
         """Initializes the Axe class for splitting and combining dataframes."""
@@ -18,9 +21,13 @@ class Axe:
         self.fragments = [dataframe[i:i + chunk_size] for i in range(0, len(dataframe), chunk_size)]
         return self.fragments
 
-    def forge(self, fragments, axis=1, ignore_index=False):
+    def forge(self, fragments, axis=1, ignore_index=False, dtype=None):
         """Combines a list of fragments into a single dataframe.
 
+        Horizontal concatenation of numeric fragments with sorted, unique indexes (e.g. largeGET chunks
+        indexed by date) is done by `merge_fragments`: the union index is built once with a k-way merge
+        and the output block is allocated once. Other fragments fall back to `pandas.concat`.
+
         Parameters
         ----------
         fragments : list of pandas.DataFrame
@@ -31,10 +38,101 @@ class Axe:
             - 1: Horizontal concatenation (along columns).
         ignore_index : bool, optional
             If True, do not use the index values along the concatenation axis (default is False).
+        dtype : str or numpy.dtype, optional
+            dtype of the combined values (default: the common dtype of the fragments).
 
         Returns
         -------
         pandas.DataFrame
             The combined dataframe.
         """
-        return pd.concat(fragments, axis=axis, ignore_index=ignore_index)
+        fragments = list(fragments)
+        dtypes = [value_dtypes(fragment) for fragment in fragments] if axis in (1, "columns") else []
+        if fragments and dtypes and all(map(mergeable, fragments, dtypes)) \
+                and len({fragment.index.dtype for fragment in fragments}) == 1:
+            combined = merge_fragments(fragments, dtype, dtypes)
+            if ignore_index:
+                combined.columns = pd.RangeIndex(combined.shape[1])
+            return combined
+
+        combined = pd.concat(fragments, axis=axis, ignore_index=ignore_index)
+        return combined if dtype is None else combined.astype(dtype)
+
+
+def value_dtypes(fragment):
+    """Distinct dtypes of the columns of `fragment`."""
+    return set(fragment.dtypes.to_numpy())
+
+
+def mergeable(fragment, dtypes=None):
+    """True if `fragment` can be combined by `merge_fragments`: numpy numeric columns and a sorted, unique index."""
+    index = fragment.index
+    dtypes = value_dtypes(fragment) if dtypes is None else dtypes
+    return (not isinstance(index, pd.MultiIndex) and index.is_monotonic_increasing and index.is_unique
+            and all(isinstance(dtype, np.dtype) and dtype.kind in "biuf" for dtype in dtypes))
+
+
+def merge_sorted(arrays):
+    """Union of sorted, unique arrays, merged pairwise in a balanced tree (k-way merge in log2(k) rounds)."""
+    distinct = {}
+    for array in arrays:  # chunks of one request window share the same index: merge it once
+        distinct.setdefault((len(array), array[:1].tobytes(), array[-1:].tobytes()), []).append(array)
+    level = []
+    for group in distinct.values():
+        level.append(group[0])
+        level.extend(array for array in group[1:] if not np.array_equal(array, group[0]))
+    while len(level) > 1:
+        level = [np.union1d(level[i], level[i + 1]) if i + 1 < len(level) else level[i] for i in range(0, len(level), 2)]
+    return level[0]
+
+
+def merge_fragments(fragments, dtype=None, dtypes=None):
+    """
+    Combine numeric fragments with sorted, unique indexes side by side (outer join on the index).
+
+    The union index is computed once by a k-way merge of the fragment indexes; the output block is
+    allocated once (NaN where a fragment has no row) and every fragment is scattered into its columns,
+    so no intermediate frame is built and no index is realigned more than once. `dtypes` (the
+    `value_dtypes` of each fragment) may be passed when already known. With gaps, an integer or bool
+    `dtype` is applied after merging as float, like `pandas.concat(...).astype(dtype)` (which raises for NaN).
+    """
+    indexes = [fragment.index for fragment in fragments]
+    union = merge_sorted([index.to_numpy() for index in indexes])
+
+    positions = []
+    for index in indexes:
+        if len(index) == len(union) and np.array_equal(index.to_numpy(), union):
+            positions.append(None)  # covers every row: plain slice assignment
+        else:
+            positions.append(np.searchsorted(union, index.to_numpy()))
+
+    gaps = any(rows is not None for rows in positions)
+    cast = None
+    if dtype is None:
+        found = set().union(*(map(value_dtypes, fragments) if dtypes is None else dtypes))
+        dtype = np.result_type(*found) if found else np.float64
+    elif gaps and np.dtype(dtype).kind != "f":
+        cast = dtype  # applied to the merged float block, as pandas.concat(...).astype(dtype) would
+    if gaps and np.dtype(dtype).kind != "f":
+        dtype = np.float64  # gaps are filled with NaN
+    dtype = np.dtype(dtype)
+
+    n_columns = sum(fragment.shape[1] for fragment in fragments)
+    block = np.empty((n_columns, len(union)), dtype=dtype)  # one row per column: pandas' own block layout
+    if dtype.kind == "f":
+        block.fill(np.nan)
+    start = 0
+    for fragment, rows in zip(fragments, positions):
+        stop = start + fragment.shape[1]
+        values = fragment.to_numpy(dtype=dtype).T
+        if rows is None:
+            block[start:stop] = values
+        else:
+            block[start:stop, rows] = values
+        start = stop
+
+    columns = fragments[0].columns.append([fragment.columns for fragment in fragments[1:]]) if len(fragments) > 1 \
+        else fragments[0].columns
+    index = pd.Index(union, dtype=indexes[0].dtype, name=indexes[0].name)
+    combined = pd.DataFrame(block.T, index=index, columns=columns, copy=False)
+    return combined if cast is None else combined.astype(cast)
@@ -1,12 +1,13 @@
 import pandas as pd
 import json
-from difflib import get_close_matches
-from termcolor import colored, cprint
-from colorama import just_fix_windows_console
+from ._console import colored, cprint
 from ._fetcher import Fetcher  
 from ._metadata import MetadataHandler
+from ._cache import ResultCache, MetadataCache
+from ._store import SeriesStore
+from ._control import ChunkTuner
+from ._instrument import Stats
 
-just_fix_windows_console()
 
 class Marco(Fetcher, MetadataHandler):
     def __init__(self):
@@ -29,6 +30,23 @@ class Marco(Fetcher, MetadataHandler):
             Format for extracting/processing data (default: 'json').
         lang : str
             Selected language (default: 'ing' for English). Other option is 'esp' for Spanish.
+        stream : bool
+            If True, API responses are parsed incrementally as they arrive instead of being decoded
+            whole with `response.json()`, reducing peak memory on very large requests (default: False).
+        cache : ResultCache
+            Content-addressed cache of GET / largeGET results (default folder: '.bcrpy_cache').
+        store : SeriesStore
+            Persistent per-series store used by GET(incremental=True).
+        metadata_cache : MetadataCache
+            Local snapshot of the metadata used by get_metadata (revalidated with BCRPData once a day by default).
+        tuner : ChunkTuner
+            Per-series cost model learned from past largeGET requests, used by largeGET(chunk_size='auto').
+        fetch_report : dict or None
+            Concurrency, chunk size, request count, errors and latency of the last largeGET run.
+        stats : Stats or None
+            Per-phase timings and counters of the last GET / largeGET (also in `result.attrs['bcrpy_stats']`).
+        quiet : bool
+            If True, progress and cache messages are not printed; errors and warnings still are (default: False).
         """
         self.metadata: pd.DataFrame = pd.DataFrame()
         self.data: pd.DataFrame = pd.DataFrame()
@@ -37,6 +55,14 @@ class Marco(Fetcher, MetadataHandler):
         self.end: str = "2016-9"
         self.format: str = "json"
         self.lang: str = "ing"
+        self.stream: bool = False
+        self.cache: ResultCache = ResultCache()
+        self.store: SeriesStore = SeriesStore()
+        self.metadata_cache: MetadataCache = MetadataCache()
+        self.tuner: ChunkTuner = ChunkTuner()
+        self.fetch_report: dict | None = None
+        self.stats: Stats | None = None
+        self.quiet: bool = False
 
 
     def parameters(self):
@@ -62,73 +88,99 @@ class Marco(Fetcher, MetadataHandler):
 
         print(colored("corriendo query para {}...\n".format(codigo), "green"))
         
-        index = self.metadata.index[self.metadata.iloc[:, 0] == codigo].tolist()
+        position = self.code_position(codigo)
         cprint(codigo, "white", "on_green", end=" ")
-        print(f"es indice {index[0]} en metadatos")
-        data_dict = self.metadata.loc[index].to_dict()
-        for key in data_dict:
-            data_dict[key] = data_dict[key][index[0]]
-        data_dict.pop("Unnamed: 13", None)
+        print(f"es indice {self.metadata.index[position]} en metadatos")
+        data_dict = self.query_dict(codigo)
         jsondata = json.dumps(data_dict, indent=8, ensure_ascii=False)
         print(jsondata)
         return jsondata
 
     def query_dict(self, codigo="PD39793AM"):
-        if self.metadata.empty:
-            self.get_metadata()
-        index = self.metadata.index[self.metadata.iloc[:, 0] == codigo].tolist()
-        data_dict = self.metadata.loc[index].to_dict()
-        for key in data_dict:
-            data_dict[key] = data_dict[key][index[0]]
+        """Metadata of one series code as a dict (KeyError if the code is not in metadata)."""
+        data_dict = self.metadata.iloc[[self.code_position(codigo)]].to_dict("records")[0]
         data_dict.pop("Unnamed: 13", None)
         return data_dict
 
-    def wordsearch(self, keyword="economia", cutoff=0.65, columnas="all"):
+    def query_many(self, codes):
+        """
+        Metadata of many series codes in one vectorized lookup.
+
+        Parameters
+        ----------
+        codes : list of str
+            Series codes to look up.
+
+        Returns
+        -------
+        pd.DataFrame
+            One metadata row per code found, in the order of `codes`; codes not in metadata are skipped with a warning.
+        """
+        positions = self.code_positions(codes)
+        missing = [code for code, position in zip(codes, positions) if position < 0]
+        if missing:
+            print(f"Warning: The following codes were not found in metadata: {missing}")
+        return self.metadata.iloc[positions[positions >= 0]].drop(columns="Unnamed: 13", errors="ignore")
+
+    def wordsearch(self, keyword="economia", cutoff=0.65, columnas="all", top_k=None, match="all"):
         """
         Perform a fuzzy search for keywords in the BCRPData metadata.
+
+        Matching is case and accent insensitive and uses the prebuilt `search_index`
+        (see `build_search_index` to persist it between sessions).
         
         Parameters
         ----------
         keyword : str
-            Keyword to search for in the metadata.
+            Keyword(s) to search for in the metadata, separated by spaces.
         cutoff : float
             Similarity cutoff for the fuzzy matching (default is 0.65).
         columnas : str or list of int
             Columns to search in. If 'all', search in all columns (default is 'all').
+        top_k : int, optional
+            Return only the `top_k` best ranked series (default: all matches).
+        match : str
+            'all' (default) returns series matching every keyword, 'any' series matching at least one.
+
+        Returns
+        -------
+        pd.DataFrame
+            Matching metadata rows, best match first.
         """
         print(f"\nBusqueda difusa de palabra: `{keyword}`")
         print(f"cutoff (tolerancia) = {cutoff}; columnas = {'`all`(todas)' if columnas == 'all' else columnas}")
         
-        if self.metadata.empty:
-            self.get_metadata()
-        
-        def contains_similar_keyword(text, keyword, cutoff=0.8):
-            words = text.split()
-            return any(get_close_matches(keyword, [word], n=1, cutoff=cutoff) for word in words)
-        
-        if columnas == "all":
-            bool_df = self.metadata.apply(lambda col: col.apply(lambda x: contains_similar_keyword(str(x), keyword, cutoff)))
-        else:
-            bool_df = self.metadata.iloc[:, columnas].apply(lambda col: col.apply(lambda x: contains_similar_keyword(str(x), keyword, cutoff)))
-        
-        new_df = self.metadata[bool_df.any(axis=1)]
+        rows, _ = self.search_index.search(keyword, cutoff=cutoff, columns=columnas, top_k=top_k, match=match)
+        new_df = self.metadata.iloc[rows]
         print("\n\n", new_df)
         return new_df
 
 
+    def series_names(self, codes):
+        """Column names BCRPData uses for each series code (`Grupo de serie - Nombre de serie`)."""
+        positions = self.code_positions(codes)
+        if (positions < 0).any():
+            raise KeyError(f"codes not found in metadata: {[c for c, p in zip(codes, positions) if p < 0]}")
+        rows = self.metadata.iloc[positions]
+        if rows.empty:
+            return []
+        return (rows["Grupo de serie"].astype(str) + " - " + rows["Nombre de serie"].astype(str)).tolist()
+
+    def reorder_frame(self, df, codes):
+        """Return `df` with its columns in the order of `codes` (does not modify the object)."""
+        return df.reindex(columns=self.series_names(codes))
+
     def order_columns(self, hacer=True):
         """Sub-method to reorder columns according to how they were defined in objeto.codes."""
-        if self.metadata.empty:
-            self.get_metadata()
-        user_order = [f"{self.query_dict(codigo)['Grupo de serie']} - {self.query_dict(codigo)['Nombre de serie']}" for codigo in self.codes]
+        user_order = self.series_names(self.codes)
         code_dict = {user_order[i]: self.codes[i] for i in range(len(self.codes))}
 
         if hacer:
             self.data = self.data.reindex(columns=user_order)
-            print("Orden de datos determinados por usuario:")
+            self.echo("Orden de datos determinados por usuario:")
         else:
-            print("Orden de datos predeterminados por BCRPData:")
+            self.echo("Orden de datos predeterminados por BCRPData:")
 
         for count, value in enumerate(self.data.columns, start=1):
-            print(f"{count}\t{code_dict[value]}\t{value}")
+            self.echo(f"{count}\t{code_dict.get(value, '?')}\t{value}")
 
@@ -4,6 +4,8 @@ from difflib import get_close_matches
 import sqlite3
 from typing import Optional
 
+from bcrpy import _columnar, _periods, _sqlite
+
 
 def scan_columns(df: pd.DataFrame, keyword: str, cutoff: float = 0.65):
     """
@@ -32,9 +34,10 @@ def scan_columns(df: pd.DataFrame, keyword: str, cutoff: float = 0.65):
 
 
 
-def save_dataframe(df: pd.DataFrame, filename: str, meta: Optional[dict] = None):
+def save_dataframe(df: pd.DataFrame, filename: str, meta: Optional[dict] = None, format: Optional[str] = None,
+                   compression: Optional[str] = None):
     """
-    Save a DataFrame to disk in CSV, Markdown, or pickle format.
+    Save a DataFrame to disk in Parquet, Feather, CSV, Markdown, or pickle format.
     Also writes an optional .meta JSON file with context (codes, start, end, lang).
 
     Parameters
@@ -42,18 +45,33 @@ def save_dataframe(df: pd.DataFrame, filename: str, meta: Optional[dict] = None)
     df : pandas.DataFrame
         The DataFrame to save.
     filename : str
-        Target filename. Suffix determines the format:
+        Target filename. Unless `format` is given, the suffix determines the format:
+          - ".parquet" → Parquet (requires pyarrow)
+          - ".feather" / ".arrow" → Feather, i.e. Arrow IPC (requires pyarrow)
           - ".csv" → CSV
           - ".md"  → Markdown
           - else   → Pickle
     meta : dict, optional
         Dictionary of metadata (codes, start, end, lang, etc.) to save alongside cache.
+    format : str, optional
+        'parquet', 'feather' or 'pickle', whatever the suffix (e.g. for `.bcrfile` caches). Frames Parquet /
+        Feather cannot hold without loss (sparse columns, duplicate or non-string labels, or pyarrow missing)
+        are pickled instead; under a '.parquet' / '.feather' / '.arrow' name they raise ValueError.
+    compression : str, optional
+        Codec of the Parquet / Feather file (default: 'zstd' for Parquet, 'uncompressed' for Feather,
+        which can be loaded memory-mapped without copying).
     """
     ext = os.path.splitext(filename)[1].lower()
+    format = format or _columnar.EXTENSIONS.get(ext)
 
-    if ext == ".csv":
+    if format in ("parquet", "feather") and _columnar.columnar_supported(df):
+        _columnar.write_frame(df, filename, format, compression)
+    elif ext in _columnar.EXTENSIONS and format != "pickle":
+        raise ValueError(f"Cannot save this DataFrame as {format} ({filename}): it needs pyarrow, unique string "
+                         f"column labels and no sparse columns. Use format='pickle' or another file name.")
+    elif format is None and ext == ".csv":
         df.to_csv(filename)
-    elif ext == ".md":
+    elif format is None and ext == ".md":
         with open(filename, "w", encoding="utf-8") as f:
             f.write(df.to_markdown())
     else:
@@ -68,7 +86,7 @@ def save_dataframe(df: pd.DataFrame, filename: str, meta: Optional[dict] = None)
 
 
 
-def load_dataframe(filename):
+def load_dataframe(filename, columns=None, start=None, end=None, memory_map=True):
     """Load stored data from a file into Python.
 
     Parameters
@@ -76,46 +94,189 @@ def load_dataframe(filename):
     filename : str
         Name of the file. 
         If the filename ends with the ".csv" suffix, the file is loaded as a CSV. 
-        Otherwise, the file is loaded using Python's 'pickle' module.
+        Parquet and Feather files are recognized by their content, whatever the suffix (e.g. `.bcrfile` caches);
+        any other file is loaded using Python's 'pickle' module.
+    columns : list of str, optional
+        Columns to load, as column labels or series codes (default: all). Parquet and Feather files read
+        only these columns from disk.
+    start, end : str, optional
+        Periods ('YYYY', 'YYYY-M' or 'YYYY-MM-DD') bounding the dates to load, for frames indexed by date.
+    memory_map : bool, optional
+        Memory-map Parquet / Feather files instead of reading them (default True).
     """
     if filename[-3:] == "csv":
-        return pd.read_csv(filename, delimiter=",")
+        df = pd.read_csv(filename, delimiter=",")
+        return df if columns is None else df[_columnar.resolve_columns(list(df.columns), columns)]
 
-    else:
-        return pickle.load(open(filename, "rb"), encoding="latin1")
+    if _columnar.file_format(filename) != "pickle":
+        return _columnar.read_frame(filename, columns=columns, start=start, end=end, memory_map=memory_map)
+
+    with open(filename, "rb") as f:
+        df = pickle.load(f, encoding="latin1")
+    if columns is not None:
+        df = df[_columnar.resolve_columns(list(df.columns), columns)]
+    if start is not None or end is not None:
+        first, last = _columnar.date_range(start, end)
+        df = df.loc[first:last]
+    return df
 
 
-def save_df_as_sql(df, db_name, table_name='time series'):
+def save_df_as_sql(df, db_name, table_name='time series', layout='wide', if_exists='replace', codes=None, verbose=True, source=None):
     """
     Saves a DataFrame with time series data to an SQLite database.
+    Rows are written with a single bulk `executemany` inside one transaction (WAL journal, synchronous=NORMAL).
     
     Parameters:
     --------------
-    df: pandas.DataFrame, the DataFrame containing time series data.
+    df: pandas.DataFrame, the DataFrame containing time series data. Its index is stored in the `date` column.
     db_name: str, the name of the SQLite database file (e.g., 'database.db').
     table_name: str, the name of the table in the database to save the data to.
-    """
-    # Ensure the index is reset if it's a DateTime index for compatibility
-    if isinstance(df.index, pd.DatetimeIndex):
-        df = df.reset_index()
+    layout: str, 'wide' (one REAL column per series) or 'long' (tidy `(code, date, value)` table keyed on (code, date)).
+    if_exists: str, 'replace' (default) recreates the table; 'append' inserts into the existing table; 'upsert' (long
+        layout only) merges into the existing table on (code, date), updating only the values that changed, and records
+        the batch in the `ingest_log` table (see `read_ingest_log`). Several processes can upsert into one database.
+    codes: list of str, optional, series codes stored in the `code` column of the long layout (defaults to the column labels).
+    verbose: bool, print a confirmation when the data is saved (default True).
+    source: str, optional, description of the batch kept in the ingest log (upsert only).
 
-    # Connect to the SQLite database (or create it if it doesn't exist)
-    conn = sqlite3.connect(db_name)
+    Returns:
+    --------------
+    dict or None: with if_exists='upsert', the ingest log record of the batch (points, inserted, updated, unchanged).
+        Errors of an upsert are raised (the batch is rolled back); other modes print them.
+    """
+    if if_exists == 'upsert' and layout != 'long':
+        raise ValueError("if_exists='upsert' needs layout='long' (rows keyed on (code, date)).")
+    conn = _sqlite.connect(db_name)
     try:
-        # Save the DataFrame to the database table
-        df.to_sql(table_name, conn, if_exists='replace', index=False)
-        print(f"Data saved successfully to '{table_name}' in '{db_name}'.")
+        labels = _sqlite.format_labels(df.index)
+        values = df.to_numpy(dtype=float, na_value=float("nan"))
+        if if_exists == 'upsert':
+            record = _sqlite.upsert_long(conn, table_name, labels, list(df.columns) if codes is None else codes, values,
+                                         source=source)
+            if verbose:
+                print(f"Data upserted into '{table_name}' in '{db_name}': {record['inserted']} new, "
+                      f"{record['updated']} updated, {record['unchanged']} unchanged point(s).")
+            return record
+        if layout == 'long':
+            _sqlite.write_long(conn, table_name, labels, list(df.columns) if codes is None else codes, values, if_exists=if_exists)
+        else:
+            _sqlite.write_wide(conn, table_name, labels, list(df.columns), values, if_exists=if_exists)
+        if verbose:
+            print(f"Data saved successfully to '{table_name}' in '{db_name}'.")
     except Exception as e:
+        if if_exists == 'upsert':
+            raise  # callers merging batches into a shared store must know a batch was not written
         print(f"An error occurred: {e}")
     finally:
         # Close the database connection
         conn.close()
 
-def load_from_sqlite(db_name, table_name='time_series'):
-    """Load data from the SQLite cache and return as a DataFrame."""
-    with sqlite3.connect(db_name) as conn:
-        df = pd.read_sql(f"SELECT * FROM {table_name}", conn)
-        df.set_index("date", inplace=True)
-        df.index = pd.to_datetime(df.index, errors="coerce")  # Convert index to datetime if necessary
+def read_ingest_log(db_name):
+    """
+    Return the ingest log of an SQLite store as a DataFrame, one row per upserted batch (oldest first).
+
+    Columns: id, table_name, ingested (timestamp), pid, source, points, inserted, updated, unchanged.
+    Empty if nothing was ever upserted into `db_name`.
+    """
+    conn = _sqlite.connect(db_name)
+    try:
+        _sqlite.create_ingest_log(conn)
+        log = pd.read_sql(f"SELECT * FROM {_sqlite.INGEST_LOG} ORDER BY id;", conn)
+    finally:
+        conn.close()
+    log["ingested"] = pd.to_datetime(log["ingested"], unit="s")
+    return log
+
+
+def load_from_sqlite(db_name, table_name='time_series', verbose=True, codes=None, start=None, end=None, chunksize=None):
+    """
+    Load data from the SQLite cache and return as a DataFrame. Long `(code, date, value)` tables are pivoted back to one column per code.
+
+    Parameters:
+    --------------
+    db_name: str, the SQLite database file.
+    table_name: str, the table to read (default 'time_series').
+    verbose: bool, print the first rows of the result (default True; never printed with `chunksize`).
+    codes: list of str, optional, series to read: codes of a long table, or column labels / series codes of a wide one.
+        Filtered in SQL, so only these series are read from disk.
+    start, end: str, optional, periods ('YYYY', 'YYYY-M' or 'YYYY-MM-DD') bounding the dates to read, filtered in SQL
+        through the `date` index when the table holds ISO dates. Tables holding BCRPData labels ('Abr.2022', 'T1.22',
+        '01.Ene.22') are filtered after parsing the labels (chunks are then sorted by date within each chunk only).
+    chunksize: int, optional, return an iterator of DataFrames of about `chunksize` rows (dates of a wide table,
+        points of a long one; a date is never split between two chunks) instead of one DataFrame.
+    """
+    chunks = _iter_sqlite(db_name, table_name, codes, start, end, chunksize)
+    if chunksize is not None:
+        return chunks
+    df = next(chunks)
+    if verbose:
         print("Data loaded from SQLite:", df.head())
-        return df
+    return df
+
+
+def _iter_sqlite(db_name, table_name, codes, start, end, chunksize):
+    """Helper for load_from_sqlite: yields the result (in chunks when `chunksize` is given)."""
+    conn = sqlite3.connect(db_name)
+    try:
+        layout = _sqlite.table_layout(conn, table_name)
+        first, last = _columnar.date_range(start, end)
+        pushdown = _sqlite.iso_dates(conn, table_name)
+        bounds = [None if ts is None or not pushdown else ts.strftime("%Y-%m-%d") for ts in (first, last)]
+
+        columns = None
+        if layout == 'wide' and codes is not None:
+            stored = [col for col in _sqlite.table_columns(conn, table_name) if col != "date"]
+            columns = _columnar.resolve_columns(stored, codes)
+        query, params = _sqlite.select_query(table_name, layout, columns=columns, codes=codes, first=bounds[0], last=bounds[1])
+
+        rows = [pd.read_sql(query, conn, params=params)] if chunksize is None else \
+            pd.read_sql(query, conn, params=params, chunksize=chunksize)
+        if layout == 'long':
+            names = list(codes) if codes is not None else [row[0] for row in conn.execute(
+                f"SELECT DISTINCT code FROM {_sqlite.quote_identifier(table_name)} ORDER BY code;")]
+            frames = _pivot_chunks(rows, names)
+        else:
+            frames = (frame.set_index("date") for frame in rows)
+
+        found = False
+        for df in frames:
+            df.index = _parse_dates(df.index)
+            if not pushdown:  # BCRPData labels: SQL ordered them as text and cannot filter them
+                df = df.sort_index()
+                if first is not None or last is not None:
+                    df = df.loc[(df.index >= (first or df.index.min())) & (df.index <= (last or df.index.max()))]
+            found = True
+            yield df
+        if not found:
+            yield pd.DataFrame(columns=columns if layout == 'wide' else names, index=pd.DatetimeIndex([], name="date"), dtype=float)
+    finally:
+        conn.close()
+
+
+def _pivot_chunks(chunks, codes):
+    """Pivot `(code, date, value)` chunks ordered by date into wide frames, keeping each date in a single frame."""
+    chunks = iter(chunks)
+    current = next(chunks, None)
+    while current is not None:
+        following = next(chunks, None)
+        if following is None:
+            yield _pivot_long(current, codes)
+            break
+        tail = (current["date"] == current["date"].iloc[-1]).to_numpy()
+        if not tail.all():
+            yield _pivot_long(current[~tail], codes)
+        current = pd.concat([current[tail], following], ignore_index=True)
+
+
+def _pivot_long(chunk, codes):
+    df = chunk.pivot(index="date", columns="code", values="value").reindex(columns=codes)
+    df.columns.name = None
+    return df
+
+
+def _parse_dates(labels):
+    """Dates of the `date` column: ISO dates directly, BCRPData labels ('Abr.2022', 'T1.22', '01.Ene.22') by `parse_periods`."""
+    try:
+        return pd.to_datetime(labels, format="ISO8601")
+    except (ValueError, TypeError):
+        return _periods.parse_periods([None if pd.isna(label) else str(label) for label in labels])
@@ -0,0 +1,74 @@
+"""
+Benchmark: result cache formats (pickle, Feather, Parquet) on a wide largeGET-like result.
+
+Writes a frame of --series float columns over --periods dates (--freq) in every format and codec, then
+times a full load and a projected load of --select columns over one year, and reports the file size.
+Pickle has no projection: it deserializes the whole frame and then selects.
+
+Usage:
+    python -m benchmarks.bench_cache_formats --series 3000 --periods 360 --select 5
+    python -m benchmarks.bench_cache_formats --series 3000 --periods 7000 --freq D
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from bcrpy.utils import load_dataframe, save_dataframe
+
+VARIANTS = [
+    ("pickle", None),
+    ("feather", "uncompressed"),
+    ("feather", "lz4"),
+    ("parquet", "snappy"),
+    ("parquet", "zstd"),
+]
+
+
+def synthetic_result(series, periods, freq="MS", seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("1990-01-01", periods=periods, freq=freq)
+    values = rng.normal(size=(periods, series))
+    values[rng.random(values.shape) < 0.3] = np.nan
+    return pd.DataFrame(values, index=dates, columns=[f"Serie {i}, codigo no. PN{i:05d}MM" for i in range(series)])
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--series", type=int, default=3000)
+    parser.add_argument("--periods", type=int, default=360)
+    parser.add_argument("--freq", default="MS", help="pandas frequency of the dates ('MS' monthly, 'D' daily)")
+    parser.add_argument("--select", type=int, default=5, help="columns loaded by the projected read")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    df = synthetic_result(args.series, args.periods, args.freq)
+    codes = [f"PN{i:05d}MM" for i in np.linspace(0, args.series - 1, args.select, dtype=int)]
+    year = str(df.index[len(df) // 2].year)
+
+    print(f"{'format':<10}{'codec':<14}{'MiB':>8}{'write (s)':>11}{'load (s)':>10}{'projected (s)':>15}")
+    with tempfile.TemporaryDirectory() as folder:
+        for fmt, codec in VARIANTS:
+            path = os.path.join(folder, f"{fmt}-{codec}.bcrfile")
+            write, _ = best_of(lambda: save_dataframe(df, path, format=fmt, compression=codec), 1)
+            load, full = best_of(lambda: load_dataframe(path), args.repeat)
+            projected, part = best_of(lambda: load_dataframe(path, columns=codes, start=year, end=year), args.repeat)
+            assert full.shape == df.shape and part.shape == ((df.index.year == int(year)).sum(), args.select)
+            print(f"{fmt:<10}{codec or '-':<14}{os.path.getsize(path) / 2**20:>8.1f}{write:>11.3f}{load:>10.3f}"
+                  f"{projected:>15.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark: largeGET executors ('serial', 'thread', 'process', 'async') against the local stand-in API.
+
+For every code count, each executor runs one cold largeGET (empty cache) and reports the wall time,
+the series throughput and the startup overhead (wall time of a single-chunk job, i.e. pool creation
+and serialization costs without any parallel work to amortize them).
+
+With `--workers auto` / `--chunk-size auto`, the adaptive concurrency controller and the chunk-size tuner
+choose the settings; the final concurrency and chunk size of every run are reported.
+
+Usage:
+    python -m benchmarks.bench_executors --codes 10 100 1000 --latency 0.05
+    python -m benchmarks.bench_executors --executors thread async --workers auto --chunk-size auto
+"""
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+
+import bcrpy
+from benchmarks.server import StandInAPI
+
+EXECUTORS = ("serial", "thread", "process", "async")
+
+
+def run_once(executor, codes, chunk_size, workers, start, end):
+    banco = bcrpy.Marco()
+    with tempfile.TemporaryDirectory() as folder:
+        banco.cache = bcrpy.ResultCache(directory=folder)
+        banco.metadata_cache = bcrpy.MetadataCache(directory=folder)  # keep the stand-in metadata out of the user's snapshot
+        with contextlib.redirect_stdout(io.StringIO()):
+            banco.get_metadata(filename=None)
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = banco.largeGET(codes=codes, start=start, end=end, chunk_size=chunk_size,
+                                nucleos=workers, executor=executor, forget=True)
+        elapsed = time.perf_counter() - t0
+    assert df.shape[1] == len(codes), f"{executor}: expected {len(codes)} columns, got {df.shape[1]}"
+    return elapsed, banco.fetch_report
+
+
+def auto_or_int(value):
+    return value if value == "auto" else int(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--codes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--chunk-size", type=auto_or_int, default=10, help="series per chunk, or 'auto'")
+    parser.add_argument("--workers", type=auto_or_int, default=8, help="workers / requests in flight, or 'auto'")
+    parser.add_argument("--latency", type=float, default=0.05, help="server latency per request, in seconds")
+    parser.add_argument("--executors", nargs="+", default=list(EXECUTORS), choices=EXECUTORS)
+    parser.add_argument("--start", default="2015-1")
+    parser.add_argument("--end", default="2020-12")
+    args = parser.parse_args()
+
+    with StandInAPI(n_codes=max(args.codes), latency=args.latency) as api:
+        previous = bcrpy.set_transport(api.transport())
+        try:
+            print(f"latency={args.latency}s chunk_size={args.chunk_size} workers={args.workers}")
+            print(f"{'executor':<10}{'codes':>8}{'chunks':>8}{'wall (s)':>11}{'series/s':>11}{'startup (s)':>13}"
+                  f"{'chunk':>7}{'in flight':>11}")
+            for executor in args.executors:
+                startup, _ = run_once(executor, api.codes[:1], 1, args.workers, args.start, args.end)
+                for n in args.codes:
+                    elapsed, report = run_once(executor, api.codes[:n], args.chunk_size, args.workers, args.start, args.end)
+                    chunks = -(-n // report["chunk_size"])
+                    print(f"{executor:<10}{n:>8}{chunks:>8}{elapsed:>11.3f}{n / elapsed:>11.1f}{startup:>13.3f}"
+                          f"{report['chunk_size']:>7}{report['final_concurrency']:>11}")
+        finally:
+            bcrpy.set_transport(previous)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark: `Axe.forge` (k-way index merge + single block allocation) vs. `pd.concat(axis=1)`.
+
+Builds N chunk frames like largeGET's: `--series` columns each, indexed by the months of a random
+window (mixed windows force the union index to be realigned), then times both engines and measures
+their peak memory with tracemalloc. Results are checked to be identical.
+
+Usage:
+    python -m benchmarks.bench_forge --fragments 30 300 3000 --series 10
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from bcrpy.hacha import Axe
+
+
+def synthetic_fragments(n, series, months, seed=0):
+    """`n` frames of `series` float64 columns, each over a random window of `months` monthly dates."""
+    rng = np.random.default_rng(seed)
+    dates = pd.DatetimeIndex(pd.date_range("1990-01-01", periods=months, freq="MS").to_numpy())
+    fragments = []
+    for k in range(n):
+        first = int(rng.integers(0, months // 2))
+        last = int(rng.integers(first + 1, months + 1))
+        index = dates[first:last]
+        fragments.append(pd.DataFrame(rng.normal(size=(len(index), series)), index=index,
+                                      columns=[f"Serie {k}.{j}, codigo no. PN{k * series + j:05d}MM" for j in range(series)]))
+    return fragments
+
+
+def measure(fn):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fragments", type=int, nargs="+", default=[30, 300, 3000])
+    parser.add_argument("--series", type=int, default=10, help="columns per fragment")
+    parser.add_argument("--months", type=int, default=360, help="length of the full date range")
+    parser.add_argument("--dtype", default=None, help="output dtype of Axe.forge (e.g. float32)")
+    args = parser.parse_args()
+
+    print(f"{'fragments':>10}{'shape':>16}{'concat (s)':>12}{'peak MiB':>10}{'forge (s)':>11}{'peak MiB':>10}{'speedup':>9}")
+    for n in args.fragments:
+        fragments = synthetic_fragments(n, args.series, args.months)
+        expected, slow, slow_peak = measure(lambda: pd.concat(fragments, axis=1))
+        result, fast, fast_peak = measure(lambda: Axe().forge(fragments, dtype=args.dtype))
+        pd.testing.assert_frame_equal(result, expected if args.dtype is None else expected.astype(args.dtype),
+                                      check_freq=False)
+        shape = f"{result.shape[0]}x{result.shape[1]}"
+        print(f"{n:>10}{shape:>16}{slow:>12.3f}{slow_peak / 2**20:>10.1f}{fast:>11.3f}{fast_peak / 2**20:>10.1f}"
+              f"{slow / fast:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
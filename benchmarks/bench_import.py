@@ -0,0 +1,71 @@
+"""
+Benchmark: import time of bcrpy, against a budget.
+
+Every measurement runs in a fresh interpreter, so nothing is already cached in `sys.modules`. It times
+`import bcrpy` and the first `bcrpy.Marco()` (loading pandas and the fetch pipeline). It also checks
+that a plain `import bcrpy` loads none of the heavy dependencies, since they should load only on
+first use. The exit status is 1 if the median `import bcrpy` time exceeds --budget-ms, or if a heavy
+module was loaded.
+
+Usage:
+    python -m benchmarks.bench_import --repeat 10 --budget-ms 50
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+HEAVY = ["pandas", "numpy", "requests", "pathos", "dill", "multiprocess", "termcolor", "colorama", "pyarrow"]
+
+SNIPPETS = {
+    "import bcrpy": "import bcrpy",
+    "bcrpy.Marco()": "import bcrpy; bcrpy.Marco()",
+}
+
+PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+{snippet}
+elapsed = time.perf_counter() - t0
+print(json.dumps({{"seconds": elapsed, "modules": sorted(m for m in {heavy!r} if m in sys.modules)}}))
+"""
+
+
+def run(snippet):
+    """Seconds spent running `snippet` in a fresh interpreter, and the heavy modules it left loaded."""
+    output = subprocess.run([sys.executable, "-c", PROBE.format(snippet=snippet, heavy=HEAVY)],
+                            check=True, capture_output=True, text=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    return result["seconds"], result["modules"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10, help="fresh interpreters per measurement")
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="maximum median time of `import bcrpy`")
+    args = parser.parse_args(argv)
+
+    medians, loaded = {}, {}
+    for name, snippet in SNIPPETS.items():
+        runs = [run(snippet) for _ in range(args.repeat)]
+        medians[name] = statistics.median(seconds for seconds, _ in runs) * 1000
+        loaded[name] = runs[-1][1]
+
+    print(f"{'snippet':<16}{'median (ms)':>12}  heavy modules loaded")
+    for name in SNIPPETS:
+        print(f"{name:<16}{medians[name]:>12.1f}  {', '.join(loaded[name]) or '-'}")
+
+    cost = medians["import bcrpy"]
+    failures = []
+    if cost > args.budget_ms:
+        failures.append(f"import bcrpy took {cost:.1f} ms (budget {args.budget_ms:.1f} ms)")
+    if loaded["import bcrpy"]:
+        failures.append(f"import bcrpy loaded {', '.join(loaded['import bcrpy'])}")
+    for failure in failures:
+        print(f"OVER BUDGET: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
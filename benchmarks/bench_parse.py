@@ -0,0 +1,70 @@
+"""
+Benchmark: columnar JSON-to-DataFrame parser vs. the legacy row-by-row builder.
+
+Usage:
+    python -m benchmarks.bench_parse --periods 10000 --series 100
+"""
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from bcrpy._parser import payload_to_frame
+
+
+def synthetic_payload(n_periods, n_series, missing=0.05, seed=0):
+    """Build a BCRPData-shaped JSON payload with `n_periods` x `n_series` values."""
+    rng = random.Random(seed)
+    return {
+        "config": {"series": [{"name": f"Serie {j}"} for j in range(n_series)]},
+        "periods": [
+            {
+                "name": f"P{i}",
+                "values": ["n.d." if rng.random() < missing else f"{rng.uniform(0, 1000):.3f}" for _ in range(n_series)],
+            }
+            for i in range(n_periods)
+        ],
+    }
+
+
+def legacy_frame(data):
+    """The previous `Fetcher.GET` builder: one `df.loc` append per period."""
+    header = [k["name"] for k in data["config"]["series"]]
+    df = pd.DataFrame(columns=header)
+    for period in data["periods"]:
+        df.loc[period["name"]] = [float(value) if value != "n.d." else None for value in period["values"]]
+    return df
+
+
+def timed(fn, *args, repeat=1):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--periods", type=int, default=10000)
+    parser.add_argument("--series", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-legacy", action="store_true", help="only time the columnar parser")
+    args = parser.parse_args()
+
+    data = synthetic_payload(args.periods, args.series)
+    print(f"payload: {args.periods} periods x {args.series} series")
+
+    columnar = timed(payload_to_frame, data, repeat=args.repeat)
+    print(f"columnar   : {columnar:.3f} s")
+
+    if not args.skip_legacy:
+        legacy = timed(legacy_frame, data)
+        print(f"row-by-row : {legacy:.3f} s")
+        print(f"speedup    : {legacy / columnar:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
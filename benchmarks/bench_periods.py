@@ -0,0 +1,65 @@
+"""
+Benchmark: vectorized BCRP period-label parser vs. `pd.to_datetime(errors="coerce")`.
+
+Times both parsers on N labels of each BCRPData frequency, in both languages, and counts the labels
+each one leaves as NaT.
+
+Usage:
+    python -m benchmarks.bench_periods --labels 100000
+"""
+import argparse
+import time
+import warnings
+
+import pandas as pd
+
+from bcrpy._periods import parse_periods
+
+MONTHS = {
+    "ing": ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"],
+    "esp": ["Ene", "Feb", "Mar", "Abr", "May", "Jun", "Jul", "Ago", "Set", "Oct", "Nov", "Dic"],
+}
+
+
+def synthetic_labels(frequency, lang, n):
+    """`n` period labels as BCRPData formats them for `frequency` ('D', 'M', 'Q', 'Y') and `lang` (cycling over a century)."""
+    months = MONTHS[lang]
+    if frequency == "D":
+        days = pd.date_range("1930-01-01", "2029-12-31", freq="D")
+        return [f"{d.day:02d}.{months[d.month - 1]}.{d.year % 100:02d}" for d in days[[i % len(days) for i in range(n)]]]
+    if frequency == "M":
+        return [f"{months[i % 12]}.{1930 + (i // 12) % 100}" for i in range(n)]
+    if frequency == "Q":
+        prefix = "T" if lang == "esp" else "Q"
+        return [f"{prefix}{i % 4 + 1}.{(i // 4) % 100:02d}" for i in range(n)]
+    return [str(1930 + i % 100) for i in range(n)]
+
+
+def timed(fn, labels):
+    t0 = time.perf_counter()
+    result = fn(labels)
+    return time.perf_counter() - t0, int(pd.isna(result).sum())
+
+
+def legacy(labels):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        return pd.to_datetime(pd.Index(labels), errors="coerce")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--labels", type=int, default=100000)
+    args = parser.parse_args()
+
+    print(f"{'labels':<14}{'vectorized (s)':>16}{'NaT':>8}{'to_datetime (s)':>18}{'NaT':>8}{'speedup':>10}")
+    for frequency in ("D", "M", "Q", "Y"):
+        for lang in ("ing", "esp"):
+            labels = synthetic_labels(frequency, lang, args.labels)
+            fast, fast_nat = timed(parse_periods, labels)
+            slow, slow_nat = timed(legacy, labels)
+            print(f"{frequency} {lang} {labels[0]:<8}{fast:>16.3f}{fast_nat:>8}{slow:>18.3f}{slow_nat:>8}{slow / fast:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: filtered SQLite reads (`load_from_sqlite(codes=..., start=..., end=...)`) vs. loading the whole table.
+
+Stores --series monthly series over --months months in a long and a wide table, then times reading
+everything (and selecting afterwards, as before filter pushdown) against reading --select series over
+one year with the filters pushed down into SQL. Also reports how many frames a chunked full read yields.
+
+Usage:
+    python -m benchmarks.bench_sqlite_reads --series 2000 --months 360 --select 2
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from bcrpy.utils import load_from_sqlite, save_df_as_sql
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--series", type=int, default=2000, help="at most 1999 for the wide table (SQLite column limit)")
+    parser.add_argument("--months", type=int, default=360)
+    parser.add_argument("--select", type=int, default=2)
+    parser.add_argument("--chunksize", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    index = pd.date_range("1990-01-01", periods=args.months, freq="MS")
+    codes = [f"PN{i:05d}MM" for i in range(args.series)]
+    df = pd.DataFrame(rng.normal(size=(args.months, args.series)), index=index,
+                      columns=[f"Serie {i}, codigo no. {code}" for i, code in enumerate(codes)])
+    selected = codes[::max(1, args.series // args.select)][:args.select]
+    year = str(index[len(index) // 2].year)
+
+    print(f"{'layout':<8}{'full read (s)':>15}{'filtered (s)':>14}{'speedup':>9}{'chunks':>8}")
+    with tempfile.TemporaryDirectory() as folder:
+        for layout in ("long", "wide"):
+            if layout == "wide" and args.series > 1999:
+                print(f"{layout:<8}{'skipped: too many columns for SQLite':>44}")
+                continue
+            db = os.path.join(folder, f"{layout}.db")
+            save_df_as_sql(df, db, "time_series", layout=layout, codes=codes, verbose=False)
+            full, whole = best_of(lambda: load_from_sqlite(db, verbose=False), args.repeat)
+            filtered, part = best_of(lambda: load_from_sqlite(db, codes=selected, start=year, end=year, verbose=False),
+                                     args.repeat)
+            n_chunks = sum(1 for _ in load_from_sqlite(db, chunksize=args.chunksize))
+            assert whole.shape == df.shape and part.shape == (12, len(selected))
+            print(f"{layout:<8}{full:>15.3f}{filtered:>14.4f}{full / filtered:>8.0f}x{n_chunks:>8}")
+
+
+if __name__ == "__main__":
+    main()
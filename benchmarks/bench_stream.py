@@ -0,0 +1,55 @@
+"""
+Benchmark: peak memory and time of `response.json()` + parse vs. the streaming parser.
+
+The body is served as 64 KiB chunks, as `response.iter_content` would yield them. The buffered path
+must hold the whole body and its decoded JSON tree at once; the streaming path only holds one chunk
+and the output arrays.
+
+Usage:
+    python -m benchmarks.bench_stream --periods 20000 --series 100
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from benchmarks.bench_parse import synthetic_payload
+from bcrpy._parser import STREAM_CHUNK, parse_payload, parse_stream
+
+
+def measure(fn):
+    """Run `fn` once; return (seconds, peak traced bytes)."""
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--periods", type=int, default=20000)
+    parser.add_argument("--series", type=int, default=100)
+    args = parser.parse_args()
+
+    body = json.dumps(synthetic_payload(args.periods, args.series)).encode()
+    output = args.periods * args.series * 8
+    print(f"payload: {args.periods} periods x {args.series} series, body {len(body) / 2**20:.1f} MiB, "
+          f"output {output / 2**20:.1f} MiB")
+
+    def buffered():
+        content = bytes(body)  # response.content
+        parse_payload(json.loads(content))
+
+    def streamed():
+        parse_stream(body[i:i + STREAM_CHUNK] for i in range(0, len(body), STREAM_CHUNK))
+
+    for name, fn in (("json()    ", buffered), ("streaming ", streamed)):
+        elapsed, peak = measure(fn)
+        print(f"{name}: {elapsed:6.2f} s   peak {peak / 2**20:7.1f} MiB   ({peak / output:.1f}x output)")
+
+
+if __name__ == "__main__":
+    main()
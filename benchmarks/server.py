@@ -0,0 +1,160 @@
+"""
+Local stand-in for the BCRPData API, used by the benchmarks (and usable from tests).
+
+Serves `/estadisticas/series/api/<codes>/json/<start>/<end>/<lang>` with synthetic monthly series and
+`/estadisticas/series/metadata` with a matching metadata CSV, so bcrpy can run fully offline:
+
+    with StandInAPI(latency=0.05) as api:
+        bcrpy.set_transport(api.transport())
+        df = bcrpy.large_get(codes=api.codes[:300], start="2010-1", end="2020-12")
+
+Payload sizes follow the request (codes x months of the window); latency, jitter, missing values and
+HTTP errors are configurable.
+"""
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from bcrpy._transport import Transport
+
+API_PATH = "/estadisticas/series/api"
+METADATA_PATH = "/estadisticas/series/metadata"
+METADATA_COLUMNS = [
+    "Código de serie", "Categoría de serie", "Grupo de serie", "Nombre de serie", "Fuente", "Frecuencia",
+    "Fecha de creación", "Grupo de publicación", "Área que publica", "Fecha de actualización",
+    "Fecha de inicio", "Fecha de fin", "Memo", "Unnamed: 13",
+]
+
+
+def series_value(code, ordinal):
+    """Deterministic synthetic value of `code` at period `ordinal`."""
+    return (zlib.crc32(code.encode()) % 1000) + ordinal / 1000
+
+
+class StandInAPI:
+    def __init__(self, n_codes=5000, latency=0.0, error_rate=0.0, missing_every=0, error_status=503, jitter=0.0):
+        """
+        Parameters
+        ----------
+        n_codes : int
+            Number of series listed in the metadata (codes PN00000MM, PN00001MM, ...).
+        latency : float
+            Seconds slept before answering every request.
+        error_rate : float
+            Fraction of series requests answered with `error_status` (deterministic, every 1/error_rate-th request).
+        missing_every : int
+            If > 0, every n-th value is reported as "n.d.".
+        error_status : int
+            HTTP status of injected errors (503 by default; 429 or 500 are also retried by the transport).
+        jitter : float
+            Extra latency drawn uniformly from [0, jitter] seconds for every request.
+        """
+        self.codes = [f"PN{i:05d}MM" for i in range(n_codes)]
+        self.latency = latency
+        self.error_rate = error_rate
+        self.missing_every = missing_every
+        self.error_status = error_status
+        self.jitter = jitter
+        self.errors = 0
+        self.requests = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._server = None
+
+    # --- payloads ---
+
+    def payload(self, codes, start, end):
+        months = pd.period_range(start, end, freq="M")
+        periods = []
+        for i, month in enumerate(months):
+            values = []
+            for j, code in enumerate(codes):
+                if self.missing_every and (i + j) % self.missing_every == 0:
+                    values.append("n.d.")
+                else:
+                    values.append(f"{series_value(code, month.ordinal):.3f}")
+            periods.append({"name": month.strftime("%b.%Y"), "values": values})
+        return {
+            "config": {"title": "stand-in", "series": [{"name": f"Grupo {code} - Serie {code}", "dec": "3"} for code in codes]},
+            "periods": periods,
+        }
+
+    def metadata_csv(self):
+        rows = [
+            [code, "Categoria", f"Grupo {code}", f"Serie {code}", "BCRP", "Mensual", "2022-03-24", "Publicacion",
+             "Area", "2024-08-22", "Ene-1992", "Jul-2024", "", ""]
+            for code in self.codes
+        ]
+        return pd.DataFrame(rows, columns=METADATA_COLUMNS).to_csv(sep=";", index=False).encode("latin-1")
+
+    # --- server ---
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    @property
+    def api_root(self):
+        return self.url + API_PATH
+
+    @property
+    def metadata_url(self):
+        return self.url + METADATA_PATH
+
+    def transport(self, **kwargs):
+        """A Transport pointed at this server (install it with bcrpy.set_transport)."""
+        kwargs.setdefault("backoff", 0.01)
+        return Transport(api_root=self.api_root, metadata_url=self.metadata_url, **kwargs)
+
+    def __enter__(self):
+        api = self
+        metadata = self.metadata_csv()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if api.latency or api.jitter:
+                    time.sleep(api.latency + random.uniform(0, api.jitter))
+                with api._lock:
+                    api.requests += 1
+                    count = api.requests
+
+                if self.path.startswith(METADATA_PATH):
+                    return self.reply(200, metadata, "text/csv")
+                if not self.path.startswith(API_PATH + "/"):
+                    return self.reply(404, b"not found", "text/plain")
+                if api.error_rate and count % max(1, round(1 / api.error_rate)) == 0:
+                    with api._lock:
+                        api.errors += 1
+                    return self.reply(api.error_status, b"busy", "text/plain")
+
+                code_series, _format, start, end = self.path[len(API_PATH) + 1:].split("/")[:4]
+                body = json.dumps(api.payload(code_series.split("-"), start, end)).encode()
+                self.reply(200, body, "application/json")
+
+            def reply(self, status, body, content_type):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                with api._lock:
+                    api.bytes_sent += len(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
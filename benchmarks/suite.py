@@ -0,0 +1,243 @@
+"""
+Offline benchmark suite: bcrpy against the local stand-in BCRPData API (benchmarks/server.py).
+
+Measures GET latency and throughput, largeGET throughput and peak memory, parse time (whole-body and
+streaming), result-cache hit latency, metadata download and wordsearch latency, and largeGET under
+injected HTTP errors. Nothing touches the network or the user's caches: every run uses temporary
+cache folders and a server on 127.0.0.1.
+
+Results are printed as a table and, with --output, written as JSON (one record per metric, with its
+unit and whether lower or higher is better). With --baseline, metrics that regressed by more than
+--tolerance against a previous JSON file are reported and the exit status is 1.
+
+Usage:
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --quick --baseline results.json --tolerance 0.25
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import bcrpy
+from bcrpy._parser import arrays_to_frame, parse_payload, parse_stream
+from benchmarks.server import StandInAPI
+
+FORMAT_VERSION = 1
+
+
+def record(name, value, unit, better="lower"):
+    return {"name": name, "value": value, "unit": unit, "better": better}
+
+
+def timed(fn, repeat=1):
+    """Median wall time of `repeat` calls of `fn`, and the last result."""
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times), result
+
+
+@contextlib.contextmanager
+def sandbox():
+    """A Marco whose caches, store and metadata snapshot live in a temporary folder."""
+    with tempfile.TemporaryDirectory() as folder:
+        banco = bcrpy.Marco()
+        banco.cache = bcrpy.ResultCache(directory=folder)
+        banco.metadata_cache = bcrpy.MetadataCache(directory=folder)
+        banco.store = bcrpy.SeriesStore(db_name=f"{folder}/series_store.db")
+        yield banco
+
+
+def quiet(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+# --- scenarios ---
+
+def bench_metadata(banco, args):
+    elapsed, _ = timed(lambda: quiet(banco.get_metadata, filename=None, refresh=True))
+    build, _ = timed(lambda: banco.search_index)
+    keywords = ["serie pn00042mm", "grupo", "categoria bcrp"]
+    query, _ = timed(lambda: [quiet(banco.wordsearch, keyword, top_k=10) for keyword in keywords], repeat=args.repeat)
+    return [
+        record("metadata.download", elapsed, "s"),
+        record("wordsearch.index_build", build, "s"),
+        record("wordsearch.query", query / len(keywords) * 1000, "ms"),
+    ]
+
+
+def bench_get(banco, api, args):
+    codes = api.codes[:args.get_series]
+    latency, _ = timed(lambda: quiet(banco.GET, codes=codes, start=args.start, end=args.end, forget=True),
+                       repeat=args.repeat)
+    hit, _ = timed(lambda: quiet(banco.GET, codes=codes, start=args.start, end=args.end), repeat=args.repeat)
+    return [
+        record("get.latency", latency * 1000, "ms"),
+        record("get.throughput", len(codes) / latency, "series/s", "higher"),
+        record("cache.hit_latency", hit * 1000, "ms"),
+    ]
+
+
+def bench_parse(api, args):
+    payload = api.payload(api.codes[:args.parse_series], args.start, args.end)
+    body = json.dumps(payload).encode()
+    values = len(payload["periods"]) * args.parse_series
+    whole, _ = timed(lambda: arrays_to_frame(*parse_payload(json.loads(body))), repeat=args.repeat)
+    stream, _ = timed(lambda: arrays_to_frame(*parse_stream(body[i:i + 65536] for i in range(0, len(body), 65536))),
+                      repeat=args.repeat)
+    return [
+        record("parse.json", whole * 1000, "ms"),
+        record("parse.stream", stream * 1000, "ms"),
+        record("parse.throughput", values / whole, "values/s", "higher"),
+    ]
+
+
+def bench_large_get(banco, api, args):
+    codes = api.codes[:args.large_series]
+
+    def run():
+        return quiet(banco.largeGET, codes=codes, start=args.start, end=args.end, chunk_size=args.chunk_size,
+                     nucleos=args.workers, executor=args.executor, forget=True)
+
+    elapsed, df = timed(run)
+    assert df.shape[1] == len(codes), f"largeGET returned {df.shape[1]} of {len(codes)} series"
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return [
+        record("large_get.wall", elapsed, "s"),
+        record("large_get.throughput", len(codes) / elapsed, "series/s", "higher"),
+        record("large_get.peak_memory", peak / 2**20, "MiB"),
+    ]
+
+
+def bench_errors(args):
+    """largeGET with HTTP errors injected; chunks are small enough for about 4 errors per run."""
+    chunk_size = max(1, int(args.large_series * args.error_rate / 4))
+    with StandInAPI(n_codes=args.large_series, latency=args.latency, error_rate=args.error_rate) as api:
+        previous = bcrpy.set_transport(api.transport())
+        try:
+            with sandbox() as banco:
+                quiet(banco.get_metadata, filename=None)
+                elapsed, df = timed(lambda: quiet(banco.largeGET, codes=api.codes, start=args.start, end=args.end,
+                                                  chunk_size=chunk_size, nucleos=args.workers,
+                                                  executor=args.executor, forget=True))
+        finally:
+            bcrpy.set_transport(previous)
+    return [
+        record("errors.large_get_wall", elapsed, "s"),
+        record("errors.injected", api.errors, "responses", "info"),
+        record("errors.series_recovered", df.shape[1] / len(api.codes), "ratio", "higher"),
+    ]
+
+
+def run_suite(args):
+    results = []
+    with StandInAPI(n_codes=max(args.large_series, args.get_series, args.parse_series, args.metadata_codes),
+                    latency=args.latency, jitter=args.jitter, missing_every=args.missing_every) as api:
+        previous = bcrpy.set_transport(api.transport())
+        try:
+            with sandbox() as banco:
+                results += bench_metadata(banco, args)
+                results += bench_get(banco, api, args)
+                results += bench_parse(api, args)
+                results += bench_large_get(banco, api, args)
+        finally:
+            bcrpy.set_transport(previous)
+    if args.error_rate:
+        results += bench_errors(args)
+    return results
+
+
+# --- reporting ---
+
+def environment():
+    try:
+        from importlib.metadata import version
+        bcrpy_version = version("bcrpy")
+    except Exception:
+        bcrpy_version = None
+    return {
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "bcrpy": bcrpy_version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+
+def regressions(results, baseline, tolerance):
+    """Metrics worse than in `baseline` by more than `tolerance` (relative): list of (name, before, after)."""
+    before = {entry["name"]: entry for entry in baseline["results"]}
+    found = []
+    for entry in results:
+        old = before.get(entry["name"])
+        if old is None or entry["better"] not in ("lower", "higher") or not old["value"]:
+            continue
+        change = (entry["value"] - old["value"]) / abs(old["value"])
+        if (change if entry["better"] == "lower" else -change) > tolerance:
+            found.append((entry["name"], old["value"], entry["value"]))
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="small sizes, for CI smoke runs")
+    parser.add_argument("--output", help="write the JSON results to this file ('-' for stdout)")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="relative change counted as a regression")
+    parser.add_argument("--latency", type=float, default=0.01, help="server latency per request, in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency per request, in seconds")
+    parser.add_argument("--missing-every", type=int, default=7, help="every n-th value is 'n.d.'")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="share of requests answered with HTTP 503")
+    parser.add_argument("--start", default="2000-1")
+    parser.add_argument("--end", default="2020-12")
+    parser.add_argument("--get-series", type=int, default=50)
+    parser.add_argument("--parse-series", type=int, default=100)
+    parser.add_argument("--large-series", type=int, default=1000)
+    parser.add_argument("--metadata-codes", type=int, default=5000)
+    parser.add_argument("--chunk-size", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--executor", default="thread", choices=["serial", "thread", "process", "async"])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.get_series, args.parse_series, args.large_series, args.metadata_codes = 5, 20, 60, 200
+        args.chunk_size, args.repeat, args.latency = 20, 2, min(args.latency, 0.002)
+
+    results = run_suite(args)
+    report = {"version": FORMAT_VERSION, **environment(), "config": vars(args), "results": results}
+
+    print(f"{'metric':<30}{'value':>14}  unit", file=sys.stderr if args.output == "-" else sys.stdout)
+    for entry in results:
+        print(f"{entry['name']:<30}{entry['value']:>14.4g}  {entry['unit']}", file=sys.stderr if args.output == "-" else sys.stdout)
+
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=2)
+    elif args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            found = regressions(results, json.load(f), args.tolerance)
+        for name, before, after in found:
+            print(f"REGRESSION {name}: {before:.4g} -> {after:.4g}", file=sys.stderr)
+        if found:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
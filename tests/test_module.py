@@ -1,7 +1,8 @@
 import bcrpy
 import pytest
 import pandas as pd
-import os, json
+import os, json, shutil
+import requests
 from bcrpy import Marco, scan_columns, get, large_get
 from unittest.mock import patch, MagicMock
 
@@ -20,6 +21,7 @@ def cleanup_cache():
     ]:
         if os.path.exists(fname):
             os.remove(fname)
+    shutil.rmtree(banco.cache.directory, ignore_errors=True)
 
 @pytest.fixture(autouse=True)
 def clear_cache_files():
@@ -34,8 +36,7 @@ def test_GET_dataframe_storage():
     df = banco.GET(codes=["PN01288PM", "PN01289PM"], start="2019-1", end="2021-1", storage='df', forget=True)
     assert isinstance(df, pd.DataFrame)
     assert not df.empty
-    assert os.path.exists("cache.bcrfile")
-    assert os.path.exists("cache.bcrfile.meta")
+    assert len(banco.cache) == 1
 
 
 def test_GET_sql_storage():
@@ -45,8 +46,7 @@ def test_GET_sql_storage():
     df_sql = banco.GET(storage='sql', forget=True)
     assert isinstance(df_sql, pd.DataFrame)
     assert not df_sql.empty
-    assert os.path.exists("cache.db")
-    assert os.path.exists("cache.db.meta")
+    assert len(banco.cache) == 1
 
 
 def test_largeGET_dataframe_storage():
@@ -55,8 +55,7 @@ def test_largeGET_dataframe_storage():
     df = banco.largeGET(codes=["PN01288PM", "PN01289PM", "PN00015MM"], chunk_size=2, storage='df', forget=True)
     assert isinstance(df, pd.DataFrame)
     assert not df.empty
-    assert os.path.exists("large_cache.bcrfile")
-    assert os.path.exists("large_cache.bcrfile.meta")
+    assert any(entry["params"]["kind"] == "largeGET" for entry in banco.cache.entries().values())
 
 
 def test_largeGET_sql_storage():
@@ -65,12 +64,11 @@ def test_largeGET_sql_storage():
     df_sql = banco.largeGET(codes=["PN01288PM", "PN01289PM", "PN00015MM"], chunk_size=2, storage='sql', forget=True)
     assert isinstance(df_sql, pd.DataFrame)
     assert not df_sql.empty
-    assert os.path.exists("large_cache.db")
-    assert os.path.exists("large_cache.db.meta")
+    assert any(entry["params"]["storage"] == "sql" for entry in banco.cache.entries().values())
 
 
 # --- Mocked cache reuse test ---
-@patch("bcrpy._fetcher.requests.get")
+@patch("bcrpy._transport.Transport.get")
 def test_GET_cache_reuse_and_warning(mock_get, capfd):
     # Fake API response
     mock_response = MagicMock()
@@ -98,19 +96,26 @@ def test_GET_cache_reuse_and_warning(mock_get, capfd):
     assert "[CACHE] Using cached data" in out
 
 
-def test_cache_mismatch_warning(capfd):
-    # Create fake cache + .meta
-    pd.DataFrame({"X": [1, 2]}).to_pickle("cache.bcrfile")
-    with open("cache.bcrfile.meta", "w", encoding="utf-8") as f:
-        json.dump({"codes": ["FAKECODE"], "start": "2000-1", "end": "2001-1"}, f)
+@patch.object(banco, "order_columns")
+@patch("bcrpy._transport.Transport.get")
+def test_cache_is_keyed_by_request(mock_get, _order_columns):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "config": {"series": [{"name": "Serie A"}]},
+        "periods": [{"name": "2019-01", "values": ["1.0"]}],
+    }
+    mock_get.return_value = mock_response
 
-    banco.codes = ["PN01288PM"]
-    banco.start = "2019-1"
-    banco.end = "2021-1"
+    banco.GET(codes=["PN01288PM"], start="2019-1", end="2021-1", order=False)
+    banco.GET(codes=["PN01289PM"], start="2019-1", end="2021-1", order=False)
+    assert mock_get.call_count == 2
+    assert len(banco.cache) == 2
 
-    _ = banco.GET(forget=False, storage='df')
-    out, _ = capfd.readouterr()
-    assert "⚠️ Warning: cache parameters differ" in out
+    hits = banco.cache.stats["hits"]
+    banco.GET(codes=["PN01288PM"], start="2019-1", end="2021-1", order=False)
+    assert mock_get.call_count == 2
+    assert banco.cache.stats["hits"] == hits + 1
 
 
 def test_queries():
@@ -146,7 +151,7 @@ def test_GET_default():
 
 
 # --- GET order tests ---
-@patch("bcrpy._fetcher.requests.get")
+@patch("bcrpy._transport.Transport.get")
 def test_GETorden(mock_get):
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -232,7 +237,7 @@ def test_scan_no_matches(sample_dataframe):
 
 
 # --- Wrapper tests ---
-@patch("bcrpy._fetcher.requests.get")
+@patch("bcrpy._transport.Transport.get")
 def test_get_wrapper(mock_get):
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -260,3 +265,1280 @@ def test_get_wrapper_integration():
 def test_large_get_wrapper():
     df = large_get(codes=["PN01288PM", "PN01289PM"], start="2019-01", end="2020-01", chunk_size=2, forget=True)
     assert not df.empty
+
+
+# --- Columnar parser tests ---
+def test_payload_to_frame_columnar():
+    from bcrpy._parser import payload_to_frame
+
+    data = {
+        "config": {"series": [{"name": "Serie A"}, {"name": "Serie B"}]},
+        "periods": [
+            {"name": "Ene.2019", "values": ["1.5", "n.d."]},
+            {"name": "Feb.2019", "values": ["3.0", "4.25"]},
+        ],
+    }
+    df = payload_to_frame(data)
+    assert list(df.columns) == ["Serie A", "Serie B"]
+    assert list(df.index) == ["Ene.2019", "Feb.2019"]
+    assert df.dtypes.tolist() == ["float64", "float64"]
+    assert pd.isna(df.loc["Ene.2019", "Serie B"])
+    assert df.loc["Feb.2019", "Serie B"] == 4.25
+
+
+def test_payload_to_frame_malformed():
+    from bcrpy._parser import payload_to_frame
+
+    data = {"config": {"series": [{"name": "A"}, {"name": "B"}]}, "periods": [{"name": "2019", "values": ["1"]}]}
+    with pytest.raises(ValueError):
+        payload_to_frame(data)
+
+
+def test_save_to_sqlite_uses_parser():
+    data = {
+        "config": {"series": [{"name": "Serie A"}]},
+        "periods": [{"name": "2019-01", "values": ["n.d."]}, {"name": "2019-02", "values": ["2.0"]}],
+    }
+    banco.save_to_sqlite(data, db_name="cache.db")
+    df = bcrpy.load_from_sqlite("cache.db")
+    assert df["Serie A"].isna().sum() == 1
+    assert df["Serie A"].iloc[1] == 2.0
+
+
+# --- Bulk SQLite writer tests ---
+def test_save_to_sqlite_long_layout():
+    import sqlite3
+
+    data = {
+        "config": {"series": [{"name": "Serie A"}, {"name": "Serie B"}]},
+        "periods": [{"name": "2019-01", "values": ["1.0", "n.d."]}, {"name": "2019-02", "values": ["3.0", "4.0"]}],
+    }
+    banco.codes = ["CODEA", "CODEB"]
+    with patch.object(banco, "series_codes", return_value=["CODEA", "CODEB"]):
+        banco.save_to_sqlite(data, db_name="cache.db", layout="long")
+
+    with sqlite3.connect("cache.db") as conn:
+        rows = conn.execute("SELECT code, date, value FROM time_series ORDER BY code, date").fetchall()
+        journal = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    assert rows == [("CODEA", "2019-01", 1.0), ("CODEA", "2019-02", 3.0), ("CODEB", "2019-02", 4.0)]
+    assert journal == "wal"
+
+    df = bcrpy.load_from_sqlite("cache.db")
+    assert list(df.columns) == ["CODEA", "CODEB"]
+    assert pd.isna(df["CODEB"].iloc[0])
+
+
+def test_GET_long_sql_names_only_valid_codes(tmp_path):
+    banco_local = Marco()
+    banco_local.cache = bcrpy.ResultCache(directory=str(tmp_path))
+    banco_local.metadata = pd.DataFrame({"Código de serie": ["PN00001MM", "PN00002MM"],
+                                         "Grupo de serie": ["Grupo", "Grupo"], "Nombre de serie": ["Uno", "Dos"]})
+    with patch("bcrpy._transport.Transport.get", side_effect=fake_bcrp_get) as mock_get:
+        df = banco_local.GET(codes=["PN00001MM", "XX99999XX", "PN00002MM"], start="2019-1", end="2019-2",
+                             check_codes=True, storage="sql", sql_layout="long", forget=True)
+    assert "PN00001MM-PN00002MM/" in mock_get.call_args[0][0]
+    assert list(df.columns) == ["PN00001MM", "PN00002MM"] and df.shape == (2, 2)
+
+
+def test_save_df_as_sql_wide_and_long():
+    import numpy as np
+
+    index = pd.date_range("2000-01-01", periods=24, freq="MS")
+    wide = pd.DataFrame(np.arange(24 * 1200, dtype=float).reshape(24, 1200), index=index,
+                        columns=[f"S{j}" for j in range(1200)])
+
+    bcrpy.save_df_as_sql(wide, "cache.db", "time_series", layout="long")
+    df = bcrpy.load_from_sqlite("cache.db")
+    assert df.shape == (24, 1200)
+    assert df.loc["2000-02-01", "S3"] == wide.loc["2000-02-01", "S3"]
+
+    bcrpy.save_df_as_sql(wide.iloc[:, :3], "cache.db", "time_series")
+    df = bcrpy.load_from_sqlite("cache.db")
+    assert list(df.columns) == ["S0", "S1", "S2"]
+    assert isinstance(df.index, pd.DatetimeIndex)
+
+
+# --- Result cache tests ---
+def _write_entry(cache, name, nbytes):
+    key = cache.key(name=name)
+    with open(cache.path(key), "wb") as f:
+        f.write(b"x" * nbytes)
+    cache.store(key, "df", {"name": name})
+    return key
+
+
+def test_result_cache_lru_eviction(tmp_path):
+    cache = bcrpy.ResultCache(directory=str(tmp_path), max_bytes=250, max_entries=10)
+    first = _write_entry(cache, "a", 100)
+    second = _write_entry(cache, "b", 100)
+    assert cache.lookup(first) is not None  # `first` becomes the most recently used
+
+    _write_entry(cache, "c", 100)
+    assert cache.lookup(second) is None
+    assert cache.lookup(first) is not None
+    assert cache.stats["evictions"] == 1
+    assert cache.size == 200
+    assert not os.path.exists(cache.path(second))
+
+
+def test_result_cache_hits_do_not_rewrite_manifest(tmp_path):
+    cache = bcrpy.ResultCache(directory=str(tmp_path), max_entries=2)
+    first, second = _write_entry(cache, "a", 10), _write_entry(cache, "b", 10)
+    os.utime(cache.path(first), (1, 1))  # both entries look old...
+    os.utime(cache.path(second), (1, 1))
+    manifest_before = os.stat(cache.manifest_path).st_mtime_ns
+    assert cache.lookup(first) is not None  # ...until `first` is hit
+    assert os.stat(cache.manifest_path).st_mtime_ns == manifest_before
+
+    _write_entry(cache, "c", 10)
+    assert cache.lookup(second) is None
+    assert cache.lookup(first) is not None
+
+
+def test_result_cache_max_entries_and_ttl(tmp_path):
+    cache = bcrpy.ResultCache(directory=str(tmp_path), max_entries=2)
+    keys = [_write_entry(cache, name, 10) for name in "abc"]
+    assert len(cache) == 2
+    assert cache.lookup(keys[0]) is None
+
+    cache.ttl = 0
+    assert cache.lookup(keys[2]) is None
+    assert cache.stats["misses"] == 2
+
+
+
+def test_result_cache_eviction_skips_files_in_use(tmp_path):
+    cache = bcrpy.ResultCache(directory=str(tmp_path), max_entries=1)
+    first = _write_entry(cache, "a", 10)
+    in_use = cache.path(first)
+    remove = os.remove
+
+    def locked_remove(path):  # Windows refuses to delete a file another process has open
+        if path == in_use:
+            raise PermissionError(13, "The process cannot access the file", path)
+        remove(path)
+
+    with patch("os.remove", side_effect=locked_remove):
+        _write_entry(cache, "b", 10)
+    assert os.path.exists(in_use) and first not in cache.entries()
+
+    _write_entry(cache, "c", 10)  # the next eviction removes the file once it is released
+    assert not os.path.exists(in_use) and len(cache) == 1
+    assert sorted(os.listdir(tmp_path)) == sorted(["index.json", "index.lock", os.path.basename(cache.path(cache.key(name="c")))])
+
+# --- Incremental series store tests ---
+def fake_bcrp_get(url, *args, **kwargs):
+    """Stand-in for the BCRPData API: monthly series whose value encodes (code, month)."""
+    code_series, _format, start, end, _lang = url.split("/api/")[1].split("/")
+    codes = code_series.split("-")
+    months = pd.period_range(start, end, freq="M")
+    payload = {
+        "config": {"series": [{"name": f"Serie {code}"} for code in codes]},
+        "periods": [
+            {"name": month.strftime("%b.%Y"), "values": [f"{int(code[2:7]) + month.ordinal / 1000:.3f}" for code in codes]}
+            for month in months
+        ],
+    }
+    body = json.dumps(payload).encode()
+    response = MagicMock()
+    response.status_code = 200
+    response.json.return_value = payload
+    response.iter_content.side_effect = lambda size=1: (body[i:i + 50] for i in range(0, len(body), 50))
+    return response
+
+
+@patch.object(banco, "get_metadata")
+@patch("bcrpy._transport.Transport.get", side_effect=fake_bcrp_get)
+def test_incremental_store_fetches_only_missing_ranges(mock_get, _get_metadata):
+    df = banco.GET(codes=["PN00001MM", "PN00002MM"], start="2019-1", end="2019-12", incremental=True)
+    assert df.shape == (12, 2)
+    assert mock_get.call_count == 1
+
+    # Extending the window only requests the new months (plus the last stored one, which may be revised),
+    # for both codes in one call
+    df = banco.GET(codes=["PN00001MM", "PN00002MM"], start="2019-1", end="2020-3", incremental=True)
+    assert df.shape == (15, 2)
+    assert mock_get.call_count == 2
+    assert "/2019-12/2020-3/" in mock_get.call_args[0][0]
+    assert df.loc["2020-02-01", "Serie PN00002MM"] == pytest.approx(2 + pd.Period("2020-02", "M").ordinal / 1000)
+
+    # Subset requests (fewer codes, narrower dates) are served from the store without network access
+    df = banco.GET(codes=["PN00002MM"], start="2019-6", end="2019-8", incremental=True)
+    assert mock_get.call_count == 2
+    assert list(df.columns) == ["Serie PN00002MM"]
+    assert len(df) == 3
+
+    # A new code needs the full window; the trailing month of the stored code rides along in the same call
+    banco.GET(codes=["PN00001MM", "PN00003MM"], start="2019-1", end="2020-3", incremental=True)
+    assert mock_get.call_count == 3
+    assert "/PN00003MM-PN00001MM/json/2019-1/2020-3/" in mock_get.call_args[0][0]
+
+
+def test_store_interval_helpers():
+    from bcrpy._store import merge_intervals, subtract_intervals
+
+    ts = pd.Timestamp
+    covered = merge_intervals([(ts("2019-01-01"), ts("2019-03-31")), (ts("2019-04-01"), ts("2019-06-30")),
+                               (ts("2019-09-01"), ts("2019-09-30"))])
+    assert covered == [(ts("2019-01-01"), ts("2019-06-30")), (ts("2019-09-01"), ts("2019-09-30"))]
+    gaps = subtract_intervals(ts("2018-12-01"), ts("2019-12-31"), covered)
+    assert gaps == [(ts("2018-12-01"), ts("2018-12-31")), (ts("2019-07-01"), ts("2019-08-31")),
+                    (ts("2019-10-01"), ts("2019-12-31"))]
+
+
+# --- Transport tests ---
+@pytest.fixture
+def local_server():
+    """Local HTTP/1.1 server answering 503 twice, then 200; records request headers and client ports."""
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            seen.append((self.client_address[1], dict(self.headers)))
+            status, body = (503, b"busy") if len(seen) <= 2 else (200, b'{"ok": true}')
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", seen
+    server.shutdown()
+
+
+def test_transport_retries_and_reuses_connections(local_server):
+    url, seen = local_server
+    transport = bcrpy.Transport(api_root=url, backoff=0)
+
+    response = transport.get(f"{url}/x")
+    assert response.status_code == 200
+    assert len(seen) == 3
+    assert "gzip" in seen[0][1]["Accept-Encoding"]
+
+    transport.get(f"{url}/y")
+    assert len({port for port, _ in seen}) == 1  # one keep-alive connection for every request
+    transport.close()
+
+
+def test_transport_gives_up_after_retries(local_server):
+    url, seen = local_server
+    transport = bcrpy.Transport(api_root=url, retries=1, backoff=0)
+    assert transport.get(f"{url}/x").status_code == 503
+    assert len(seen) == 2
+
+
+def test_set_transport_routes_requests(local_server):
+    url, _ = local_server
+    previous = bcrpy.set_transport(bcrpy.Transport(api_root=url, backoff=0))
+    try:
+        assert bcrpy.get_transport().series_url("PN01288PM", "json", "2019-1", "2019-2", "ing").startswith(url)
+    finally:
+        bcrpy.set_transport(previous)
+
+
+# --- Async engine tests ---
+def test_alargeGET_runs_chunks_concurrently():
+    import asyncio
+    import threading
+    import time
+
+    in_flight = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    def slow_get(url, *args, **kwargs):
+        with lock:
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        time.sleep(0.05)
+        with lock:
+            in_flight["now"] -= 1
+        return fake_bcrp_get(url)
+
+    codes = [f"PN{i:05d}MM" for i in range(1, 41)]
+    with patch("bcrpy._transport.Transport.get", side_effect=slow_get), \
+         patch.object(banco, "get_metadata"), \
+         patch.object(banco, "reorder_frame", side_effect=lambda df, chunk: df):
+        df = asyncio.run(banco.alargeGET(codes=codes, start="2019-1", end="2019-6", chunk_size=2, concurrency=8))
+
+    assert df.shape == (6, 40)
+    assert df.columns[-1].endswith("codigo no. PN00040MM")
+    assert 1 < in_flight["max"] <= 8
+    assert banco.codes == codes
+
+
+def test_afetch_chunks_without_controller():
+    import asyncio
+    import contextlib
+
+    class SyncOnlyNullContext(contextlib.AbstractContextManager):  # contextlib.nullcontext before Python 3.10
+        def __exit__(self, *exc):
+            return None
+
+    requests_ = [banco.chunk_request(["PN00001MM", "PN00002MM"], forget=True),
+                 banco.chunk_request(["PN00003MM"], forget=True)]
+    with patch("bcrpy._transport.Transport.get", side_effect=fake_bcrp_get), \
+         patch("contextlib.nullcontext", SyncOnlyNullContext), \
+         patch.object(banco, "reorder_frame", side_effect=lambda df, chunk: df):
+        chunks = asyncio.run(banco.afetch_chunks(requests_, concurrency=2))
+    assert [chunk.shape[1] for chunk in chunks] == [2, 1]
+
+
+def test_async_wrappers_are_coroutines():
+    import inspect
+    assert inspect.iscoroutinefunction(bcrpy.aget)
+    assert inspect.iscoroutinefunction(bcrpy.alarge_get)
+
+
+# --- largeGET executor tests ---
+@pytest.mark.parametrize("executor", ["serial", "thread", "async"])
+def test_largeGET_executors(executor):
+    codes = [f"PN{i:05d}MM" for i in range(1, 12)]
+    with patch("bcrpy._transport.Transport.get", side_effect=fake_bcrp_get), \
+         patch.object(banco, "get_metadata"), \
+         patch.object(banco, "reorder_frame", side_effect=lambda df, chunk: df):
+        df = banco.largeGET(codes=codes, start="2019-1", end="2019-3", chunk_size=3, nucleos=4,
+                            executor=executor, forget=True)
+
+    assert df.shape == (3, 11)
+    assert [col.split(", codigo no. ")[-1] for col in df.columns] == codes
+    assert df.iloc[0, 4] == pytest.approx(5 + pd.Period("2019-01", "M").ordinal / 1000)
+
+
+def test_chunk_request_is_immutable():
+    banco.codes = ["PN01288PM"]
+    request = banco.chunk_request(["PN00001MM", "PN00002MM"])
+    assert request.codes == ("PN00001MM", "PN00002MM")
+    with pytest.raises(AttributeError):
+        request.start = "2000-1"
+    with patch("bcrpy._transport.Transport.get", side_effect=fake_bcrp_get), \
+         patch.object(banco, "reorder_frame", side_effect=lambda df, chunk: df):
+        banco.fetch_chunk(request)
+    assert banco.codes == ["PN01288PM"]
+
+
+def test_largeGET_unknown_executor():
+    with pytest.raises(ValueError):
+        banco.largeGET(codes=["PN00001MM"], executor="gpu")
+    with pytest.raises(ValueError):
+        banco.largeGET(codes=["PN00001MM"], executor="process", nucleos="auto")
+
+
+# --- Metadata search index tests ---
+@pytest.fixture
+def small_metadata():
+    return pd.DataFrame({
+        "Código de serie": ["PN01270PM", "PN01288PM", "PN38705PM", "PD39793AM"],
+        "Categoría de serie": ["Inflación", "Tipo de cambio", "Economía", "Producción"],
+        "Nombre de serie": ["Índice de Precios Lima Metropolitana", "Tipo de cambio venta", "PBI economía global", "Chicles y caramelos"],
+    })
+
+
+def test_wordsearch_index_folds_accents_and_ranks(small_metadata):
+    banco_local = Marco()
+    banco_local.metadata = small_metadata
+    df = banco_local.wordsearch("indice precios", top_k=5)
+    assert df.iloc[:, 0].tolist() == ["PN01270PM"]
+    assert banco_local.wordsearch("economia").iloc[:, 0].tolist() == ["PN38705PM"]
+    assert banco_local.wordsearch("chicle").iloc[:, 0].tolist() == ["PD39793AM"]
+    assert banco_local.wordsearch("economia", columnas=[0]).empty
+    assert len(banco_local.wordsearch("cambio economia", match="any")) == 2
+
+
+@pytest.mark.parametrize("cutoff", [0.5, 0.65, 0.8])
+def test_search_index_matches_close_matches_scan(cutoff):
+    from difflib import get_close_matches
+    from bcrpy._search import SearchIndex
+
+    metadata = pd.DataFrame({
+        "Código de serie": ["pn00001mm", "pn00002mm", "pn00003mm", "pn00004mm", "pn00005mm"],
+        "Nombre de serie": ["pib real", "tasa de interes interbancaria", "indice de precios al consumidor",
+                            "tipo de cambio venta", "exportaciones tradicionales de oro"],
+    })
+    index = SearchIndex(metadata)
+    for keyword in ["pbi", "tsaa", "rael", "ro", "precois", "inflacoin", "cmabio", "interbancaira",
+                    "exportacoines", "tardicionales", "consumdior", "pn00003nm"]:
+        expected = [row for row in range(len(metadata)) if any(
+            get_close_matches(keyword, [word], n=1, cutoff=cutoff) for cell in metadata.iloc[row] for word in cell.split())]
+        rows, _ = index.search(keyword, cutoff=cutoff)
+        assert sorted(rows) == expected, keyword
+
+
+def test_search_index_rebuilt_and_persisted(small_metadata, tmp_path):
+    banco_local = Marco()
+    banco_local.metadata = small_metadata
+    path = str(tmp_path / "search.idx")
+    index = banco_local.build_search_index(path)
+    assert os.path.exists(path)
+    assert bcrpy._search.SearchIndex.load(path, small_metadata).vocabulary == index.vocabulary
+
+    banco_local.metadata = small_metadata.iloc[:2]  # new metadata invalidates the index
+    assert banco_local.search_index is not index
+    assert banco_local.wordsearch("chicles").empty
+    assert bcrpy._search.SearchIndex.load(path, banco_local.metadata) is None
+
+
+# --- Code index tests ---
+def test_code_index_lookups(small_metadata):
+    banco_local = Marco()
+    banco_local.metadata = small_metadata.assign(**{"Grupo de serie": "Grupo"})
+    assert banco_local.query_dict("PN01288PM")["Nombre de serie"] == "Tipo de cambio venta"
+    with pytest.raises(KeyError):
+        banco_local.query_dict("XX00000XX")
+
+    many = banco_local.query_many(["PD39793AM", "XX00000XX", "PN01270PM"])
+    assert many.iloc[:, 0].tolist() == ["PD39793AM", "PN01270PM"]
+    assert banco_local.series_names(["PN01288PM"]) == ["Grupo - Tipo de cambio venta"]
+
+    banco_local.codes = ["PN01288PM", "XX00000XX"]
+    assert banco_local.check_metadata_codes() == ["PN01288PM"]
+
+    banco_local.codes = ["PD39793AM", "PN01270PM"]
+    banco_local.refine_metadata()
+    assert banco_local.metadata.iloc[:, 0].tolist() == ["PD39793AM", "PN01270PM"]
+    assert banco_local.code_positions(["PN01270PM", "PN01288PM"]).tolist() == [1, -1]  # index follows new metadata
+
+
+# --- Metadata snapshot cache tests ---
+def metadata_response(status_code=200, etag='"v1"'):
+    rows = "\n".join(f"PN{i:05d}MM;Cat;Grupo {i % 3};Serie {i};BCRP;Mensual" for i in range(20))
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = {"ETag": etag, "Last-Modified": "Mon, 01 Sep 2025 00:00:00 GMT"}
+    response.content = ("Código de serie;Categoría de serie;Grupo de serie;Nombre de serie;Fuente;Frecuencia\n" + rows).encode("latin-1")
+    return response
+
+
+@patch("bcrpy._transport.Transport.get")
+def test_metadata_snapshot_cache_and_revalidation(mock_get, tmp_path):
+    mock_get.return_value = metadata_response()
+    banco_local = Marco()
+    banco_local.metadata_cache = bcrpy.MetadataCache(directory=str(tmp_path), ttl=3600)
+    banco_local.get_metadata(filename=None)
+    assert banco_local.metadata.shape == (20, 6)
+    assert banco_local.metadata["Frecuencia"].dtype == "category"
+
+    # fresh snapshot: no request at all
+    banco_local.metadata = pd.DataFrame()
+    banco_local.get_metadata(filename=None)
+    assert mock_get.call_count == 1
+    assert banco_local.query_dict("PN00003MM")["Nombre de serie"] == "Serie 3"
+
+    # expired snapshot: conditional request, 304 keeps the snapshot
+    banco_local.metadata_cache.ttl = 0
+    mock_get.return_value = metadata_response(status_code=304)
+    banco_local.get_metadata(filename=None)
+    assert mock_get.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+    assert banco_local.metadata.shape == (20, 6)
+
+
+def test_metadata_snapshot_concurrent_stores(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+    cache = bcrpy.MetadataCache(directory=str(tmp_path))
+    metadata = pd.DataFrame({"Código de serie": [f"PN{i:05d}MM" for i in range(200)], "Frecuencia": ["Mensual"] * 200})
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda etag: cache.store(metadata, etag=etag), [f'"v{i}"' for i in range(32)]))
+    assert cache.load().shape == (200, 2)
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+@patch("bcrpy._transport.Transport.get", side_effect=requests.ConnectionError("offline"))
+def test_metadata_falls_back_to_bundled_snapshot(_mock_get, tmp_path):
+    banco_local = Marco()
+    banco_local.metadata_cache = bcrpy.MetadataCache(directory=str(tmp_path))
+    banco_local.get_metadata(filename=None)
+    assert banco_local.metadata.shape[0] > 10000
+    assert banco_local.metadata.columns[0] == "Código de serie"
+
+
+# --- Streaming parser tests ---
+def test_parse_stream_matches_parse_payload():
+    import numpy as np
+    from bcrpy._parser import parse_payload, parse_stream
+
+    data = {
+        "config": {"title": "Índices", "series": [{"name": "Serie Á"}, {"name": "Serie B"}]},
+        "periods": [{"name": f"{day:02d}.Ene.19", "values": [f"{day * 1.25}", "n.d."]} for day in range(1, 31)],
+    }
+    body = json.dumps(data, ensure_ascii=False, indent=1).encode()
+    for size in (1, 7, len(body)):
+        header, labels, values = parse_stream(body[i:i + size] for i in range(0, len(body), size))
+        expected = parse_payload(data)
+        assert header == expected[0] and labels == expected[1]
+        assert np.array_equal(values, expected[2], equal_nan=True)
+
+    with pytest.raises(ValueError):
+        parse_stream([body[:-10]])
+    bad = json.dumps({"config": {"series": [{"name": "A"}]}, "periods": [{"name": "x", "values": ["1", "2"]}]}).encode()
+    with pytest.raises(ValueError):
+        parse_stream([bad])
+
+
+@pytest.mark.parametrize("executor", ["serial", "async"])
+def test_largeGET_stream_mode(executor):
+    codes = [f"PN{i:05d}MM" for i in range(1, 6)]
+    banco.stream = True
+    try:
+        with patch("bcrpy._transport.Transport.get", side_effect=fake_bcrp_get) as mock_get, \
+             patch.object(banco, "get_metadata"), \
+             patch.object(banco, "reorder_frame", side_effect=lambda df, chunk: df):
+            df = banco.largeGET(codes=codes, start="2019-1", end="2019-6", chunk_size=2, executor=executor, forget=True)
+        assert all(call.kwargs["stream"] for call in mock_get.call_args_list)
+    finally:
+        banco.stream = False
+    assert df.shape == (6, 5)
+    assert df.iloc[5, 2] == pytest.approx(3 + pd.Period("2019-06", "M").ordinal / 1000)
+
+
+# --- Compact output mode tests ---
+def test_to_output_modes():
+    from bcrpy._frames import to_output
+
+    dates = pd.date_range("2020-01-01", periods=4, freq="MS")
+    wide = pd.DataFrame({"A": [1.0, None, 3.0, None], "B": [None, None, 2.5, None]}, index=dates)
+    assert to_output(wide, dtype="float32").dtypes.tolist() == ["float32", "float32"]
+    sparse = to_output(wide, "sparse")
+    assert isinstance(sparse.dtypes["A"], pd.SparseDtype) and sparse["B"].sparse.npoints == 1
+    long = to_output(wide, "long", codes=["PN1", "PN2"])
+    assert long["code"].tolist() == ["PN1", "PN1", "PN2"]
+    assert long["date"].tolist() == [dates[0], dates[2], dates[2]]
+    assert long["value"].tolist() == [1.0, 3.0, 2.5]
+    with pytest.raises(ValueError):
+        to_output(wide, "tall")
+
+
+@pytest.mark.parametrize("output,dtype", [("long", "float32"), ("sparse", "float64")])
+def test_largeGET_compact_output(output, dtype, capfd):
+    codes = [f"PN{i:05d}MM" for i in range(1, 6)]
+    with patch("bcrpy._transport.Transport.get", side_effect=fake_bcrp_get), \
+         patch.object(banco, "get_metadata"), \
+         patch.object(banco, "reorder_frame", side_effect=lambda df, chunk: df):
+        df = banco.largeGET(codes=codes, start="2019-1", end="2019-4", chunk_size=2, executor="serial",
+                            forget=True, output=output, dtype=dtype)
+    assert "[MEMORIA]" in capfd.readouterr().out
+    if output == "long":
+        assert list(df.columns) == ["code", "date", "value"] and len(df) == 20
+        assert df["value"].dtype == "float32"
+        assert df["code"].cat.categories.tolist() == codes
+    else:
+        assert df.shape == (4, 5) and all(isinstance(t, pd.SparseDtype) for t in df.dtypes)
+
+
+# --- Period label parser tests ---
+def test_parse_periods_all_frequencies():
+    from bcrpy._periods import parse_periods, label_frequency
+
+    labels = ["Abr.2022", "Apr.2022", "Set.2021", "T1.22", "Q4.1999", "01.Ene.22", "31.Dic.2021", "2022", "2019-01"]
+    expected = ["2022-04-01", "2022-04-01", "2021-09-01", "2022-01-01", "1999-10-01", "2022-01-01", "2021-12-31", "2022-01-01", "2019-01-01"]
+    assert parse_periods(labels).tolist() == pd.to_datetime(expected).tolist()
+    assert parse_periods(["29.Feb.21", "T5.22", "Xyz.2022", "garbage"]).isna().all()
+
+    quarters = parse_periods(["T1.22", "T2.22"], kind="period")
+    assert isinstance(quarters, pd.PeriodIndex) and quarters.freqstr.startswith("Q")
+    assert label_frequency(["01.Ago.23", "02.Ago.23"]) == "D"
+    assert label_frequency(["2020", "Ene.2020"]) is None
+
+
+# --- Request planner tests ---
+def test_plan_requests_groups_by_frequency_and_url_budget():
+    from bcrpy._planner import plan_requests
+
+    codes = ["PN00001MM", "PN00002AA", "PN00003MM", "PN00004QQ", "PN00005DD", "PN00001MM", "PN00006MM"]
+    plan = plan_requests(codes, "2015-1", "2020-12", frequencies={"PN00002AA": "Anual"}, max_series=2)
+    assert [(r.frequency, r.codes) for r in plan] == [
+        ("M", ("PN00001MM", "PN00003MM")), ("M", ("PN00006MM",)),
+        ("A", ("PN00002AA",)), ("Q", ("PN00004QQ",)), ("D", ("PN00005DD",)),
+    ]
+    assert [(r.start, r.end) for r in plan][2:] == [("2015", "2020"), ("2015-1", "2020-4"), ("2015-01-01", "2020-12-31")]
+    assert plan.n_series == 6 and plan.duplicates == 1
+    assert plan.to_frame()["series"].tolist() == [2, 1, 1, 1, 1]
+
+    # URL budget: every URL stays under the limit, even with a large series budget
+    many = [f"PN{i:05d}MM" for i in range(300)]
+    plan = plan_requests(many, "2015-1", "2020-12", max_series=100, max_url_length=500)
+    assert all(r.url_length <= 500 for r in plan) and plan.n_series == 300 and len(plan) > 3
+
+    # Overlapping windows of one code are merged, disjoint ones are kept apart
+    plan = plan_requests([("PN00001MM", "2015-1", "2016-6"), ("PN00001MM", "2016-1", "2017-12"),
+                          ("PN00001MM", "2019-1", "2019-12")], "2015-1", "2020-12")
+    assert [(r.start, r.end) for r in plan] == [("2015-1", "2017-12"), ("2019-1", "2019-12")]
+
+
+def test_plan_requests_passes_unparsed_windows_through():
+    from bcrpy._planner import plan_requests
+    plan = plan_requests(["PN01288PM", "PN01289PM", ("PN01288PM", "2019-1", "2019-Q4"), ("PN01290PM", "2019-1", "2019-6")],
+                         "2019-1", "2019-Q4")
+    assert [(r.codes, r.start, r.end) for r in plan] == [
+        (("PN01288PM", "PN01289PM"), "2019-1", "2019-Q4"),
+        (("PN01290PM",), "2019-1", "2019-6"),
+    ]
+    assert plan.duplicates == 1
+    assert plan.requests[0].n_periods == 13
+
+
+def test_largeGET_follows_plan_and_user_order(capfd):
+    codes = ["PN00003MM", ("PN00001MM", "2019-1", "2019-2"), "PN00002MM", ("PN00001MM", "2019-5", "2019-6")]
+    with patch("bcrpy._transport.Transport.get", side_effect=fake_bcrp_get) as mock_get, \
+         patch.object(banco, "get_metadata"), \
+         patch.object(banco, "reorder_frame", side_effect=lambda df, chunk: df):
+        plan = banco.plan_large(codes, start="2019-1", end="2019-6")
+        df = banco.largeGET(codes=codes, start="2019-1", end="2019-6", chunk_size=10, executor="serial", forget=True)
+
+    assert len(plan) == mock_get.call_count == 3
+    assert "[PLAN] 3 request(s)" in capfd.readouterr().out
+    assert [col.split(", codigo no. ")[-1] for col in df.columns] == ["PN00003MM", "PN00001MM", "PN00002MM"]
+    assert df.shape == (6, 3)
+    assert df.iloc[:, 1].isna().tolist() == [False, False, True, True, False, False]
+
+
+# --- Adaptive concurrency / rate limit tests ---
+def test_aimd_controller_adapts_window():
+    from bcrpy._control import AIMDController
+
+    controller = AIMDController(initial=4, maximum=8)
+    for _ in range(40):
+        controller.record(0.1, ok=True, size=10)
+    assert controller.limit == 8 and controller.peak == 8
+
+    controller.record(0.1, ok=False)
+    assert controller.limit == 4 and controller.errors == 1 and controller.decreases == 1
+
+    for _ in range(10):
+        controller.record(1.0, ok=True)  # latency 10x the best one seen: congestion
+    assert controller.limit < 4
+
+    fixed = AIMDController(initial=3, minimum=3, maximum=3)
+    for ok in [True, False, True]:
+        fixed.record(0.1, ok)
+    assert fixed.limit == 3 and fixed.report()["requests"] == 3
+
+
+def test_token_bucket_caps_rate():
+    import time
+    from bcrpy._control import TokenBucket
+
+    bucket = TokenBucket(rate=50, burst=2)
+    t0 = time.perf_counter()
+    for _ in range(7):
+        bucket.acquire()
+    assert time.perf_counter() - t0 >= 0.09  # 2 immediate + 5 at 50/s
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+    import pickle
+    transport = pickle.loads(pickle.dumps(bcrpy.Transport(rate_limit=5, burst=3)))
+    assert transport.limiter.rate == 5 and transport.limiter.burst == 3
+    assert bcrpy.Transport().limiter is None
+
+
+def test_chunk_tuner_amortizes_overhead():
+    from bcrpy._control import ChunkTuner
+
+    tuner = ChunkTuner(max_series=100, overhead_share=0.1)
+    assert tuner.suggest(40, 4) == 10  # no measurements: one round of requests
+    tuner.add([(n, 0.2 + 0.01 * n) for n in (5, 10, 20, 40)] + [(None, 1.0)])
+    overhead, per_series = tuner.fit()
+    assert overhead == pytest.approx(0.2) and per_series == pytest.approx(0.01)
+    assert tuner.suggest(10_000, 4) == 100  # overhead needs 180 series per request: capped
+    assert tuner.suggest(200, 8) == 25  # few codes: keep every worker busy
+
+
+@pytest.mark.parametrize("executor", ["thread", "async"])
+def test_largeGET_auto_settings_report(executor, capfd):
+    codes = [f"PN{i:05d}MM" for i in range(1, 13)]
+    with patch("bcrpy._transport.Transport.get", side_effect=fake_bcrp_get), \
+         patch.object(banco, "get_metadata"), \
+         patch.object(banco, "reorder_frame", side_effect=lambda df, chunk: df):
+        df = banco.largeGET(codes=codes, start="2019-1", end="2019-3", chunk_size="auto", nucleos="auto",
+                            executor=executor, forget=True)
+    assert df.shape == (3, 12)
+    report = banco.fetch_report
+    assert report["executor"] == executor and report["chunk_size"] >= 1
+    assert report["requests"] == -(-12 // report["chunk_size"]) and report["errors"] == 0
+    assert "[CONTROL]" in capfd.readouterr().out
+    assert len(banco.tuner.samples) >= report["requests"]
+
+
+# --- Resumable largeGET job tests ---
+@pytest.mark.parametrize("executor", ["serial", "thread", "async"])
+def test_largeGET_job_resumes_failed_chunks(executor):
+    codes = [f"PN{i:05d}MM" for i in range(1, 10)]
+    broken = {"PN00005MM"}
+
+    def flaky_get(url, *args, **kwargs):
+        if broken & set(url.split("/api/")[1].split("/")[0].split("-")):
+            raise requests.ConnectionError("connection reset")
+        return fake_bcrp_get(url)
+
+    with patch("bcrpy._transport.Transport.get", side_effect=flaky_get) as mock_get, \
+         patch.object(banco, "get_metadata"), \
+         patch.object(banco, "reorder_frame", side_effect=lambda df, chunk: df):
+        partial = banco.largeGET(codes=codes, start="2019-1", end="2019-3", chunk_size=3, executor=executor,
+                                 forget=True, job_id="pull-1")
+        assert partial.shape == (3, 6) and mock_get.call_count == 3
+        status = banco.job("pull-1").status()
+        assert status["done"] == 2 and status["pending"] == 1 and "connection reset" in status["errors"][1]
+        assert not any(e["params"]["kind"] == "largeGET" for e in banco.cache.entries().values())  # partial: not cached
+
+        # rerun, with a different chunk_size: the recorded plan is reused and only the failed chunk is fetched
+        broken.clear()
+        mock_get.reset_mock()
+        df = banco.largeGET(codes=codes, start="2019-1", end="2019-3", chunk_size=2, executor=executor, job_id="pull-1")
+        assert mock_get.call_count == 1 and "PN00004MM-PN00005MM-PN00006MM" in mock_get.call_args[0][0]
+
+    assert df.shape == (3, 9)
+    assert [col.split(", codigo no. ")[-1] for col in df.columns] == codes
+    assert banco.job("pull-1").status() == {"job_id": "pull-1", "chunks": 3, "done": 3, "pending": 0, "errors": {}}
+    assert any(e["params"]["kind"] == "largeGET" for e in banco.cache.entries().values())
+
+
+@pytest.mark.parametrize("sql_layout", ["wide", "long"])
+def test_largeGET_sql_hit_matches_miss(sql_layout):
+    codes = [f"PN{i:05d}MM" for i in range(1, 5)]
+    with patch("bcrpy._transport.Transport.get", side_effect=fake_bcrp_get), \
+         patch.object(banco, "get_metadata"), \
+         patch.object(banco, "reorder_frame", side_effect=lambda df, chunk: df):
+        miss = banco.largeGET(codes=codes, start="2019-1", end="2019-3", chunk_size=2, executor="serial", forget=True,
+                              storage="sql", sql_layout=sql_layout)
+        hit = banco.largeGET(codes=codes, start="2019-1", end="2019-3", chunk_size=2, executor="serial",
+                             storage="sql", sql_layout=sql_layout)
+    assert banco.stats.counters["cache_hits"] == 1
+    pd.testing.assert_frame_equal(hit, miss, check_freq=False, check_names=False)
+    assert [col.split(", codigo no. ")[-1] for col in hit.columns] == codes
+
+
+@pytest.mark.parametrize("method", ["GET", "largeGET"])
+@pytest.mark.parametrize("sql_layout", ["wide", "long"])
+def test_sql_long_output_names_codes_on_hit_and_miss(tmp_path, method, sql_layout):
+    codes = ["PN00001MM", "PN00002MM", "PN00003MM"]
+    banco_local = Marco()
+    banco_local.cache = bcrpy.ResultCache(directory=str(tmp_path))
+    banco_local.metadata = pd.DataFrame({"Código de serie": codes, "Grupo de serie": ["Grupo"] * 3,
+                                         "Nombre de serie": ["Uno", "Dos", "Tres"], "Frecuencia": ["Mensual"] * 3})
+    options = dict(codes=codes, start="2019-1", end="2019-2", storage="sql", sql_layout=sql_layout, output="long")
+    if method == "largeGET":
+        options.update(chunk_size=2, executor="serial")
+    with patch("bcrpy._transport.Transport.get", side_effect=fake_bcrp_get), \
+         patch.object(banco_local, "reorder_frame", side_effect=lambda df, chunk: df):
+        miss = getattr(banco_local, method)(forget=True, **options)
+        hit = getattr(banco_local, method)(**options)
+    assert banco_local.stats.counters["cache_hits"] == 1
+    for df in (miss, hit):
+        assert df["code"].astype(str).unique().tolist() == codes and len(df) == 6
+    pd.testing.assert_frame_equal(hit.reset_index(drop=True), miss.reset_index(drop=True), check_categorical=False)
+
+
+def test_largeGET_partial_sql_run_leaves_no_orphan_files():
+    codes = [f"PN{i:05d}MM" for i in range(1, 7)]
+
+    def flaky_get(url, *args, **kwargs):
+        if "PN00005MM" in url:
+            raise requests.ConnectionError("connection reset")
+        return fake_bcrp_get(url)
+
+    with patch("bcrpy._transport.Transport.get", side_effect=flaky_get), \
+         patch.object(banco, "get_metadata"), \
+         patch.object(banco, "reorder_frame", side_effect=lambda df, chunk: df):
+        partial = banco.largeGET(codes=codes, start="2019-1", end="2019-3", chunk_size=3, executor="serial",
+                                 forget=True, storage="sql", job_id="sql-partial")
+    assert partial.shape == (3, 3)
+    registered = {entry["file"] for entry in banco.cache.entries().values()}
+    orphans = set(os.listdir(banco.cache.directory)) - registered - {"index.json", "index.lock", "jobs"}
+    assert not orphans
+    banco.job("sql-partial").clear()
+
+
+def test_job_checkpoints_concurrent_saves(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+    from bcrpy._jobs import ChunkJob
+
+    job = ChunkJob("threads", directory=str(tmp_path))
+    job.create({"kind": "largeGET"}, [banco.chunk_request(["PN00001MM"])])
+    chunk = pd.DataFrame({"a": range(2000)})
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda i: job.save(0, chunk) if i % 2 else job.create({"kind": "largeGET"}, []), range(64)))
+    pd.testing.assert_frame_equal(job.load(0), chunk)
+    assert job.manifest()["job_id"] == "threads"
+    assert not [name for name in os.listdir(job.directory) if name.endswith(".tmp")]
+
+
+def test_largeGET_job_rejects_other_request():
+    with patch("bcrpy._transport.Transport.get", side_effect=fake_bcrp_get), \
+         patch.object(banco, "get_metadata"), \
+         patch.object(banco, "reorder_frame", side_effect=lambda df, chunk: df):
+        banco.largeGET(codes=["PN00001MM"], start="2019-1", end="2019-2", executor="serial", job_id="job-a")
+        with pytest.raises(ValueError):
+            banco.largeGET(codes=["PN00002MM"], start="2019-1", end="2019-2", executor="serial", job_id="job-a")
+    with pytest.raises(ValueError):
+        banco.job("../escape")
+    banco.job("job-a").clear()
+    assert not banco.job("job-a").exists()
+
+
+# --- Axe.forge merge engine tests ---
+def test_forge_matches_concat():
+    from bcrpy.hacha import Axe
+
+    dates = pd.DatetimeIndex(pd.date_range("2019-01-01", periods=12, freq="MS").to_numpy())
+    fragments = [
+        pd.DataFrame({"a": range(12), "b": 1.5}, index=dates, dtype="float64"),
+        pd.DataFrame({"c": [1.0, 2.0, 3.0]}, index=dates[[0, 5, 11]]),
+        pd.DataFrame({"d": [4.0, 5.0]}, index=dates[3:5]),
+    ]
+    forged = Axe().forge(fragments)
+    pd.testing.assert_frame_equal(forged, pd.concat(fragments, axis=1), check_freq=False)
+    assert Axe().forge(fragments, dtype="float32").dtypes.eq("float32").all()
+    assert list(Axe().forge(fragments, ignore_index=True).columns) == [0, 1, 2, 3]
+
+    # integer fragments on one index stay integer; sparse fragments and rows (axis=0) use pd.concat
+    ints = [pd.DataFrame({"x": [1, 2]}), pd.DataFrame({"y": [3, 4]})]
+    assert Axe().forge(ints).dtypes.tolist() == ["int64", "int64"]
+    sparse = [fragment.astype(pd.SparseDtype("float64")) for fragment in fragments[1:]]
+    pd.testing.assert_frame_equal(Axe().forge(sparse), pd.concat(sparse, axis=1))
+    assert len(Axe().forge(fragments[1:], axis=0)) == 5
+
+
+@pytest.mark.parametrize("dtype", ["int64", "bool", "float32"])
+def test_forge_explicit_dtype_with_gaps_matches_concat(dtype):
+    from bcrpy.hacha import Axe
+
+    fragments = [pd.DataFrame({"a": [1, 2]}, index=[1, 2]), pd.DataFrame({"b": [3, 4]}, index=[2, 3])]
+    if dtype == "int64":
+        with pytest.raises(ValueError):  # NaN gaps cannot be held, as with pandas
+            Axe().forge(fragments, dtype=dtype)
+    else:
+        pd.testing.assert_frame_equal(Axe().forge(fragments, dtype=dtype), pd.concat(fragments, axis=1).astype(dtype))
+    aligned = Axe().forge([fragments[0], fragments[0].rename(columns={"a": "c"})], dtype="int64")
+    assert aligned.to_numpy().tolist() == [[1, 1], [2, 2]]
+
+
+# --- Offline benchmark suite tests ---
+def test_benchmark_suite_runs_offline(tmp_path, capsys):
+    from benchmarks import suite
+
+    output = tmp_path / "results.json"
+    assert suite.main(["--quick", "--output", str(output)]) == 0
+    report = json.loads(output.read_text())
+    metrics = {entry["name"]: entry for entry in report["results"]}
+    assert {"get.throughput", "large_get.peak_memory", "parse.json", "cache.hit_latency", "wordsearch.query"} <= set(metrics)
+    assert metrics["errors.injected"]["value"] > 0 and metrics["errors.series_recovered"]["value"] == 1
+
+    slower = dict(report, results=[dict(entry, value=entry["value"] * 10) for entry in report["results"]])
+    assert [name for name, _, _ in suite.regressions(slower["results"], report, 0.2)] == \
+        [entry["name"] for entry in report["results"] if entry["better"] == "lower" and entry["value"]]
+
+
+# --- Instrumentation tests ---
+def test_instrumentation_hooks_and_stats():
+    events = []
+    hook = bcrpy.add_hook(events.append)
+    try:
+        with patch("bcrpy._transport.Transport.get", side_effect=fake_bcrp_get), \
+             patch.object(banco, "get_metadata"), \
+             patch.object(banco, "reorder_frame", side_effect=lambda df, chunk: df), \
+             patch.object(banco, "order_columns"):
+            df = banco.GET(codes=["PN00001MM"], start="2019-1", end="2019-6", forget=True)
+            large = banco.largeGET(codes=[f"PN{i:05d}MM" for i in range(1, 7)], start="2019-1", end="2019-6",
+                                   chunk_size=2, executor="thread", forget=True)
+    finally:
+        bcrpy.remove_hook(hook)
+
+    stats = df.attrs["bcrpy_stats"]
+    assert stats.kind == "GET" and stats.counters["requests"] == 1
+    assert {"network", "decode", "frame", "dates", "cache_write"} <= set(stats.phases)
+    assert stats.wall >= sum(stats.phases.values())
+
+    large_stats = large.attrs["bcrpy_stats"]
+    assert banco.stats is large_stats and large_stats.counters["chunks"] == 3 and large_stats.counters["requests"] == 3
+    assert {"plan", "fetch", "network", "forge", "cache_write"} <= set(large_stats.phases)
+    assert {event["event"] for event in events} == {"phase", "request", "result"}
+    assert [event["stats"]["kind"] for event in events if event["event"] == "result"] == ["GET", "largeGET"]
+
+    # a failing hook only warns
+    bcrpy.add_hook(lambda event: 1 / 0)
+    try:
+        with pytest.warns(RuntimeWarning):
+            bcrpy.Stats("GET").finish()
+    finally:
+        bcrpy._instrument._hooks.clear()
+
+
+def test_quiet_mode_prints_nothing(capfd):
+    quiet = Marco()
+    quiet.quiet = True
+    quiet.cache = banco.cache
+    with patch("bcrpy._transport.Transport.get", side_effect=fake_bcrp_get), \
+         patch.object(quiet, "get_metadata"), \
+         patch.object(quiet, "reorder_frame", side_effect=lambda df, chunk: df), \
+         patch.object(quiet, "series_names", side_effect=lambda codes: [f"Serie {code}" for code in codes]):
+        quiet.GET(codes=["PN00001MM"], start="2019-1", end="2019-3", forget=True)
+        quiet.GET(codes=["PN00001MM"], start="2019-1", end="2019-3")
+        quiet.largeGET(codes=["PN00001MM", "PN00002MM"], start="2019-1", end="2019-3", chunk_size=1, executor="serial")
+    assert capfd.readouterr().out == ""
+
+
+# --- Lazy import tests ---
+def test_import_loads_no_heavy_dependency():
+    from benchmarks import bench_import
+
+    seconds, loaded = bench_import.run("import bcrpy; bcrpy.add_hook; bcrpy.set_transport")
+    assert loaded == []
+    _, loaded = bench_import.run("import bcrpy; bcrpy.Marco()")
+    assert "pandas" in loaded and "pathos" not in loaded and "requests" not in loaded
+    assert bench_import.main(["--repeat", "1", "--budget-ms", "1000"]) == 0
+
+
+# --- Columnar cache backend tests ---
+@pytest.mark.parametrize("frame_format", ["parquet", "feather"])
+def test_columnar_cache_projection(tmp_path, frame_format):
+    pytest.importorskip("pyarrow")
+    dates = pd.date_range("2010-01-01", periods=36, freq="MS")
+    df = pd.DataFrame({f"Serie {i}, codigo no. PN{i:05d}MM": range(i, i + 36) for i in range(40)}, index=dates,
+                      dtype="float32")
+
+    path = str(tmp_path / f"result.{frame_format}")
+    bcrpy.save_dataframe(df, path, compression="zstd")
+    pd.testing.assert_frame_equal(bcrpy.load_dataframe(path), df, check_freq=False)
+
+    cache = bcrpy.ResultCache(directory=str(tmp_path / "cache"), frame_format=frame_format)
+    key = cache.key(name="large")
+    cache.write(key, df)
+    cache.store(key, "df", {"name": "large"})
+    with open(cache.path(key), "rb") as f:
+        assert f.read(4) in (b"PAR1", b"ARRO")
+    part = cache.read(key, columns=["PN00003MM", "PN00017MM"], start="2011-3", end="2011-5")
+    pd.testing.assert_frame_equal(part, df.iloc[14:17, [3, 17]], check_freq=False)
+    with pytest.raises(KeyError):
+        cache.read(key, columns=["PN99999MM"])
+
+    # frames Arrow cannot hold losslessly are pickled, whatever the format
+    sparse = df.iloc[:, :2].astype(pd.SparseDtype("float32"))
+    cache.write(key, sparse)
+    pd.testing.assert_frame_equal(bcrpy.load_dataframe(cache.path(key), columns=["PN00001MM"]), sparse.iloc[:, [1]])
+
+
+
+@pytest.mark.parametrize("frame_format", ["parquet", "feather"])
+@pytest.mark.parametrize("kind", ["sparse", "int_labels"])
+def test_non_columnar_frames_round_trip(tmp_path, frame_format, kind):
+    dates = pd.date_range("2019-01-01", periods=4, freq="MS")
+    df = pd.DataFrame({"a": [1.0, None, 3.0, None], "b": [None, 2.0, None, 4.0]}, index=dates)
+    df = df.astype(pd.SparseDtype("float64")) if kind == "sparse" else df.set_axis([0, 1], axis=1)
+
+    path = str(tmp_path / "result.bcrfile")
+    bcrpy.save_dataframe(df, path, format=frame_format)  # pickled: Arrow cannot hold it losslessly
+    pd.testing.assert_frame_equal(bcrpy.load_dataframe(path), df)
+
+    named = str(tmp_path / f"result.{frame_format}")
+    with pytest.raises(ValueError):
+        bcrpy.save_dataframe(df, named)
+    bcrpy.save_dataframe(df, named, format="pickle")  # read back by content, not by suffix
+    pd.testing.assert_frame_equal(bcrpy.load_dataframe(named), df)
+
+# --- SQLite filter pushdown tests ---
+def test_load_from_sqlite_pushdown(tmp_path):
+    import sqlite3
+    import numpy as np
+
+    index = pd.date_range("2000-01-01", periods=60, freq="MS")
+    wide = pd.DataFrame(np.arange(60 * 6, dtype=float).reshape(60, 6), index=index,
+                        columns=[f"Serie {j}, codigo no. PN{j:05d}MM" for j in range(6)])
+    for layout in ("wide", "long"):
+        db = str(tmp_path / f"{layout}.db")
+        codes = [f"PN{j:05d}MM" for j in range(6)]
+        bcrpy.save_df_as_sql(wide, db, "time_series", layout=layout, codes=codes, verbose=False)
+        with sqlite3.connect(db) as conn:
+            plan = " ".join(row[-1] for row in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM time_series WHERE date >= '2002-01-01'"))
+        assert "USING" in plan and "INDEX" in plan
+
+        df = bcrpy.load_from_sqlite(db, codes=["PN00004MM", "PN00001MM"], start="2002-3", end="2002-5", verbose=False)
+        expected = wide.iloc[26:29, [4, 1]]
+        assert df.to_numpy().tolist() == expected.to_numpy().tolist()
+        assert list(df.index) == list(expected.index)
+
+        chunks = list(bcrpy.load_from_sqlite(db, codes=["PN00002MM", "PN00003MM"], chunksize=7))
+        assert len(chunks) > 1 and sum(len(chunk) for chunk in chunks) == 60
+        assert pd.concat(chunks).index.is_unique
+
+
+@pytest.mark.parametrize("labels, start, end, expected", [
+    (["Mar.2022", "Abr.2022", "May.2022", "Jun.2022"], "2022-4", "2022-5", ["2022-04-01", "2022-05-01"]),
+    (["T4.21", "T1.22", "T2.22", "T3.22"], "2022-1", "2022-6", ["2022-01-01", "2022-04-01"]),
+    (["30.Dic.21", "31.Dic.21", "01.Ene.22", "02.Ene.22"], "2021-12-31", "2022-01-01", ["2021-12-31", "2022-01-01"]),
+])
+def test_load_from_sqlite_bcrp_labels(tmp_path, labels, start, end, expected):
+    from bcrpy import _sqlite
+    db = str(tmp_path / "labels.db")
+    conn = _sqlite.connect(db)
+    _sqlite.write_wide(conn, "time_series", labels, ["Serie A", "Serie B"], [[1.0, 2.0], [3.0, 4.0], [5.0, 6.0], [7.0, 8.0]])
+    conn.close()
+
+    df = bcrpy.load_from_sqlite(db, start=start, end=end, verbose=False)
+    assert [ts.strftime("%Y-%m-%d") for ts in df.index] == expected
+    assert df["Serie A"].tolist() == [3.0, 5.0]
+
+
+@patch.object(banco, "get_metadata")
+@patch("bcrpy._transport.Transport.get", side_effect=fake_bcrp_get)
+def test_GET_sql_served_from_covering_store(mock_get, _get_metadata):
+    codes = [f"PN{j:05d}MM" for j in range(1, 6)]
+    with patch.object(banco, "series_codes", side_effect=lambda header, codes=None: list(codes or banco.codes)):
+        full = banco.GET(codes=codes, start="2018-1", end="2020-12", storage='sql', sql_layout='long', forget=True)
+        part = banco.GET(codes=["PN00004MM", "PN00002MM"], start="2019-2", end="2019-4", storage='sql', sql_layout='long')
+    assert mock_get.call_count == 1
+    assert list(part.columns) == ["PN00004MM", "PN00002MM"]
+    assert part.to_numpy().tolist() == full.loc["2019-02-01":"2019-04-01", ["PN00004MM", "PN00002MM"]].to_numpy().tolist()
+
+
+# --- Concurrent cache tests ---
+def _cache_writer(directory, worker, rounds=15):
+    """Write / read a private entry and a contended shared entry; return the inconsistencies seen."""
+    cache = bcrpy.ResultCache(directory=directory, max_entries=24)
+    errors = []
+    for i in range(rounds):
+        df = pd.DataFrame({"worker": [worker] * 200, "round": [i] * 200})
+        own, shared = cache.key(worker=worker, round=i), cache.key(slot="shared")
+        for key in (own, shared):
+            cache.write(key, df)
+            cache.store(key, "df", {"worker": worker, "round": i})
+        for key in (own, shared):
+            got = cache.read(key)
+            if got is None:  # evicted by another writer
+                continue
+            if len(got) != 200 or got["worker"].nunique() != 1 or got["round"].nunique() != 1:
+                errors.append(f"torn entry read by worker {worker}")
+            elif key == own and (got["worker"].iloc[0], got["round"].iloc[0]) != (worker, i):
+                errors.append(f"worker {worker} read another request's data")
+    return errors
+
+
+def test_result_cache_concurrent_writers(tmp_path):
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    directory = str(tmp_path / "cache")
+    method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+    with ProcessPoolExecutor(max_workers=16, mp_context=multiprocessing.get_context(method)) as pool:
+        results = list(pool.map(_cache_writer, [directory] * 16, range(16)))
+    assert [error for errors in results for error in errors] == []
+
+    cache = bcrpy.ResultCache(directory=directory)
+    with open(cache.manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    assert 0 < len(manifest) <= 24
+    assert all(os.path.exists(os.path.join(directory, entry["file"])) for entry in manifest.values())
+    assert not [name for name in os.listdir(directory) if name.endswith(".tmp")]
+
+
+def test_result_cache_lock_timeout_and_failed_write(tmp_path):
+    cache = bcrpy.ResultCache(directory=str(tmp_path), lock_timeout=0.05)
+    key = cache.key(name="a")
+    cache.write(key, pd.DataFrame({"a": [1.0]}))
+    with cache.locked():
+        with pytest.raises(TimeoutError):
+            cache.store(key, "df", {})
+    cache.store(key, "df", {})
+
+    with pytest.raises(RuntimeError):
+        with cache.writing(key) as tmp:
+            with open(tmp, "wb") as f:
+                f.write(b"partial")
+            raise RuntimeError("interrupted")
+    assert cache.read(key)["a"].tolist() == [1.0]
+    assert sorted(os.listdir(tmp_path)) == sorted(["index.json", "index.lock", os.path.basename(cache.path(key))])
+
+
+# --- SQL upsert store tests ---
+def test_largeGET_upsert_store(tmp_path):
+    codes = [f"PN{i:05d}MM" for i in range(1, 5)]
+    database = str(tmp_path / "history.db")
+
+    def revised_get(url, *args, **kwargs):  # BCRPData revises PN00001MM for 2019-2
+        response = fake_bcrp_get(url)
+        payload = response.json.return_value
+        for period in payload["periods"]:
+            if period["name"] == "Feb.2019" and "PN00001MM" in url:
+                period["values"][0] = "99.0"
+        body = json.dumps(payload).encode()
+        response.iter_content.side_effect = lambda size=1: (body[i:i + 50] for i in range(0, len(body), 50))
+        return response
+
+    with patch.object(banco, "get_metadata"), \
+         patch.object(banco, "reorder_frame", side_effect=lambda df, chunk: df):
+        with patch("bcrpy._transport.Transport.get", side_effect=fake_bcrp_get):
+            banco.largeGET(codes=codes, start="2019-1", end="2019-3", chunk_size=2, executor="serial", storage='sql',
+                           sql_mode='upsert', database=database, forget=True)
+        with patch("bcrpy._transport.Transport.get", side_effect=revised_get):
+            df = banco.largeGET(codes=codes, start="2019-2", end="2019-4", chunk_size=2, executor="serial",
+                                storage='sql', sql_mode='upsert', database=database, forget=True)
+
+    assert df.shape == (3, 4)
+    assert {entry["params"]["storage"] for entry in banco.cache.entries().values()} == {'df'}  # chunks only, no result file
+    log = bcrpy.read_ingest_log(database)
+    assert len(log) == 4
+    assert log[["inserted", "updated", "unchanged"]].sum().tolist() == [16, 1, 7]
+    stored = bcrpy.load_from_sqlite(database, verbose=False)
+    assert stored.shape == (4, 4)
+    assert stored.loc["2019-02-01", "PN00001MM"] == 99.0
+    assert stored.loc["2019-01-01", "PN00001MM"] == pytest.approx(1 + pd.Period("2019-01", "M").ordinal / 1000)
+
+    with pytest.raises(ValueError):
+        banco.largeGET(codes=codes, storage='df', sql_mode='upsert')
+    with pytest.raises(ValueError):
+        bcrpy.save_df_as_sql(df, database, 'time_series', layout='wide', if_exists='upsert')
+
+
+def test_largeGET_upsert_failure_propagates(tmp_path):
+    import sqlite3
+    from bcrpy import _sqlite
+    codes = [f"PN{i:05d}MM" for i in range(1, 5)]
+    database = str(tmp_path / "history.db")
+    upsert = _sqlite.upsert_long
+    calls = []
+
+    def locked_on_second_batch(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 2:
+            raise sqlite3.OperationalError("database is locked")
+        return upsert(*args, **kwargs)
+
+    with patch("bcrpy._transport.Transport.get", side_effect=fake_bcrp_get), \
+         patch.object(banco, "get_metadata"), \
+         patch.object(banco, "reorder_frame", side_effect=lambda df, chunk: df), \
+         patch("bcrpy._sqlite.upsert_long", side_effect=locked_on_second_batch):
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            banco.largeGET(codes=codes, start="2019-1", end="2019-3", chunk_size=2, executor="serial", storage='sql',
+                           sql_mode='upsert', database=database, forget=True)
+    assert len(bcrpy.read_ingest_log(database)) == 1  # the first chunk was committed before the failure
+
+
+def _upsert_writer(database, worker):
+    dates = pd.date_range("2000-01-01", periods=60, freq="MS")
+    codes = [f"C{worker}", "SHARED"]
+    df = pd.DataFrame({codes[0]: float(worker), codes[1]: 1.0}, index=dates)
+    return bcrpy.save_df_as_sql(df, database, 'time_series', layout='long', if_exists='upsert', verbose=False,
+                          source=f"worker {worker}")
+
+
+def test_upsert_store_concurrent_processes(tmp_path):
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    database = str(tmp_path / "shared.db")
+    method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+    with ProcessPoolExecutor(max_workers=8, mp_context=multiprocessing.get_context(method)) as pool:
+        records = list(pool.map(_upsert_writer, [database] * 8, range(8)))
+
+    assert sorted(record["inserted"] for record in records) == [60] * 7 + [120]
+    assert sum(record["unchanged"] for record in records) == 7 * 60
+    stored = bcrpy.load_from_sqlite(database, verbose=False)
+    assert stored.shape == (60, 9)
+    assert stored["C5"].eq(5.0).all()
+    assert len(bcrpy.read_ingest_log(database)) == 8
+
+
+# --- Streaming largeGET tests ---
+def test_iter_largeGET_yields_chunks_in_completion_order():
+    import time
+    codes = [f"PN{i:05d}MM" for i in range(1, 9)]
+
+    def slow_first_chunk(url, *args, **kwargs):
+        if "PN00001MM" in url:
+            time.sleep(0.3)
+        return fake_bcrp_get(url)
+
+    with patch("bcrpy._transport.Transport.get", side_effect=slow_first_chunk), \
+         patch.object(banco, "get_metadata"), \
+         patch.object(banco, "reorder_frame", side_effect=lambda df, chunk: df):
+        chunks = list(banco.iter_largeGET(codes=codes, start="2019-1", end="2019-3", chunk_size=2, nucleos=4,
+                                          forget=True))
+
+    assert chunks[-1][0] == ("PN00001MM", "PN00002MM")  # the slow chunk is yielded last
+    assert sorted(code for chunk_codes, _ in chunks for code in chunk_codes) == codes
+    for chunk_codes, df in chunks:
+        assert df.shape == (3, 2)
+        assert [col.split(", codigo no. ")[-1] for col in df.columns] == list(chunk_codes)
+        assert "bcrpy_stats" not in df.attrs
+    assert banco.stats.counters["chunks"] == 4
+
+
+def test_aiter_largeGET_long_output_and_failures(capfd):
+    import asyncio
+    codes = [f"PN{i:05d}MM" for i in range(1, 7)]
+
+    def flaky_get(url, *args, **kwargs):
+        if "PN00003MM" in url:
+            raise requests.exceptions.ConnectionError("boom")
+        return fake_bcrp_get(url)
+
+    async def consume():
+        return [chunk async for chunk in banco.aiter_largeGET(codes=codes, start="2019-1", end="2019-2",
+                                                              chunk_size=2, concurrency=2, output='long', forget=True)]
+
+    with patch("bcrpy._transport.Transport.get", side_effect=flaky_get), \
+         patch.object(banco, "get_metadata"), \
+         patch.object(banco, "reorder_frame", side_effect=lambda df, chunk: df):
+        chunks = asyncio.run(consume())
+
+    assert sorted(chunk_codes for chunk_codes, _ in chunks) == [("PN00001MM", "PN00002MM"), ("PN00005MM", "PN00006MM")]
+    for chunk_codes, df in chunks:
+        assert list(df.columns) == ["code", "date", "value"]
+        assert set(df["code"]) == set(chunk_codes)
+    assert "Error en el fragmento 2" in capfd.readouterr().out
+
+
+def test_iter_largeGET_early_break_does_not_wait():
+    import threading, time
+    codes = [f"PN{i:05d}MM" for i in range(1, 17)]
+    release = threading.Event()
+
+    def slow_except_first(url, *args, **kwargs):
+        if "PN00001MM" not in url:
+            release.wait(5)
+        return fake_bcrp_get(url)
+
+    with patch("bcrpy._transport.Transport.get", side_effect=slow_except_first), \
+         patch.object(banco, "get_metadata"), \
+         patch.object(banco, "reorder_frame", side_effect=lambda df, chunk: df):
+        t0 = time.perf_counter()
+        for chunk_codes, _ in banco.iter_largeGET(codes=codes, start="2019-1", end="2019-2", chunk_size=2, nucleos=4,
+                                                  forget=True):
+            break
+        elapsed = time.perf_counter() - t0
+        release.set()
+        time.sleep(0.1)  # let the abandoned requests finish while the API is still patched
+    assert chunk_codes == ("PN00001MM", "PN00002MM")
+    assert elapsed < 2
+
+
+def test_aiter_largeGET_resumes_job_from_checkpoints():
+    import asyncio
+    codes = [f"PN{i:05d}MM" for i in range(1, 7)]
+
+    def flaky_get(url, *args, **kwargs):
+        if "PN00003MM" in url:
+            raise requests.exceptions.ConnectionError("boom")
+        return fake_bcrp_get(url)
+
+    async def consume():
+        return [chunk_codes async for chunk_codes, _ in banco.aiter_largeGET(codes=codes, start="2019-1", end="2019-2",
+                                                                              chunk_size=2, job_id="stream-1")]
+
+    with patch.object(banco, "get_metadata"), \
+         patch.object(banco, "reorder_frame", side_effect=lambda df, chunk: df):
+        with patch("bcrpy._transport.Transport.get", side_effect=flaky_get):
+            first = asyncio.run(consume())
+        with patch("bcrpy._transport.Transport.get", side_effect=fake_bcrp_get) as mock_get:
+            second = asyncio.run(consume())
+    assert len(first) == 2
+    assert sorted(second[:2]) == sorted(first) and second[2] == ("PN00003MM", "PN00004MM")
+    assert mock_get.call_count == 1